@@ -28,33 +28,49 @@ try:
 except Exception as e:
     pass
 
-try:
-    from xgboost import XGBRegressor
-    _XGBOOST_OK = True
-except Exception:
-    _XGBOOST_OK = False
-_PROPHET_OK = importlib.util.find_spec("prophet") is not None
-_SARIMAX_OK = importlib.util.find_spec("statsmodels.tsa.statespace.sarimax") is not None
 # Imports des autres bibliothèques
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from ui.styles import apply_global_styles
 from ui.topbar import render_topbar
-from utils.data import create_download_link, load_data
+from utils.arrow_store import share_frame
+from utils.cache import derive_key
+from utils.data import (
+    apply_deltas,
+    create_download_link,
+    load_daily_cube,
+    load_data,
+    load_sample,
+    upload_cache_key,
+)
+from utils.ingestion import EXCEL_EXTENSIONS, index_by_date, list_excel_sheets
+from utils.append import append_keys
+from utils.feature_engineering import detect_exog
+from utils.schema import infer_schema
 from utils.email import SUPPORT_EMAIL, SUPPORT_PHONE, append_to_excel, send_email_safe
 from utils.validation import validate_email, validate_phone
 from models.forecasting import (
-    basic_confidence_band,
-    build_features,
-    build_future_features,
+    AGGREGATIONS,
+    FREQUENCY_LABELS,
+    LONG_DAILY_HISTORY,
     future_dates as build_future_dates,
-    prepare_series,
 )
+from models.features import (
+    FOURIER_TERMS,
+    feature_graph_stats,
+    fourier_columns,
+    series_graph,
+)
+from models.gaps import GAP_KINDS, GAP_STRATEGIES, gap_report, impute_panel_cached
+from models.panel import build_exog_panel_cached, build_panel_cached
+from models.batch import batch_forecast, batch_summary
+from models.model_cache import cached_run_model, model_cache_stats
+from models.registry import AUTO_MODELS, CV_FOLDS, MAX_HORIZON, MODELS, ForecastSeries, auto_candidates
+from models.scheduler import run_models
 
-from sklearn.ensemble import RandomForestRegressor
 from sklearn.linear_model import LinearRegression
-from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.metrics import r2_score
 from datetime import datetime, timedelta
 import matplotlib
 matplotlib.use('Agg')
@@ -94,9 +110,30 @@ st.sidebar.markdown("""
 """, unsafe_allow_html=True)
 
 uploaded_file = st.sidebar.file_uploader(
-    "📥 Chargez votre fichier (CSV/Excel)",
-    type=["csv","xlsx","xls","txt","tsv","parquet"],
-    help="Supporte CSV ou Excel avec n'importe quelles colonnes"
+    "📥 Chargez votre fichier (CSV/Excel/Parquet/JSON)",
+    type=["csv","xlsx","xls","txt","tsv","parquet","json","jsonl","gz","bz2","xz","zip","zst"],
+    help="Supporte CSV, Excel, Parquet ou JSON avec n'importe quelles colonnes (compression gz/bz2/xz/zip/zst acceptée)"
+)
+
+stream_mode = st.sidebar.checkbox(
+    "⚡ Mode agrégé (fichiers volumineux)",
+    value=False,
+    help="CSV uniquement: lecture par blocs et agrégation quotidienne par Produit × Région. "
+         "La mémoire reste bornée par la taille d'un bloc."
+)
+
+compact_types = st.sidebar.checkbox(
+    "🗜️ Compacter les types (mémoire)",
+    value=True,
+    help="Catégories pour les textes répétés, booléens pour Oui/Non, entiers et décimaux réduits."
+)
+
+delta_files = st.sidebar.file_uploader(
+    "➕ Ajouter des ventes (fichiers delta)",
+    type=["csv","xlsx","xls","txt","tsv","parquet","json","jsonl","gz","bz2","xz","zip","zst"],
+    accept_multiple_files=True,
+    help="Nouvelles lignes seulement, mêmes colonnes que l'historique. Dédoublonnage sur "
+         "(Date, Produit, Region): une ligne du delta remplace l'ancienne. L'historique n'est pas relu."
 )
 
 # Téléchargement du fichier exemple (téléchargeable uniquement)
@@ -114,77 +151,159 @@ if os.path.exists(historical_data_file):
 
 if uploaded_file:
     try:
-        df = load_data(uploaded_file)
-        
-        if df is not None:
-            # 🆕 AFFICHER INFO SUR LE FICHIER CHARGÉ
-            source_name = uploaded_file.name
-            st.sidebar.success(f"✅ Fichier chargé: {source_name}")
-            st.sidebar.info(f"""
-            **Détails du fichier:**
-            - Lignes: {len(df)}
-            - Colonnes: {len(df.columns)}
-            - Colonnes détectées: {', '.join(df.columns.tolist())}
-            """)
-            
-            # Vérifier si le fichier est vide
-            if len(df) == 0:
-                st.error("❌ Le fichier est vide")
-                st.stop()
-        
+        file_extension = uploaded_file.name.split('.')[-1].lower()
+        stream_mode = stream_mode and file_extension in ['csv', 'txt', 'tsv']
+
+        # Excel: une seule feuille
+        sheet_name = None
+        if file_extension in EXCEL_EXTENSIONS:
+            sheets = list_excel_sheets(uploaded_file)
+            sheet_name = st.sidebar.selectbox("📑 Feuille Excel", sheets) if len(sheets) > 1 else sheets[0]
+
+        # Phase 1: échantillon -> schéma et suggestions (aucune lecture complète du fichier)
+        sample_df = load_sample(uploaded_file, sheet_name=sheet_name)
+        if sample_df is None or len(sample_df.columns) == 0:
+            st.error("❌ Impossible de lire le fichier ou fichier vide.")
+            st.stop()
+        schema = infer_schema(sample_df)
+        all_cols = list(sample_df.columns)
+
+        def _default_index(options, value, fallback=0):
+            return options.index(value) if value in options else fallback
+
         # Configuration des colonnes par l'utilisateur
         with st.expander("🔧 Configurer les colonnes", expanded=True):
             col1, col2, col3 = st.columns(3)
             with col1:
                 date_col = st.selectbox(
                     "📅 Colonne de date",
-                    options=df.columns,
-                    index=0 if len(df.columns) > 0 else None,
+                    options=all_cols,
+                    index=_default_index(all_cols, schema.suggested_date),
                     help="Sélectionnez la colonne contenant les dates"
                 )
             with col2:
-                numeric_cols = [c for c in df.columns if pd.api.types.is_numeric_dtype(df[c])]
+                numeric_cols = schema.names("integer", "numeric")
                 target_col = st.selectbox(
                     "🎯 Colonne cible (à prévoir)",
                     options=numeric_cols,
-                    index=0 if len(numeric_cols) > 0 else None,
+                    index=_default_index(numeric_cols, schema.suggested_target) if numeric_cols else None,
                     help="Sélectionnez la colonne numérique à analyser et prévoir"
                 )
             with col3:
-                cat_options = ["Aucune"] + list(df.columns)
-                default_cat_index = 0
-                if "Produit" in df.columns:
-                    default_cat_index = cat_options.index("Produit")
+                cat_options = ["Aucune"] + all_cols
                 cat_col = st.selectbox(
                     "📦 Colonne catégorique (optionnelle)",
                     options=cat_options,
-                    index=default_cat_index,
+                    index=_default_index(cat_options, schema.suggested_category),
                     help="Sélectionnez une colonne catégorique pour le grouping (ex: Produit, Région)"
                 )
 
+            selected_cols = [c for c in (date_col, target_col, cat_col) if c and c != "Aucune"]
+            extra_options = [c for c in all_cols if c not in selected_cols]
+            extra_cols = st.multiselect(
+                "➕ Colonnes supplémentaires à charger",
+                extra_options,
+                default=[
+                    c for c in ("Region", "Promo", "Stock", "Prix Unitaire", "Marketing Budget", "Weather", "Holiday")
+                    if c in extra_options
+                ],
+                help="Seules les colonnes choisies sont lues: les fichiers larges se chargent bien plus vite."
+            )
+            st.caption(
+                f"Schéma détecté sur {schema.sample_rows} lignes : "
+                + ", ".join(f"{c.name} ({c.kind})" for c in schema.columns)
+            )
+
+        if not (date_col and target_col):
+            st.warning("⚠️ Sélectionnez au moins la colonne date et la colonne cible pour continuer.")
+            st.stop()
+
+        # Phase 2: lecture des seules colonnes choisies, avec types explicites
+        usecols = list(dict.fromkeys(selected_cols + extra_cols))
+        if stream_mode:
+            df = sample_df
+        else:
+            df = load_data(
+                uploaded_file,
+                compact=compact_types,
+                sheet_name=sheet_name,
+                usecols=usecols if len(usecols) < len(all_cols) else None,
+                dtypes=schema.read_dtypes(usecols),
+                numeric=schema.numeric_columns(usecols),
+            )
+
+        if df is not None:
+            # 🆕 AFFICHER INFO SUR LE FICHIER CHARGÉ
+            source_name = uploaded_file.name
+            st.sidebar.success(f"✅ Fichier chargé: {source_name}")
+            st.sidebar.info(f"""
+            **Détails du fichier:**
+            - Lignes: {f"aperçu de {len(df)} (lecture par blocs)" if stream_mode else len(df)}
+            - Colonnes: {len(df.columns)} / {len(all_cols)}
+            - Colonnes chargées: {', '.join(df.columns.tolist())}
+            """)
+            compaction = df.attrs.get("compaction")
+            if compaction and compaction["economise"] > 0:
+                st.sidebar.caption(
+                    f"🗜️ Mémoire: {compaction['avant'] / 1e6:,.1f} Mo → {compaction['apres'] / 1e6:,.1f} Mo "
+                    f"({compaction['economise'] / 1e6:,.1f} Mo économisés)"
+                )
+            
+            # Vérifier si le fichier est vide
+            if len(df) == 0:
+                st.error("❌ Le fichier est vide")
+                st.stop()
+        else:
+            st.stop()
+
+        if stream_mode and date_col and target_col:
+            # Cube quotidien: les onglets travaillent sur l'agrégat (somme de la cible)
+            group_cols = [c for c in ("Produit", "Region") if c in df.columns and c not in (date_col, target_col)]
+            if cat_col != "Aucune" and cat_col not in group_cols + [date_col, target_col]:
+                group_cols.append(cat_col)
+            with st.spinner("⚡ Agrégation par blocs..."):
+                df = load_daily_cube(uploaded_file, date_col, target_col, group_cols, compact=compact_types)
+            if df is None or len(df) == 0:
+                st.error("❌ Aucune ligne exploitable après agrégation.")
+                st.stop()
+            st.sidebar.caption(f"Cube quotidien: {len(df):,} lignes ({' × '.join([date_col] + group_cols)})")
+
         if date_col and target_col:
             # Convertir la date
             try:
-                # Conversion robuste des dates (Excel serial / texte)
-                col = df[date_col]
-                try:
-                    if pd.api.types.is_numeric_dtype(col):
-                        # Heuristique Excel: valeurs en jours depuis 1899-12-30
-                        if col.dropna().shape[0] > 0 and col.dropna().median() > 10000:
-                            df[date_col] = pd.to_datetime(col, unit='D', origin='1899-12-30', errors='coerce')
-                        else:
-                            df[date_col] = pd.to_datetime(col, errors='coerce', dayfirst=True)
-                    else:
-                        df[date_col] = pd.to_datetime(col, errors='coerce', dayfirst=True)
-                except Exception:
-                    df[date_col] = pd.to_datetime(col, errors='coerce', dayfirst=True)
-
-                df = df.dropna(subset=[date_col])
-                df = df.sort_values(by=date_col)
-                df = df.set_index(date_col)
+                # Conversion robuste des dates (Excel serial / texte), une seule fois par jeu de
+                # données: le DataFrame indexé est partagé (mmap Arrow) entre toutes les sessions
+                dataset_key = (
+                    upload_cache_key(uploaded_file), stream_mode, compact_types,
+                    sheet_name, tuple(usecols),
+                )
+                if stream_mode:
+                    dataset_key += (target_col, tuple(group_cols))
+                raw_df = df
+                indexed_key = derive_key(dataset_key[0], "indexe", date_col, *dataset_key[1:])
+                working_key = indexed_key
+                df = share_frame(indexed_key, lambda: index_by_date(raw_df, date_col, dataset_key))
             except Exception as e:
                 st.error(f"❌ Erreur lors de la conversion de la colonne date: {str(e)}")
                 st.stop()
+
+            # Mode ajout: seuls les deltas sont lus, fusionnés sur la partition des dates concernées
+            if delta_files:
+                with st.spinner("➕ Fusion des ventes ajoutées..."):
+                    df, delta_reports = apply_deltas(
+                        df, indexed_key, delta_files, date_col,
+                        keys=group_cols if stream_mode else append_keys(df),
+                        cube_target=target_col if stream_mode else None,
+                    )
+                working_key = derive_key(indexed_key, "deltas", [upload_cache_key(f) for f in delta_files])
+                for report in delta_reports:
+                    if "ajoutees" in report:
+                        st.sidebar.caption(
+                            f"➕ {report['fichier']}: {report['ajoutees']} ligne(s) ajoutée(s), "
+                            f"{report['remplacees']} remplacée(s)"
+                        )
+                    else:
+                        st.sidebar.caption(f"➕ {report['fichier']}: déjà fusionné")
         else:
             st.warning("⚠️ Sélectionnez au moins la colonne date et la colonne cible pour continuer.")
             st.stop()
@@ -328,9 +447,13 @@ if uploaded_file:
             
             fig = go.Figure()
             
-            daily_values = df.groupby(df.index)[target_col].sum()
-            ma_7 = daily_values.rolling(7).mean()
-            ma_30 = daily_values.rolling(30).mean()
+            trend = series_graph(
+                (working_key, "quotidien", target_col, None),
+                lambda: (df.groupby(df.index)[target_col].sum().to_numpy(dtype=float), df.index.unique().sort_values()),
+            )
+            daily_values = pd.Series(trend.get("values"), index=trend.get("dates"))
+            ma_7 = pd.Series(trend.get("MA_7_pleine"), index=daily_values.index)
+            ma_30 = pd.Series(trend.get("MA_30_pleine"), index=daily_values.index)
             
             fig.add_trace(go.Scatter(
                 x=daily_values.index,
@@ -549,7 +672,7 @@ if uploaded_file:
                     
                     # Graphique par catégorie dans la région
                     if cat_col != "Aucune":
-                        values_region = df_region.groupby(cat_col)[target_col].sum().sort_values(ascending=True)
+                        values_region = df_region.groupby(cat_col, observed=True)[target_col].sum().sort_values(ascending=True)
                         
                         fig = go.Figure(go.Bar(
                             x=values_region.values,
@@ -578,7 +701,7 @@ if uploaded_file:
                     # Comparaison entre régions
                     st.markdown("### 🗺️ Comparaison entre Régions")
                     
-                    region_comparison = df_filtered.groupby(region_col)[target_col].agg(['sum', 'mean', 'count'])
+                    region_comparison = df_filtered.groupby(region_col, observed=True)[target_col].agg(['sum', 'mean', 'count'])
                     region_comparison.columns = ['Total', 'Moyenne', 'Transactions']
                     region_comparison = region_comparison.sort_values('Total', ascending=False)
                     
@@ -601,7 +724,7 @@ if uploaded_file:
                     col1, col2 = st.columns(2)
                     
                     with col1:
-                        promo_stats = df_filtered.groupby(promo_col)[target_col].agg(['sum', 'mean', 'count'])
+                        promo_stats = df_filtered.groupby(promo_col, observed=True)[target_col].agg(['sum', 'mean', 'count'])
                         
                         fig = go.Figure(data=[
                             go.Bar(
@@ -917,7 +1040,7 @@ if uploaded_file:
             with tab1:
                 st.markdown("### 📊 Analyse par Variable")
                 
-                numeric_cols = df.select_dtypes(include=['float64', 'int64']).columns.tolist()
+                numeric_cols = df.select_dtypes(include='number').columns.tolist()
                 
                 if len(numeric_cols) > 0:
                     variable = st.selectbox("Choisissez une variable à analyser", numeric_cols)
@@ -975,7 +1098,8 @@ if uploaded_file:
                     ))
                     
                     # Ajouter moyenne mobile
-                    ma = df[variable].rolling(30).mean()
+                    rows = series_graph((working_key, "lignes", variable), lambda: (df[variable].to_numpy(dtype=float), df.index))
+                    ma = rows.get("MA_30_pleine")
                     fig.add_trace(go.Scatter(
                         x=df.index,
                         y=ma,
@@ -1022,7 +1146,7 @@ if uploaded_file:
             with tab2:
                 st.markdown("### 🔗 Analyse des Corrélations")
                 
-                numeric_df = df.select_dtypes(include=['float64', 'int64'])
+                numeric_df = df.select_dtypes(include='number')
                 
                 if len(numeric_df.columns) > 1:
                     # Matrice de corrélation
@@ -1124,8 +1248,9 @@ if uploaded_file:
                     line=dict(color='#6366f1', width=2)
                 ))
                 
-                ma_7 = df[target_col].rolling(7).mean()
-                ma_30 = df[target_col].rolling(30).mean()
+                rows = series_graph((working_key, "lignes", target_col), lambda: (df[target_col].to_numpy(dtype=float), df.index))
+                ma_7 = pd.Series(rows.get("MA_7_pleine"), index=df.index)
+                ma_30 = pd.Series(rows.get("MA_30_pleine"), index=df.index)
                 
                 fig.add_trace(go.Scatter(
                     x=ma_7.index,
@@ -1361,14 +1486,94 @@ L'équipe VentesPRO
 
             with col3:
                 horizon = st.number_input(
-                    "Horizon de prévision (nombre de points)",
+                    "Horizon de prévision (nombre de périodes)",
                     min_value=1,
-                    max_value=365,
+                    max_value=MAX_HORIZON,
                     value=30,
                     step=1
                 )
 
+            col4, col5 = st.columns(2)
+            with col4:
+                freq = st.selectbox(
+                    "Fréquence",
+                    list(FREQUENCY_LABELS),
+                    format_func=FREQUENCY_LABELS.get,
+                    help="Semaine ou Mois: séries 7 à 30× plus courtes, modèles bien plus rapides sur un long historique."
+                )
+            with col5:
+                agg = st.selectbox(
+                    "Agrégation des lignes d'une même période",
+                    list(AGGREGATIONS),
+                    format_func=AGGREGATIONS.get,
+                    help="Plusieurs lignes par période (régions, transactions): somme ou moyenne."
+                )
+
+            col6, col7 = st.columns(2)
+            stock_col = "Stock" if not stream_mode and "Stock" in df.columns else None
+            with col6:
+                gap_strategy = st.selectbox(
+                    "Périodes manquantes",
+                    list(GAP_STRATEGIES),
+                    format_func=GAP_STRATEGIES.get,
+                    help="Remplacement des périodes sans ligne (et des cas cochés à droite) avant la prévision."
+                )
+            with col7:
+                gap_kinds = st.multiselect(
+                    "Traiter aussi comme manquants",
+                    [k for k in GAP_KINDS if k != "censored" or stock_col],
+                    format_func=GAP_KINDS.get,
+                    help="Ruptures de stock (Stock <= 0: ventes censurées) et longues séquences de ventes nulles."
+                )
+
             show_confidence = st.checkbox("Afficher intervalles de confiance (95%)", value=True)
+            recursive = st.checkbox(
+                "🔁 Prévision récursive (Random Forest / XGBoost)",
+                value=True,
+                help="Chaque prévision est réinjectée dans le lag et les moyennes mobiles du pas suivant. "
+                     "Décoché: MA_7, MA_30 et Lag_1 restent figés sur la dernière observation."
+            )
+            use_fourier = st.checkbox(
+                "〰️ Termes de Fourier (saisonnalité)",
+                value=True,
+                help="Saisonnalités hebdomadaire et annuelle en sinus / cosinus pour Tendance linéaire, "
+                     "ARIMA (exogènes), Random Forest et XGBoost."
+            )
+            cv_folds = st.number_input(
+                "🧪 Plis de validation (origine glissante)",
+                min_value=1,
+                max_value=10,
+                value=max(1, CV_FOLDS),
+                step=1,
+                help="MAE / RMSE (et choix du modèle en mode Auto) sur plusieurs origines successives de la "
+                     "fin de l'historique, au lieu d'un seul découpage 80/20. Les modèles ne sont pas "
+                     "réajustés à chaque pli: leur état est prolongé."
+            )
+
+            # Variables exogènes (codes compacts, sans one-hot) et scénario sur l'horizon
+            exog_specs = [] if stream_mode else detect_exog(df, exclude=[target_col, cat_col])
+            use_exog = bool(exog_specs) and st.checkbox(
+                "🧩 Variables exogènes (Random Forest / XGBoost)",
+                value=True,
+                help="Ajoute aux features: " + ", ".join(s.column for s in exog_specs)
+                     + ". Catégories encodées en codes ordinaux (pas de one-hot)."
+            )
+            future_exog_values = {}
+            if use_exog:
+                with st.expander("🧩 Scénario sur l'horizon (par défaut: dernière valeur connue)"):
+                    for spec, exog_ui in zip(exog_specs, st.columns(len(exog_specs))):
+                        with exog_ui:
+                            if spec.kind == "numeric":
+                                value = st.number_input(spec.column, value=None, key=f"exo_{spec.name}")
+                                if value is not None:
+                                    future_exog_values[spec.feature] = float(value)
+                                continue
+                            options = ["Oui", "Non"] if spec.kind == "boolean" else list(spec.categories)
+                            choice = st.selectbox(spec.column, ["(dernière valeur)"] + options, key=f"exo_{spec.name}")
+                            if choice != "(dernière valeur)":
+                                future_exog_values[spec.feature] = (
+                                    float(choice == "Oui") if spec.kind == "boolean" else float(options.index(choice))
+                                )
 
             # -----------------------------
             # Action
@@ -1389,542 +1594,111 @@ L'équipe VentesPRO
                     status_text.text("📦 Préparation des données...")
                     progress_bar.progress(10)
 
-                    df_ts, has_date, err = prepare_series(df, target_col, cat_col, date_col, produit)
+                    # Panel (dates × séries) construit une fois par jeu de données: extraction sans copie
+                    raw_panel = build_panel_cached(df, target_col, [cat_col], date_col, working_key, freq, agg, stock_col)
+                    panel_key = (working_key, target_col, cat_col, date_col, freq, agg, stock_col)
+                    panel = impute_panel_cached(raw_panel, panel_key, gap_strategy, gap_kinds)
+                    with st.expander("🕳️ Lacunes du panel (toutes les séries)"):
+                        st.dataframe(gap_report(raw_panel), use_container_width=True)
+                    df_ts, has_date, err = panel.series(produit)
                     if err:
                         st.error(f"❌ {err}")
                         progress_bar.empty()
                         status_text.empty()
                         st.stop()
 
-                    y = df_ts["Valeurs"].values.astype(float)
-                    last_date = df_ts.index[-1]
-                    future_dates = build_future_dates(last_date, horizon, freq="D")
+                    exog_names, exog_hist, future_exog = [], None, None
+                    if use_exog:
+                        exog_panel = build_exog_panel_cached(df, exog_specs, [cat_col], date_col, working_key, freq)
+                        exog_names = exog_panel.names
+                        exog_hist = exog_panel.series(produit, df_ts.index)
+                        future_exog = exog_panel.series(produit, build_future_dates(df_ts.index[-1], horizon, freq))
+                        for i, name in enumerate(exog_names):
+                            if name in future_exog_values:
+                                future_exog[:, i] = future_exog_values[name]
+                    series_key = (target_col, cat_col, produit, freq, agg, tuple(exog_names), gap_strategy, tuple(gap_kinds))
+
+                    # Série partagée par les modèles du registre (models/registry.py)
+                    fourier_cols = fourier_columns(FOURIER_TERMS[freq]) if use_fourier else []
+                    series = ForecastSeries(
+                        df_ts, freq, working_key, series_key, fourier_cols,
+                        exog_hist, exog_names, future_exog, recursive,
+                    )
 
                     # -----------------------------
                     # MODELES
                     # -----------------------------
-                    # ========== NAÏF ==========
-                    if model_type == "Naïf (Dernière valeur)":
-                        status_text.text("📌 Modèle naïf (dernière valeur)...")
-                        progress_bar.progress(35)
-
-                        last_val = float(y[-1])
-                        forecasts = np.full(horizon, max(last_val, 0))
-
-                        if show_confidence:
-                            recent = y[-min(len(y), 30):]
-                            std_recent = float(np.std(recent)) if len(recent) > 1 else 0.0
-                            confidence_lower, confidence_upper = basic_confidence_band(forecasts, std_recent)
-
-                        forecast_df = pd.DataFrame({"Date": future_dates, "Prévision": forecasts})
-                        split_idx = int(len(y) * 0.8)
-                        if 0 < split_idx < len(y):
-                            y_train, y_test = y[:split_idx], y[split_idx:]
-                            pred_test = np.full(len(y_test), y_train[-1])
-                            backtest_mae = mean_absolute_error(y_test, pred_test)
-                            backtest_rmse = np.sqrt(mean_squared_error(y_test, pred_test))
-                        progress_bar.progress(100)
-
-                    # ========== TENDANCE LINÉAIRE ==========
-                    elif model_type == "Tendance linéaire":
-                        status_text.text("📈 Tendance linéaire...")
-                        progress_bar.progress(35)
-
-                        X = np.arange(len(y)).reshape(-1, 1)
-                        lr = LinearRegression()
-                        lr.fit(X, y)
-
-                        future_X = np.arange(len(y), len(y) + horizon).reshape(-1, 1)
-                        forecasts = lr.predict(future_X)
-                        forecasts = np.maximum(forecasts, 0)
-
-                        if show_confidence:
-                            residuals = y - lr.predict(X)
-                            std = float(np.std(residuals)) if len(residuals) > 1 else 0.0
-                            confidence_lower, confidence_upper = basic_confidence_band(forecasts, std)
-
-                        forecast_df = pd.DataFrame({"Date": future_dates, "Prévision": forecasts})
-                        split_idx = int(len(y) * 0.8)
-                        if 0 < split_idx < len(y):
-                            X_tr = X[:split_idx]
-                            y_tr = y[:split_idx]
-                            X_te = X[split_idx:]
-                            y_te = y[split_idx:]
-                            lr_bt = LinearRegression().fit(X_tr, y_tr)
-                            pred_test = lr_bt.predict(X_te)
-                            backtest_mae = mean_absolute_error(y_te, pred_test)
-                            backtest_rmse = np.sqrt(mean_squared_error(y_te, pred_test))
-                        progress_bar.progress(100)
-
-                    # ========== MOYENNE MOBILE INTELLIGENTE ==========
-                    elif model_type == "Moyenne Mobile Intelligente":
-                        status_text.text("📈 Moyenne Mobile Intelligente...")
-                        progress_bar.progress(35)
-
-                        s = df_ts["Valeurs"]
-                        ma_7 = float(s.rolling(7, min_periods=1).mean().iloc[-1])
-                        ma_14 = float(s.rolling(14, min_periods=1).mean().iloc[-1])
-                        ma_30 = float(s.rolling(30, min_periods=1).mean().iloc[-1])
-
-                        recent = s.tail(14).values.astype(float)
-                        x = np.arange(len(recent)).reshape(-1, 1)
-                        lr = LinearRegression()
-                        lr.fit(x, recent)
-                        slope = float(lr.coef_[0])
-
-                        base = ma_7 * 0.5 + ma_14 * 0.3 + ma_30 * 0.2
-
-                        forecasts = []
-                        for i in range(horizon):
-                            damping = 0.98 ** (i / 7)
-                            forecasts.append(max(0, base + slope * (i + 1) * damping))
-
-                        forecasts = np.array(forecasts, dtype=float)
-
-                        if show_confidence:
-                            std = float(s.tail(30).std()) if len(s) > 1 else 0.0
-                            confidence_lower, confidence_upper = basic_confidence_band(forecasts, std)
-
-                        forecast_df = pd.DataFrame({"Date": future_dates, "Prévision": forecasts})
-                        split_idx = int(len(y) * 0.8)
-                        if 0 < split_idx < len(y):
-                            y_train, y_test = y[:split_idx], y[split_idx:]
-                            window = min(7, len(y_train))
-                            baseline = float(np.mean(y_train[-window:])) if window else 0.0
-                            pred_test = np.full(len(y_test), max(baseline, 0))
-                            backtest_mae = mean_absolute_error(y_test, pred_test)
-                            backtest_rmse = np.sqrt(mean_squared_error(y_test, pred_test))
-                        progress_bar.progress(100)
-
-                    # ========== HOLT-WINTERS ==========
-                    elif model_type == "Holt-Winters":
-                        status_text.text("❄️ Holt-Winters...")
-                        progress_bar.progress(25)
-
-                        try:
-                            from statsmodels.tsa.holtwinters import ExponentialSmoothing
-                        except Exception:
-                            st.error("❌ statsmodels n'est pas installé. Installez: pip install statsmodels")
-                            progress_bar.empty()
-                            status_text.empty()
-                            st.stop()
-
-                        progress_bar.progress(50)
-
-                        # seasonal period safe
-                        seasonal_period = 7 if len(y) >= 14 else max(2, len(y) // 2)
-
-                        try:
-                            model = ExponentialSmoothing(
-                                y, trend="add", seasonal="add",
-                                seasonal_periods=seasonal_period,
-                                initialization_method="estimated"
-                            ).fit()
-                        except Exception:
-                            model = ExponentialSmoothing(y, trend="add", seasonal=None, initialization_method="estimated").fit()
-
-                        forecasts = model.forecast(horizon)
-                        forecasts = np.maximum(np.array(forecasts, dtype=float), 0)
-
-                        if show_confidence:
-                            std = float(np.std(y - model.fittedvalues)) if len(y) > 2 else float(np.std(y))
-                            confidence_lower, confidence_upper = basic_confidence_band(forecasts, std)
-
-                        forecast_df = pd.DataFrame({"Date": future_dates, "Prévision": forecasts})
-                        split_idx = int(len(y) * 0.8)
-                        if 0 < split_idx < len(y):
-                            y_train, y_test = y[:split_idx], y[split_idx:]
-                            seasonal_bt = 7 if len(y_train) >= 14 else max(2, len(y_train) // 2)
-                            try:
-                                hw_bt = ExponentialSmoothing(
-                                    y_train, trend="add", seasonal="add",
-                                    seasonal_periods=seasonal_bt,
-                                    initialization_method="estimated"
-                                ).fit()
-                            except Exception:
-                                hw_bt = ExponentialSmoothing(
-                                    y_train, trend="add", seasonal=None, initialization_method="estimated"
-                                ).fit()
-                            pred_test = hw_bt.forecast(len(y_test))
-                            backtest_mae = mean_absolute_error(y_test, pred_test)
-                            backtest_rmse = np.sqrt(mean_squared_error(y_test, pred_test))
-                        progress_bar.progress(100)
-
-                    # ========== RANDOM FOREST ==========
-                    elif model_type == "Random Forest":
-                        status_text.text("🌳 Random Forest...")
-                        progress_bar.progress(25)
-
-                        df_feat, X, y_rf, feature_cols = build_features(df_ts)
-
-                        split_idx = int(len(df_feat) * 0.8)
-                        X_train, y_train = X.iloc[:split_idx], y_rf.iloc[:split_idx]
-                        X_test, y_test = X.iloc[split_idx:], y_rf.iloc[split_idx:]
-
-                        model = RandomForestRegressor(
-                            n_estimators=200, max_depth=8, random_state=42, n_jobs=-1
-                        )
-                        model.fit(X_train, y_train)
-
-                        progress_bar.progress(60)
-
-                        # future features
-                        future_dates, future_X = build_future_features(df_feat, feature_cols, horizon)
-                        forecasts = model.predict(future_X)
-                        forecasts = np.maximum(np.array(forecasts, dtype=float), 0)
-
-                        if show_confidence:
-                            pred_test = model.predict(X_test) if len(X_test) else np.array([])
-                            std = float(np.std(y_test.values - pred_test)) if len(pred_test) > 1 else float(df_ts["Valeurs"].std())
-                            confidence_lower, confidence_upper = basic_confidence_band(forecasts, std)
-
-                        forecast_df = pd.DataFrame({"Date": future_dates, "Prévision": forecasts})
-                        if len(X_test):
-                            pred_test = model.predict(X_test)
-                            backtest_mae = mean_absolute_error(y_test.values, pred_test)
-                            backtest_rmse = np.sqrt(mean_squared_error(y_test.values, pred_test))
-                        progress_bar.progress(100)
-
-                    # ========== XGBOOST ==========
-                    elif model_type == "XGBoost":
-                        if not _XGBOOST_OK:
-                            st.error("❌ XGBoost n'est pas installé sur cet environnement. Installez: pip install xgboost")
-                            progress_bar.empty()
-                            status_text.empty()
-                            st.stop()
-
-                        status_text.text("⚡ XGBoost...")
-                        progress_bar.progress(25)
-
-                        df_feat, X, y_xgb, feature_cols = build_features(df_ts)
-
-                        split_idx = int(len(df_feat) * 0.8)
-                        X_train, y_train = X.iloc[:split_idx], y_xgb.iloc[:split_idx]
-
-                        model = XGBRegressor(
-                            n_estimators=250, max_depth=6, learning_rate=0.05,
-                            subsample=0.9, colsample_bytree=0.9,
-                            random_state=42, n_jobs=-1
-                        )
-                        model.fit(X_train, y_train, verbose=False)
-
-                        progress_bar.progress(60)
-
-                        future_dates, future_X = build_future_features(df_feat, feature_cols, horizon)
-                        forecasts = model.predict(future_X)
-                        forecasts = np.maximum(np.array(forecasts, dtype=float), 0)
-
-                        if show_confidence:
-                            # Confidence simple (stable)
-                            std = float(df_ts["Valeurs"].tail(30).std()) if len(df_ts) > 1 else 0.0
-                            confidence_lower, confidence_upper = basic_confidence_band(forecasts, std)
-
-                        forecast_df = pd.DataFrame({"Date": future_dates, "Prévision": forecasts})
-                        split_idx = int(len(df_feat) * 0.8)
-                        X_test = X.iloc[split_idx:]
-                        y_test = y_xgb.iloc[split_idx:]
-                        if len(X_test):
-                            pred_test = model.predict(X_test)
-                            backtest_mae = mean_absolute_error(y_test.values, pred_test)
-                            backtest_rmse = np.sqrt(mean_squared_error(y_test.values, pred_test))
-                        progress_bar.progress(100)
-
-                    # ========== ARIMA ==========
-                    elif model_type == "ARIMA":
-                        status_text.text("📊 ARIMA...")
-                        progress_bar.progress(25)
-
-                        try:
-                            from statsmodels.tsa.arima.model import ARIMA
-                        except Exception:
-                            st.error("❌ statsmodels n'est pas installé. Installez: pip install statsmodels")
-                            progress_bar.empty()
-                            status_text.empty()
-                            st.stop()
-
-                        progress_bar.progress(50)
-
-                        # order safe
-                        model = ARIMA(y, order=(1, 1, 1)).fit()
-                        forecasts = model.forecast(steps=horizon)
-                        forecasts = np.maximum(np.array(forecasts, dtype=float), 0)
-
-                        if show_confidence:
-                            try:
-                                ci = model.get_forecast(steps=horizon).conf_int()
-                                confidence_lower = np.maximum(ci.iloc[:, 0].values.astype(float), 0)
-                                confidence_upper = ci.iloc[:, 1].values.astype(float)
-                            except Exception:
-                                std = float(np.std(y)) if len(y) > 1 else 0.0
-                                confidence_lower, confidence_upper = basic_confidence_band(forecasts, std)
-
-                        forecast_df = pd.DataFrame({"Date": future_dates, "Prévision": forecasts})
-                        split_idx = int(len(y) * 0.8)
-                        if 0 < split_idx < len(y):
-                            y_train, y_test = y[:split_idx], y[split_idx:]
-                            bt_model = ARIMA(y_train, order=(1, 1, 1)).fit()
-                            pred_test = bt_model.forecast(steps=len(y_test))
-                            backtest_mae = mean_absolute_error(y_test, pred_test)
-                            backtest_rmse = np.sqrt(mean_squared_error(y_test, pred_test))
-                        progress_bar.progress(100)
-
-                    # ========== SARIMA ==========
-                    elif model_type == "SARIMA":
-                        status_text.text("🧭 SARIMA...")
-                        progress_bar.progress(25)
-
-                        if not _SARIMAX_OK:
-                            st.error("❌ statsmodels SARIMAX n'est pas installé. Installez: pip install statsmodels")
-                            progress_bar.empty()
-                            status_text.empty()
-                            st.stop()
-
-                        from statsmodels.tsa.statespace.sarimax import SARIMAX
-
-                        progress_bar.progress(50)
-                        seasonal_order = (1, 1, 1, 7) if len(y) >= 14 else (0, 0, 0, 0)
-                        model = SARIMAX(y, order=(1, 1, 1), seasonal_order=seasonal_order).fit(disp=False)
-                        forecasts = model.forecast(steps=horizon)
-                        forecasts = np.maximum(np.array(forecasts, dtype=float), 0)
-
-                        if show_confidence:
-                            try:
-                                ci = model.get_forecast(steps=horizon).conf_int()
-                                confidence_lower = np.maximum(ci.iloc[:, 0].values.astype(float), 0)
-                                confidence_upper = ci.iloc[:, 1].values.astype(float)
-                            except Exception:
-                                std = float(np.std(y)) if len(y) > 1 else 0.0
-                                confidence_lower, confidence_upper = basic_confidence_band(forecasts, std)
-
-                        forecast_df = pd.DataFrame({"Date": future_dates, "Prévision": forecasts})
-                        split_idx = int(len(y) * 0.8)
-                        if 0 < split_idx < len(y):
-                            y_train, y_test = y[:split_idx], y[split_idx:]
-                            bt_model = SARIMAX(
-                                y_train,
-                                order=(1, 1, 1),
-                                seasonal_order=seasonal_order if len(y_train) >= 14 else (0, 0, 0, 0),
-                            ).fit(disp=False)
-                            pred_test = bt_model.forecast(steps=len(y_test))
-                            backtest_mae = mean_absolute_error(y_test, pred_test)
-                            backtest_rmse = np.sqrt(mean_squared_error(y_test, pred_test))
-                        progress_bar.progress(100)
-
-                    # ========== PROPHET ==========
-                    elif model_type == "Prophet":
-                        status_text.text("🧠 Prophet...")
-                        progress_bar.progress(25)
-
-                        if not _PROPHET_OK:
-                            st.error("❌ Prophet n'est pas installé. Installez: pip install prophet")
-                            progress_bar.empty()
-                            status_text.empty()
-                            st.stop()
-
-                        from prophet import Prophet
-
-                        df_prophet = df_ts.reset_index().rename(columns={"index": "ds", "Valeurs": "y"})
-                        model = Prophet(daily_seasonality=True)
-                        model.fit(df_prophet)
-
-                        future = model.make_future_dataframe(periods=horizon, freq="D", include_history=False)
-                        forecast = model.predict(future)
-                        forecasts = np.maximum(forecast["yhat"].values.astype(float), 0)
-
-                        if show_confidence:
-                            confidence_lower = np.maximum(forecast["yhat_lower"].values.astype(float), 0)
-                            confidence_upper = forecast["yhat_upper"].values.astype(float)
-
-                        forecast_df = pd.DataFrame({"Date": future["ds"], "Prévision": forecasts})
-
-                        split_idx = int(len(df_prophet) * 0.8)
-                        if 0 < split_idx < len(df_prophet):
-                            train_df = df_prophet.iloc[:split_idx]
-                            test_df = df_prophet.iloc[split_idx:]
-                            bt_model = Prophet(daily_seasonality=True)
-                            bt_model.fit(train_df)
-                            future_bt = bt_model.make_future_dataframe(periods=len(test_df), freq="D", include_history=False)
-                            pred_bt = bt_model.predict(future_bt)
-                            pred_vals = pred_bt["yhat"].values.astype(float)
-                            backtest_mae = mean_absolute_error(test_df["y"].values, pred_vals)
-                            backtest_rmse = np.sqrt(mean_squared_error(test_df["y"].values, pred_vals))
-                        progress_bar.progress(100)
-
-                    # ========== AUTO (Comparaison) ==========
-                    elif model_type == "Auto (Comparaison)":
+                    if model_type == "Auto (Comparaison)":
                         status_text.text("🤖 Auto: comparaison des modèles...")
                         progress_bar.progress(10)
 
-                        # split for evaluation
-                        split_idx = int(len(df_ts) * 0.8)
-                        train = df_ts.iloc[:split_idx]
-                        test = df_ts.iloc[split_idx:]
-
                         results = {}
                         forecasts_dict = {}
 
-                        # 1) Naïf
-                        try:
-                            status_text.text("Auto: test Naïf...")
-                            progress_bar.progress(20)
-
-                            last_val = float(train["Valeurs"].iloc[-1])
-                            pred_test = np.full(len(test), last_val)
-                            mae = mean_absolute_error(test["Valeurs"].values, pred_test) if len(test) else np.inf
-                            rmse = np.sqrt(mean_squared_error(test["Valeurs"].values, pred_test)) if len(test) else np.inf
-                            results["Naïf"] = {"MAE": mae, "RMSE": rmse}
-
-                            last_date = df_ts.index[-1]
-                            fut_dates = build_future_dates(last_date, horizon, "D")
-                            forecasts_dict["Naïf"] = pd.DataFrame({"Date": fut_dates, "Prévision": np.full(horizon, max(last_val, 0))})
-                        except Exception:
-                            results["Naïf"] = {"MAE": np.inf, "RMSE": np.inf}
-
-                        # 2) Tendance linéaire
-                        try:
-                            status_text.text("Auto: test Tendance linéaire...")
-                            progress_bar.progress(35)
-
-                            y_all = df_ts["Valeurs"].values.astype(float)
-                            X_all = np.arange(len(y_all)).reshape(-1, 1)
-
-                            X_tr = X_all[:split_idx]
-                            y_tr = y_all[:split_idx]
-                            X_te = X_all[split_idx:]
-                            y_te = y_all[split_idx:]
-
-                            lr = LinearRegression().fit(X_tr, y_tr)
-                            pred_test = lr.predict(X_te)
-                            mae = mean_absolute_error(y_te, pred_test) if len(y_te) else np.inf
-                            rmse = np.sqrt(mean_squared_error(y_te, pred_test)) if len(y_te) else np.inf
-                            results["Tendance linéaire"] = {"MAE": mae, "RMSE": rmse}
-
-                            fut_dates = build_future_dates(df_ts.index[-1], horizon, "D")
-                            fut_X = np.arange(len(y_all), len(y_all) + horizon).reshape(-1, 1)
-                            forecasts = np.maximum(lr.predict(fut_X), 0)
-                            forecasts_dict["Tendance linéaire"] = pd.DataFrame({"Date": fut_dates, "Prévision": forecasts})
-                        except Exception:
-                            results["Tendance linéaire"] = {"MAE": np.inf, "RMSE": np.inf}
-
-                        # 3) Random Forest
-                        try:
-                            status_text.text("Auto: test Random Forest...")
-                            progress_bar.progress(55)
-
-                            df_feat, X, y_m, feature_cols = build_features(df_ts)
-
-                            X_train, y_train = X.iloc[:split_idx], y_m.iloc[:split_idx]
-                            X_test, y_test = X.iloc[split_idx:], y_m.iloc[split_idx:]
-
-                            rf = RandomForestRegressor(n_estimators=150, max_depth=8, random_state=42, n_jobs=-1)
-                            rf.fit(X_train, y_train)
-
-                            pred_test = rf.predict(X_test) if len(X_test) else np.array([])
-                            mae = mean_absolute_error(y_test.values, pred_test) if len(pred_test) else np.inf
-                            rmse = np.sqrt(mean_squared_error(y_test.values, pred_test)) if len(pred_test) else np.inf
-                            results["Random Forest"] = {"MAE": mae, "RMSE": rmse}
-
-                            fut_dates, future_X = build_future_features(df_feat, feature_cols, horizon)
-                            forecasts = np.maximum(rf.predict(future_X), 0)
-                            forecasts_dict["Random Forest"] = pd.DataFrame({"Date": fut_dates, "Prévision": forecasts})
-                        except Exception:
-                            results["Random Forest"] = {"MAE": np.inf, "RMSE": np.inf}
-
-                        # 4) XGBoost (optionnel)
-                        if _XGBOOST_OK:
-                            try:
-                                status_text.text("Auto: test XGBoost...")
-                                progress_bar.progress(70)
-
-                                df_feat, X, y_m, feature_cols = build_features(df_ts)
-
-                                X_train, y_train = X.iloc[:split_idx], y_m.iloc[:split_idx]
-                                X_test, y_test = X.iloc[split_idx:], y_m.iloc[split_idx:]
-
-                                xgb = XGBRegressor(n_estimators=200, max_depth=6, learning_rate=0.05, subsample=0.9, random_state=42, n_jobs=-1)
-                                xgb.fit(X_train, y_train, verbose=False)
-
-                                pred_test = xgb.predict(X_test) if len(X_test) else np.array([])
-                                mae = mean_absolute_error(y_test.values, pred_test) if len(pred_test) else np.inf
-                                rmse = np.sqrt(mean_squared_error(y_test.values, pred_test)) if len(pred_test) else np.inf
-                                results["XGBoost"] = {"MAE": mae, "RMSE": rmse}
-
-                                fut_dates, future_X = build_future_features(df_feat, feature_cols, horizon)
-                                forecasts = np.maximum(xgb.predict(future_X), 0)
-                                forecasts_dict["XGBoost"] = pd.DataFrame({"Date": fut_dates, "Prévision": forecasts})
-                            except Exception:
-                                results["XGBoost"] = {"MAE": np.inf, "RMSE": np.inf}
-
-                        # 5) SARIMA (optionnel)
-                        if _SARIMAX_OK:
-                            try:
-                                status_text.text("Auto: test SARIMA...")
-                                progress_bar.progress(80)
-
-                                from statsmodels.tsa.statespace.sarimax import SARIMAX
-
-                                y_train = train["Valeurs"].values.astype(float)
-                                y_test = test["Valeurs"].values.astype(float)
-                                seasonal_order = (1, 1, 1, 7) if len(y_train) >= 14 else (0, 0, 0, 0)
-                                sarima = SARIMAX(y_train, order=(1, 1, 1), seasonal_order=seasonal_order).fit(disp=False)
-                                pred_test = sarima.forecast(steps=len(y_test)) if len(y_test) else np.array([])
-                                mae = mean_absolute_error(y_test, pred_test) if len(pred_test) else np.inf
-                                rmse = np.sqrt(mean_squared_error(y_test, pred_test)) if len(pred_test) else np.inf
-                                results["SARIMA"] = {"MAE": mae, "RMSE": rmse}
-
-                                fut_dates = build_future_dates(df_ts.index[-1], horizon, "D")
-                                forecasts = np.maximum(sarima.forecast(steps=horizon), 0)
-                                forecasts_dict["SARIMA"] = pd.DataFrame({"Date": fut_dates, "Prévision": forecasts})
-                            except Exception:
-                                results["SARIMA"] = {"MAE": np.inf, "RMSE": np.inf}
-
-                        # 6) Prophet (optionnel)
-                        if _PROPHET_OK:
-                            try:
-                                status_text.text("Auto: test Prophet...")
-                                progress_bar.progress(85)
-
-                                from prophet import Prophet
-
-                                df_prophet = df_ts.reset_index().rename(columns={"index": "ds", "Valeurs": "y"})
-                                train_df = df_prophet.iloc[:split_idx]
-                                test_df = df_prophet.iloc[split_idx:]
-                                prophet_model = Prophet(daily_seasonality=True)
-                                prophet_model.fit(train_df)
-
-                                future_bt = prophet_model.make_future_dataframe(
-                                    periods=len(test_df), freq="D", include_history=False
-                                )
-                                pred_bt = prophet_model.predict(future_bt)
-                                pred_vals = pred_bt["yhat"].values.astype(float)
-                                mae = mean_absolute_error(test_df["y"].values, pred_vals) if len(pred_vals) else np.inf
-                                rmse = np.sqrt(mean_squared_error(test_df["y"].values, pred_vals)) if len(pred_vals) else np.inf
-                                results["Prophet"] = {"MAE": mae, "RMSE": rmse}
-
-                                future = prophet_model.make_future_dataframe(
-                                    periods=horizon, freq="D", include_history=False
-                                )
-                                forecast = prophet_model.predict(future)
-                                forecasts = np.maximum(forecast["yhat"].values.astype(float), 0)
-                                forecasts_dict["Prophet"] = pd.DataFrame({"Date": future["ds"], "Prévision": forecasts})
-                            except Exception:
-                                results["Prophet"] = {"MAE": np.inf, "RMSE": np.inf}
+                        # Sur un long historique journalier, Tendance linéaire + Fourier couvre les
+                        # saisonnalités hebdomadaire et annuelle pour une fraction du coût de SARIMA
+                        candidates = auto_candidates(series)
+                        if use_fourier and freq == "D" and len(df_ts) > LONG_DAILY_HISTORY:
+                            st.caption(
+                                f"〰️ SARIMA non testé: {len(df_ts)} jours d'historique, saisonnalité couverte "
+                                "par Tendance linéaire + Fourier."
+                            )
+                        # Modèles en parallèle (processus séparés, budget MODEL_TIMEOUT_S chacun):
+                        # le classement se remplit au fil des modèles terminés
+                        st.markdown("### 📊 Comparaison des modèles")
+                        leaderboard = st.empty()
+                        board_format = {"MAE": "{:.2f}", "RMSE": "{:.2f}", "Durée (s)": "{:.1f}"}
+                        if cv_folds > 1:
+                            st.caption(f"🧪 MAE / RMSE: validation à origine glissante sur {cv_folds} plis.")
+                        jobs = [(label, AUTO_MODELS[label]) for label in candidates]
+                        for i, outcome in enumerate(run_models(jobs, series, horizon, folds=cv_folds)):
+                            result = outcome.result
+                            failed = result is None or result.mae is None
+                            results[outcome.name] = {
+                                "MAE": np.inf if failed else result.mae,
+                                "RMSE": np.inf if failed else result.rmse,
+                                "Durée (s)": outcome.seconds,
+                                "Statut": outcome.error or ("sans backtest" if failed else "OK"),
+                            }
+                            if result is not None:
+                                forecasts_dict[outcome.name] = result.frame()
+                            status_text.text(f"Auto: {i + 1}/{len(jobs)} modèles terminés ({outcome.name})...")
+                            progress_bar.progress(10 + 80 * (i + 1) // len(jobs))
+                            comparison_df = pd.DataFrame.from_dict(results, orient="index").sort_values("MAE")
+                            leaderboard.dataframe(comparison_df.style.format(board_format), use_container_width=True)
 
                         progress_bar.progress(90)
 
-                        # Select best by MAE
-                        comparison_df = pd.DataFrame(results).T.sort_values("MAE")
-                        best_model = comparison_df.index[0]
-                        if best_model in results:
+                        # Select best by MAE (parmi les modèles qui ont produit une prévision)
+                        ranked = [name for name in comparison_df.index if name in forecasts_dict] if results else []
+                        if ranked:
+                            best_model = ranked[0]
                             backtest_mae = results[best_model].get("MAE")
                             backtest_rmse = results[best_model].get("RMSE")
+                            st.success(f"🏆 Meilleur modèle : **{best_model}**")
+                            forecast_df = forecasts_dict[best_model]
+                            model_name = best_model
+                        progress_bar.progress(100)
 
-                        st.success(f"🏆 Meilleur modèle : **{best_model}**")
-                        st.markdown("### 📊 Comparaison des modèles")
-                        st.dataframe(comparison_df.style.format({"MAE": "{:.2f}", "RMSE": "{:.2f}"}), use_container_width=True)
+                    else:
+                        model_cls = MODELS[model_type]
+                        if not model_cls.available:
+                            st.error(
+                                f"❌ {model_cls.requirement} n'est pas installé sur cet environnement. "
+                                f"Installez: pip install {model_cls.requirement}"
+                            )
+                            progress_bar.empty()
+                            status_text.empty()
+                            st.stop()
 
-                        forecast_df = forecasts_dict[best_model]
-                        model_name = best_model
+                        status_text.text(model_cls.status)
+                        progress_bar.progress(35)
+
+                        # Modèle déjà ajusté sur cette série: prévision prolongée ou tranchée, sans réajustement
+                        result = cached_run_model(model_type, series, horizon, confidence=show_confidence, folds=cv_folds)
+                        forecast_df = result.frame()
+                        confidence_lower, confidence_upper = result.lower, result.upper
+                        backtest_mae, backtest_rmse = result.mae, result.rmse
                         progress_bar.progress(100)
 
                     # -----------------------------
@@ -1939,6 +1713,13 @@ L'équipe VentesPRO
 
                     st.markdown("---")
                     st.success("✅ Prévisions générées avec succès!")
+                    with st.expander("🔍 Features: calculées / réutilisées"):
+                        st.dataframe(feature_graph_stats(), hide_index=True, use_container_width=True)
+                        cache = model_cache_stats()
+                        st.caption(
+                            f"♻️ Modèles: {cache['hits'] + cache['disk_hits']} réutilisés, {cache['misses']} ajustés, "
+                            f"{cache['entries']} en cache ({cache['bytes'] / 1024 / 1024:.1f} Mo)"
+                        )
 
                     fig = go.Figure()
 
@@ -2115,6 +1896,76 @@ L'équipe VentesPRO
                         import traceback
                         st.code(traceback.format_exc())
 
+            # -----------------------------
+            # Prévision groupée (toutes les séries)
+            # -----------------------------
+            st.markdown("---")
+            st.markdown("### 📦 Prévision groupée")
+            st.caption(
+                "Toutes les séries (une par catégorie, ou par couple de catégories) avec le modèle et les "
+                "options ci-dessus, réparties sur tous les cœurs. Auto choisit le meilleur modèle série par série."
+            )
+            cross_options = ["Aucune"] + [c for c in schema.names("categorical") if c in df.columns and c != cat_col]
+            cross_col = st.selectbox(
+                "Croiser avec",
+                cross_options,
+                help="Deuxième colonne catégorique: une série par couple (ex. Produit × Region)."
+            )
+            if st.button("📦 Prévoir toutes les séries", use_container_width=True):
+                group_cols = [c for c in (cat_col, cross_col) if c and c != "Aucune"]
+                batch_bar = st.progress(0)
+                batch_text = st.empty()
+
+                def _batch_progress(done, total):
+                    batch_bar.progress(done / max(total, 1))
+                    batch_text.text(f"📦 {done}/{total} séries traitées...")
+
+                try:
+                    raw_batch = build_panel_cached(df, target_col, group_cols, date_col, working_key, freq, agg, stock_col)
+                    batch_key = (working_key, target_col, tuple(group_cols), date_col, freq, agg, stock_col)
+                    batch_panel = impute_panel_cached(raw_batch, batch_key, gap_strategy, gap_kinds)
+                    batch_exog = (
+                        build_exog_panel_cached(df, exog_specs, group_cols, date_col, working_key, freq)
+                        if use_exog else None
+                    )
+                    batch_table = batch_forecast(
+                        batch_panel, model_type, horizon, use_fourier, recursive, show_confidence,
+                        exog_panel=batch_exog,
+                        future_exog_values=future_exog_values,
+                        dataset_key=working_key,
+                        series_key=(
+                            target_col, tuple(group_cols), freq, agg, gap_strategy, tuple(gap_kinds),
+                            tuple(batch_exog.names) if use_exog else (),
+                        ),
+                        progress=_batch_progress,
+                        folds=cv_folds,
+                    )
+                    batch_bar.empty()
+                    batch_text.empty()
+
+                    summary = batch_summary(batch_table)
+                    n_failed = int(summary["Erreur"].notna().sum())
+                    if n_failed:
+                        st.warning(f"⚠️ {len(summary) - n_failed}/{len(summary)} séries prévues, {n_failed} en échec (voir Erreur).")
+                    else:
+                        st.success(f"✅ {len(summary)} séries prévues.")
+                    st.dataframe(
+                        summary.style.format({"MAE": "{:.2f}", "RMSE": "{:.2f}", "Total prévu": "{:.2f}"}, na_rep="—"),
+                        use_container_width=True
+                    )
+                    st.download_button(
+                        label="📥 Télécharger toutes les prévisions (CSV)",
+                        data=batch_table.to_csv(index=False).encode("utf-8"),
+                        file_name=f"previsions_groupees_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
+                        mime="text/csv",
+                        use_container_width=True
+                    )
+                except Exception as e:
+                    batch_bar.empty()
+                    batch_text.empty()
+                    st.error("❌ Erreur lors de la prévision groupée")
+                    st.error(str(e))
+
         
         # ==================== PAGE DONNÉES ====================
         with tab_data:
@@ -2151,8 +2002,8 @@ L'équipe VentesPRO
                         max_value=df.index.max().date()
                     )
             
-            # Filtrer
-            df_filtered = df.copy()
+            # Filtrer (vue: les filtres ci-dessous créent de nouveaux DataFrames)
+            df_filtered = df
             
             if cats_filter and cat_col != "Aucune":
                 df_filtered = df_filtered[df_filtered[cat_col].isin(cats_filter)]
@@ -2255,7 +2106,7 @@ L'équipe VentesPRO
                 )
             
             with tab2:
-                numeric_cols = df_filtered.select_dtypes(include=['float64', 'int64']).columns
+                numeric_cols = df_filtered.select_dtypes(include='number').columns
                 if len(numeric_cols) > 0:
                     col_to_plot = st.selectbox("Variable", numeric_cols)
                     
@@ -2316,7 +2167,7 @@ L'équipe VentesPRO
                 
                 with col1:
                     st.markdown("#### 🏆 Top 5 Catégories")
-                    top_cats = df_rapport.groupby(cat_col)[target_col].sum().sort_values(ascending=False).head(5)
+                    top_cats = df_rapport.groupby(cat_col, observed=True)[target_col].sum().sort_values(ascending=False).head(5)
                     
                     fig = go.Figure(go.Bar(
                         x=top_cats.values,
@@ -2339,7 +2190,7 @@ L'équipe VentesPRO
                 
                 with col2:
                     st.markdown("#### 📉 5 Catégories les Moins Performantes")
-                    bottom_cats = df_rapport.groupby(cat_col)[target_col].sum().sort_values().head(5)
+                    bottom_cats = df_rapport.groupby(cat_col, observed=True)[target_col].sum().sort_values().head(5)
                     
                     fig = go.Figure(go.Bar(
                         x=bottom_cats.values,
@@ -2363,8 +2214,19 @@ L'équipe VentesPRO
             # Évolution temporelle
             st.markdown("#### 📈 Évolution des Valeurs")
             
-            daily_values = df_rapport.groupby(df_rapport.index)[target_col].sum()
-            ma_7 = daily_values.rolling(7).mean()
+            # Période complète: même graphe que l'onglet Accueil (moyennes déjà calculées)
+            bounds = (date_debut_rapport, date_fin_rapport)
+            if bounds == (df.index.min().date(), df.index.max().date()):
+                bounds = None
+            trend = series_graph(
+                (working_key, "quotidien", target_col, bounds),
+                lambda: (
+                    df_rapport.groupby(df_rapport.index)[target_col].sum().to_numpy(dtype=float),
+                    df_rapport.index.unique().sort_values(),
+                ),
+            )
+            daily_values = pd.Series(trend.get("values"), index=trend.get("dates"))
+            ma_7 = pd.Series(trend.get("MA_7_pleine"), index=daily_values.index)
             
             fig = go.Figure()
             
@@ -2441,7 +2303,7 @@ L'équipe VentesPRO
             
             # Variables produit/catégorie (robuste)
             if cat_col != "Aucune" and cat_col in df_rapport.columns:
-                _cat_sum = df_rapport.groupby(cat_col)[target_col].sum().sort_values(ascending=False)
+                _cat_sum = df_rapport.groupby(cat_col, observed=True)[target_col].sum().sort_values(ascending=False)
                 top_produits = _cat_sum.head(5)
                 bottom_produits = _cat_sum.tail(5)
                 best_product = top_produits.index[0] if len(top_produits) else "N/A"
@@ -2604,7 +2466,7 @@ Fin du Rapport
                     st.markdown("### 📦 Analyse des Catégories")
 
                     if cat_col != "Aucune" and cat_col in df.columns:
-                        prod_perf = df.groupby(cat_col)[target_col].agg(['sum', 'mean', 'std']).round(2)
+                        prod_perf = df.groupby(cat_col, observed=True)[target_col].agg(['sum', 'mean', 'std']).round(2)
                         prod_perf.columns = ['Total', 'Moyenne', 'Volatilité']
                         prod_perf['CV'] = np.where(
                             prod_perf['Moyenne'] != 0,
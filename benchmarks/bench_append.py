@@ -0,0 +1,70 @@
+"""Benchmark: rechargement complet de l'historique vs mode ajout (delta d'un jour).
+
+Usage: python benchmarks/bench_append.py [nb_lignes]
+"""
+import io
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.append import conform_delta, merge_delta  # noqa: E402
+from utils.ingestion import compact_dtypes, index_by_date, ingest  # noqa: E402
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ventes_historique.csv")
+
+
+class _Upload(io.BytesIO):
+    name = "ventes.csv"
+
+
+def _history(n_rows: int) -> pd.DataFrame:
+    base = pd.read_csv(SAMPLE, sep=';')
+    big = pd.concat([base] * (n_rows // len(base) + 1), ignore_index=True).iloc[:n_rows]
+    # Une ligne par (jour, produit, région): 400 produits × 3 régions sur plusieurs années
+    combos = pd.MultiIndex.from_product(
+        [[f"Produit_{i:03d}" for i in range(400)], base["Region"].unique()], names=["Produit", "Region"]
+    ).to_frame(index=False)
+    per_day = len(combos)
+    days = pd.date_range("2015-01-01", periods=n_rows // per_day + 1, freq="D")
+    big["Date"] = days.repeat(per_day)[:n_rows].strftime("%Y-%m-%d")
+    big[["Produit", "Region"]] = pd.concat([combos] * len(days), ignore_index=True).iloc[:n_rows].to_numpy()
+    return big
+
+
+def _full_reload(raw: bytes) -> pd.DataFrame:
+    df, _ = ingest(_Upload(raw))
+    df, _ = compact_dtypes(df)
+    return index_by_date(df, "Date")
+
+
+def main(n_rows: int = 1_000_000) -> None:
+    history = _history(n_rows)
+    last_day = history["Date"].max()
+    delta = history[history["Date"] == last_day].copy()
+    delta["Date"] = (pd.Timestamp(last_day) + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+    delta = pd.concat([delta, history[history["Date"] == last_day].head(3)])  # 3 corrections de la veille
+
+    base = _full_reload(history.to_csv(sep=';', index=False).encode())
+    full_raw = pd.concat([history, delta]).to_csv(sep=';', index=False).encode()
+    delta_raw = delta.to_csv(sep=';', index=False).encode()
+
+    start = time.perf_counter()
+    full = _full_reload(full_raw)
+    full_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parsed, _ = ingest(_Upload(delta_raw))
+    merged, report = merge_delta(base, conform_delta(index_by_date(parsed, "Date"), base))
+    append_s = time.perf_counter() - start
+
+    print(f"Historique: {len(base):,} lignes, delta: {len(delta)} lignes -> {report}")
+    print(f"Rechargement complet: {full_s:.3f} s ({len(full):,} lignes, dont doublons)")
+    print(f"Mode ajout:           {append_s:.3f} s ({len(merged):,} lignes) -> {full_s / append_s:.0f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,94 @@
+"""Benchmark: prévision de toutes les séries Produit × Region, boucle série par série vs
+batch_forecast (panel + lots répartis sur le pool de processus). Vérifie aussi qu'activer
+les exogènes change la prévision groupée à clés de cache identiques.
+
+Usage: python benchmarks/bench_batch.py [nb_produits] [nb_regions] [nb_semaines]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.batch import batch_forecast, batch_summary  # noqa: E402
+from models.features import FOURIER_TERMS, fourier_columns  # noqa: E402
+from models.forecasting import prepare_series  # noqa: E402
+from models.panel import build_exog_panel, build_panel  # noqa: E402
+from models.registry import ForecastSeries, run_model  # noqa: E402
+from models.scheduler import ModelPool  # noqa: E402
+from utils.feature_engineering import detect_exog  # noqa: E402
+
+MODEL = "Tendance linéaire"
+HORIZON = 12
+
+
+def _frame(n_products: int, n_regions: int, n_weeks: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    weeks = pd.date_range("2022-01-02", periods=n_weeks, freq="W")
+    n_series = n_products * n_regions
+    t = np.tile(np.arange(n_weeks), n_series)
+    level = np.repeat(rng.uniform(50, 300, n_series), n_weeks)
+    return pd.DataFrame({
+        "Date": np.tile(weeks, n_series),
+        "Produit": np.repeat([f"SKU_{i:03d}" for i in range(n_products)], n_regions * n_weeks),
+        "Region": np.tile(np.repeat([f"R{j:02d}" for j in range(n_regions)], n_weeks), n_products),
+        "Ventes": level * (1 + 0.2 * np.sin(2 * np.pi * t / 52)) + rng.normal(0, 10, len(t)),
+    })
+
+
+def check_exog(df: pd.DataFrame, pool: ModelPool) -> None:
+    """Même dataset_key / series_key avec puis sans exogènes: les prévisions doivent différer
+    (matrices de features distinctes dans le magasin des processus)."""
+    rng = np.random.default_rng(1)
+    df = df[df["Produit"].isin(df["Produit"].unique()[:2]) & df["Region"].isin(df["Region"].unique()[:2])].copy()
+    df["Promo"] = rng.integers(0, 2, len(df))
+    df["Ventes"] += 40 * df["Promo"]
+    panel = build_panel(df, "Ventes", ["Produit", "Region"], "Date", "W")
+    exog = build_exog_panel(df, detect_exog(df), ["Produit", "Region"], "Date", "W")
+    tables = [
+        batch_forecast(panel, "Random Forest", HORIZON, exog_panel=e, dataset_key="bench-exog", pool=pool)
+        for e in (exog, None)
+    ]
+    if np.allclose(tables[0]["Prévision"], tables[1]["Prévision"]):
+        raise AssertionError("exogènes sans effet sur batch_forecast: matrice de features périmée")
+    print(f"exogènes: {tables[0]['MAE'].mean():.2f} vs sans {tables[1]['MAE'].mean():.2f} MAE moyenne (OK)")
+
+
+def main(n_products: int = 40, n_regions: int = 12, n_weeks: int = 156) -> None:
+    df = _frame(n_products, n_regions, n_weeks)
+    fourier = fourier_columns(FOURIER_TERMS["W"])
+
+    start = time.perf_counter()
+    df["Serie"] = df["Produit"] + " × " + df["Region"]
+    for key in df["Serie"].unique():
+        df_ts, _, _ = prepare_series(df, "Ventes", "Serie", "Date", key, "W")
+        run_model(MODEL, ForecastSeries(df_ts, "W", fourier_columns=fourier), HORIZON, confidence=False)
+    loop_s = time.perf_counter() - start
+
+    pool = ModelPool()
+    list(pool.imap([(0, time.sleep, (0,), {})]))  # processus démarrés (imports) hors mesure
+    timings = {}
+    for chunk_size in (1, 32):
+        start = time.perf_counter()
+        panel = build_panel(df, "Ventes", ["Produit", "Region"], "Date", "W")
+        table = batch_forecast(panel, MODEL, HORIZON, chunk_size=chunk_size, pool=pool)
+        timings[chunk_size] = time.perf_counter() - start
+    check_exog(df, pool)
+    pool.close()
+
+    summary = batch_summary(table)
+    n_series = n_products * n_regions
+    print(f"{n_series} séries ({n_products} produits × {n_regions} régions) × {n_weeks} semaines, {MODEL}, "
+          f"{pool.size} processus")
+    print(f"boucle série par série:   {loop_s:.2f} s")
+    print(f"batch, lots de 1 série:   {timings[1]:.2f} s")
+    print(f"batch, lots (<= 32):      {timings[32]:.2f} s -> {loop_s / timings[32]:.1f}x")
+    print(f"table longue: {len(table)} lignes, {int(summary['Erreur'].notna().sum())} échecs, "
+          f"MAE médiane {summary['MAE'].median():.2f}")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:4]))
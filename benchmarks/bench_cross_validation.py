@@ -0,0 +1,50 @@
+"""Benchmark: validation à origine glissante, un réajustement par pli (refit=True) vs
+état prolongé (ajustement unique, extend statsmodels / matrice de features partagée).
+
+Usage: python benchmarks/bench_cross_validation.py [nb_jours] [plis]
+"""
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.features import FOURIER_TERMS, fourier_columns  # noqa: E402
+from models.registry import MODELS, ForecastSeries, get_model  # noqa: E402
+
+
+def _timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    value = func(*args, **kwargs)
+    return value, time.perf_counter() - start
+
+
+def main(n_days: int = 730, folds: int = 5) -> None:
+    warnings.filterwarnings("ignore")
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2022-01-01", periods=n_days, freq="D")
+    t = np.arange(n_days)
+    values = 150 + 0.05 * t + 30 * np.sin(2 * np.pi * t / 7) + rng.normal(0, 10, n_days)
+    df_ts = pd.DataFrame({"Valeurs": np.maximum(values, 0)}, index=dates)
+    series = ForecastSeries(df_ts, "D", "bench", ("Ventes", n_days), fourier_columns(FOURIER_TERMS["D"]))
+
+    print(f"{n_days} jours, {folds} plis (origines sur les {n_days - series.split_index()} derniers jours)")
+    print(f"{'':28s} {'1 ajust.':>8s} {'refit':>8s} {'prolongé':>9s} {'gain':>6s}   MAE par pli")
+    for label, cls in MODELS.items():
+        if not cls.available:
+            print(f"{cls.name:28s} indisponible ({cls.requirement})")
+            continue
+        _, single_s = _timed(get_model(label).fit, series, series.split_index())
+        _, refit_s = _timed(get_model(label).cross_validate, series, folds, refit=True)
+        cv, rolling_s = _timed(get_model(label).cross_validate, series, folds)
+        fold_mae, _ = cv.fold_scores()
+        print(f"{cls.name:28s} {single_s:7.2f}s {refit_s:7.2f}s {rolling_s:8.2f}s {refit_s / rolling_s:5.1f}x   "
+              + " ".join(f"{mae:6.2f}" for mae in fold_mae))
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
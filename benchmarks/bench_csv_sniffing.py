@@ -0,0 +1,75 @@
+"""Benchmark: boucle séparateur × encodage historique vs détection + lecture unique.
+
+Usage: python benchmarks/bench_csv_sniffing.py [nb_lignes]
+"""
+import io
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.ingestion import read_csv_sniffed  # noqa: E402
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ventes_historique.csv")
+
+
+def legacy_read_csv_like(f):
+    """Ancienne implémentation de utils.data.load_data (jusqu'à 9 lectures complètes)."""
+    for sep in [';', ',', '\t', '|']:
+        for enc in ['utf-8', 'latin-1']:
+            try:
+                f.seek(0)
+                _df = pd.read_csv(f, sep=sep, encoding=enc)
+                if _df is not None and len(_df.columns) > 1:
+                    return _df
+            except Exception:
+                continue
+    try:
+        f.seek(0)
+        _df = pd.read_csv(f, sep=None, engine="python")
+        if _df is not None and len(_df.columns) > 1:
+            return _df
+    except Exception:
+        return None
+    return None
+
+
+def _make_payloads(n_rows: int):
+    base = pd.read_csv(SAMPLE, sep=';')
+    big = pd.concat([base] * (n_rows // len(base) + 1), ignore_index=True).iloc[:n_rows]
+    # Le premier caractère non UTF-8 apparaît en fin de fichier: pire cas de l'ancienne boucle
+    late_latin = pd.concat([big, big.tail(1).assign(Region="Fès")], ignore_index=True)
+    # Accents absents de l'échantillon mais fréquents ensuite (une ligne sur deux)
+    half_latin = big.assign(Region=big["Region"].where(big.index < len(big) // 2, "Fès"))
+    return {
+        "';' utf-8": big.to_csv(sep=';', index=False).encode('utf-8'),
+        "';' latin-1 (fin de fichier)": late_latin.to_csv(sep=';', index=False).encode('latin-1'),
+        "';' latin-1 (2e moitié)": half_latin.to_csv(sep=';', index=False).encode('latin-1'),
+        "';' décimale ','": big.to_csv(sep=';', decimal=',', index=False).encode('utf-8'),
+        "'|' utf-8": big.to_csv(sep='|', index=False).encode('utf-8'),
+    }
+
+
+def _time(fn, raw: bytes, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        buf = io.BytesIO(raw)
+        start = time.perf_counter()
+        fn(buf)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(n_rows: int = 500_000) -> None:
+    print(f"{'Fichier':<32}{'Mo':>8}{'Ancien (s)':>12}{'Nouveau (s)':>13}{'Gain':>8}")
+    for label, raw in _make_payloads(n_rows).items():
+        old = _time(legacy_read_csv_like, raw)
+        new = _time(read_csv_sniffed, raw)
+        print(f"{label:<32}{len(raw) / 1e6:>8.1f}{old:>12.3f}{new:>13.3f}{old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
@@ -0,0 +1,61 @@
+"""Benchmark: lecture Excel par défaut vs chemin rapide (moteur, feuille, colonnes, cache Arrow).
+
+Usage: python benchmarks/bench_excel_ingestion.py [nb_lignes]
+"""
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+CACHE_DIR = tempfile.mkdtemp(prefix="ventespro-bench-")
+os.environ["VENTESPRO_CACHE_DIR"] = CACHE_DIR
+
+from utils import arrow_store, data, ingestion  # noqa: E402
+
+USECOLS = ["Date", "Produit", "Region", "Ventes"]
+
+
+class _Upload(io.BytesIO):
+    name = "ventes.xlsx"
+
+
+def _make_workbook(n_rows: int) -> bytes:
+    base = pd.read_csv(os.path.join(ROOT, "ventes_historique.csv"), sep=';')
+    big = pd.concat([base] * (n_rows // len(base) + 1), ignore_index=True).iloc[:n_rows]
+    buf = io.BytesIO()
+    with pd.ExcelWriter(buf, engine="openpyxl") as writer:
+        big.to_excel(writer, sheet_name="Ventes", index=False)
+        base.head(100).to_excel(writer, sheet_name="Notes", index=False)
+    return buf.getvalue()
+
+
+def _time(label: str, fn) -> None:
+    start = time.perf_counter()
+    out = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<48}{elapsed:>9.2f} s   {out.shape}")
+
+
+def main(n_rows: int = 200_000) -> None:
+    raw = _make_workbook(n_rows)
+    print(f"Classeur: {n_rows} lignes, {len(raw) / 1e6:.1f} Mo, moteur rapide: {ingestion.excel_engine('xlsx')}")
+    try:
+        _time("Ancien: pd.read_excel(file)", lambda: pd.read_excel(_Upload(raw)))
+        _time("Rapide: toutes colonnes", lambda: ingestion.read_excel_fast(_Upload(raw), "Ventes"))
+        _time(f"Rapide: {len(USECOLS)} colonnes", lambda: ingestion.read_excel_fast(_Upload(raw), "Ventes", USECOLS))
+        _time("load_data (1er chargement -> Arrow)", lambda: data.load_data(_Upload(raw), sheet_name="Ventes"))
+        arrow_store._shared.clear()  # simule un redémarrage du serveur
+        _time("load_data (rechargement depuis Arrow)", lambda: data.load_data(_Upload(raw), sheet_name="Ventes"))
+    finally:
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,67 @@
+"""Benchmark: graphe de features paresseux (colonnes demandées seulement, cumuls partagés),
+dont les colonnes déclarées par chaque modèle du registre (feature_columns).
+
+Usage: python benchmarks/bench_feature_graph.py [nb_series] [nb_jours]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.features import FEATURE_COLS, FOURIER_TERMS, FeatureGraph, fourier_columns  # noqa: E402
+from models.registry import MODELS, ForecastSeries  # noqa: E402
+
+SUBSET = ["Temps", "MA_7", "Lag_1"]
+WINDOWS = (7, 14, 30, 60, 90)
+
+
+def main(n_series: int = 1000, n_days: int = 1500) -> None:
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2020-01-01", periods=n_days, freq="D")
+    series = [rng.integers(0, 300, n_days).astype(float) for _ in range(n_series)]
+
+    start = time.perf_counter()
+    for values in series:
+        FeatureGraph(values, dates).matrix(FEATURE_COLS)
+    full_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for values in series:
+        FeatureGraph(values, dates).matrix(SUBSET)
+    subset_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    legacy = [[pd.Series(v).rolling(w).mean().to_numpy() for w in WINDOWS] for v in series]
+    pandas_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    graphs = [FeatureGraph(v, dates) for v in series]
+    shared = [[g.get(f"MA_{w}_pleine") for w in WINDOWS] for g in graphs]
+    graph_s = time.perf_counter() - start
+
+    same = all(np.allclose(a, b, equal_nan=True) for la, lb in zip(legacy, shared) for a, b in zip(la, lb))
+    print(f"{n_series} séries × {n_days} jours")
+    print(f"{len(FEATURE_COLS)} colonnes:              {full_s:.3f} s")
+    print(f"{len(SUBSET)} colonnes {SUBSET}: {subset_s:.3f} s -> {full_s / subset_s:.1f}x")
+    print(f"{len(WINDOWS)} moyennes glissantes, identiques: {same}")
+    print(f"pandas rolling:            {pandas_s:.3f} s")
+    print(f"graphe (cumuls partagés):  {graph_s:.3f} s -> {pandas_s / graph_s:.1f}x ({graphs[0].report()})")
+
+    print("colonnes déclarées par modèle (Fourier journalier), calcul sur toutes les séries:")
+    fourier = fourier_columns(FOURIER_TERMS["D"])
+    for label, cls in MODELS.items():
+        columns = cls().feature_columns(ForecastSeries(pd.DataFrame(index=dates), "D", fourier_columns=fourier))
+        start = time.perf_counter()
+        for values in series:
+            graph = FeatureGraph(values, dates)
+            graph.matrix(columns)
+        print(f"  {cls.name:28s} {len(columns):3d} colonnes {time.perf_counter() - start:7.3f} s, "
+              f"{len(graph.computed)} transformations")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
@@ -0,0 +1,72 @@
+"""Benchmark: build_features pandas (historique) vs moteur NumPy float32 + table calendaire.
+
+Usage: python benchmarks/bench_features.py [nb_series] [nb_jours]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.features import FEATURE_COLS, feature_matrix, panel_feature_matrices  # noqa: E402
+from utils.holidays import FERIE, RAMADAN, VACANCES, holiday_flags  # noqa: E402
+from models.panel import build_panel  # noqa: E402
+
+
+def legacy_build_features(df_ts: pd.DataFrame):
+    """Ancienne implémentation de build_features (DataFrame + accesseurs .dt par série),
+    complétée des drapeaux fériés / Ramadan / vacances du jour."""
+    tmp = df_ts.copy().reset_index().rename(columns={"index": "Date"})
+    tmp["Date"] = pd.to_datetime(tmp["Date"], errors="coerce")
+    tmp["Temps"] = np.arange(len(tmp))
+    tmp["Jour"] = tmp["Date"].dt.day
+    tmp["Mois"] = tmp["Date"].dt.month
+    tmp["JourSemaine"] = tmp["Date"].dt.dayofweek
+    tmp["JourAnnee"] = tmp["Date"].dt.dayofyear
+    tmp["Trimestre"] = tmp["Date"].dt.quarter
+    flags = holiday_flags(tmp["Date"])
+    for name, bit in (("Ferie", FERIE), ("Ramadan", RAMADAN), ("Vacances", VACANCES)):
+        tmp[name] = (flags & bit) > 0
+    tmp["MA_7"] = tmp["Valeurs"].rolling(7, min_periods=1).mean()
+    tmp["MA_30"] = tmp["Valeurs"].rolling(30, min_periods=1).mean()
+    tmp["Lag_1"] = tmp["Valeurs"].shift(1)
+    tmp["Lag_1"] = tmp["Lag_1"].fillna(tmp["Valeurs"].iloc[0])
+    return tmp[FEATURE_COLS]
+
+
+def main(n_series: int = 1000, n_days: int = 1500) -> None:
+    rng = np.random.default_rng(0)
+    days = pd.date_range("2020-01-01", periods=n_days, freq="D")
+    df = pd.DataFrame({
+        "Date": np.tile(days, n_series),
+        "Produit": np.repeat(np.arange(n_series), n_days),
+        "Ventes": rng.integers(0, 300, n_series * n_days),
+    })
+    panel = build_panel(df, "Ventes", ["Produit"], "Date")
+    series = [panel.series(k)[0] for k in panel.keys]
+
+    start = time.perf_counter()
+    legacy = [legacy_build_features(s) for s in series]
+    legacy_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matrices = [feature_matrix(s["Valeurs"].to_numpy(), s.index) for s in series]
+    single_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tensor = panel_feature_matrices(panel)
+    panel_s = time.perf_counter() - start
+
+    same = all(np.allclose(a.to_numpy(dtype=np.float64), b, rtol=1e-6) for a, b in zip(legacy, matrices))
+    same_panel = np.allclose(tensor, np.stack(matrices), rtol=1e-6)
+    print(f"{n_series} séries × {n_days} jours, identiques: {same} (panel: {same_panel})")
+    print(f"pandas par série:      {legacy_s:.2f} s")
+    print(f"NumPy par série:       {single_s:.3f} s -> {legacy_s / single_s:.0f}x")
+    print(f"NumPy panel (tenseur): {panel_s:.3f} s -> {legacy_s / panel_s:.0f}x, {tensor.nbytes / 1e6:.0f} Mo")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
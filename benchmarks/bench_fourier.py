@@ -0,0 +1,54 @@
+"""Benchmark: SARIMA vs régression linéaire + termes de Fourier sur un long historique journalier.
+
+Usage: python benchmarks/bench_fourier.py [nb_jours]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import mean_absolute_error
+from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.features import FOURIER_TERMS, date_feature_matrix, fourier_columns  # noqa: E402
+from models.forecasting import sarima_seasonal_order  # noqa: E402
+
+
+def main(n_days: int = 1500) -> None:
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2020-01-01", periods=n_days, freq="D")
+    t = np.arange(n_days)
+    y = (
+        200 + 0.05 * t
+        + 25 * np.sin(2 * np.pi * t / 7) + 10 * np.cos(4 * np.pi * t / 7)
+        + 40 * np.sin(2 * np.pi * t / 365.25)
+        + rng.normal(0, 8, n_days)
+    )
+    split = int(n_days * 0.8)
+
+    start = time.perf_counter()
+    sarima = SARIMAX(y[:split], order=(1, 1, 1), seasonal_order=sarima_seasonal_order(split, "D")).fit(disp=False)
+    pred_sarima = sarima.forecast(steps=n_days - split)
+    sarima_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    columns = fourier_columns(FOURIER_TERMS["D"])
+    X = np.column_stack([t, date_feature_matrix(dates, columns)])
+    lr = LinearRegression().fit(X[:split], y[:split])
+    pred_lr = lr.predict(X[split:])
+    fourier_s = time.perf_counter() - start
+
+    print(f"{n_days} jours, test sur {n_days - split} jours ({len(columns)} termes de Fourier)")
+    print(f"SARIMA{sarima_seasonal_order(split, 'D')}: {sarima_s:.2f} s, MAE {mean_absolute_error(y[split:], pred_sarima):.1f}")
+    print(
+        f"Linéaire + Fourier:       {fourier_s:.3f} s, MAE {mean_absolute_error(y[split:], pred_lr):.1f}"
+        f" -> {sarima_s / fourier_s:.0f}x"
+    )
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:2]))
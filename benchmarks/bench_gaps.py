@@ -0,0 +1,71 @@
+"""Benchmark: lacunes détectées et imputées série par série (pandas) vs masques NumPy sur le panel.
+
+Usage: python benchmarks/bench_gaps.py [nb_series] [nb_jours]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.gaps import gap_report, impute_panel  # noqa: E402
+from models.panel import build_panel  # noqa: E402
+
+
+def legacy_gaps(series: pd.Series) -> tuple:
+    """Une série: asfreq, comptage des trous, plus longue lacune, interpolation."""
+    regular = series.asfreq("D")
+    missing = regular.isna()
+    runs = missing.ne(missing.shift()).cumsum()
+    longest = int(missing.groupby(runs).sum().max()) if missing.any() else 0
+    return int(missing.sum()), longest, regular.interpolate(limit_area="inside").to_numpy()
+
+
+def _frame(n_series: int, n_days: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    days = pd.date_range("2020-01-01", periods=n_days, freq="D")
+    df = pd.DataFrame({
+        "Date": np.tile(days, n_series),
+        "Produit": np.repeat(np.arange(n_series), n_days),
+        "Ventes": rng.integers(0, 300, n_series * n_days).astype(float),
+    })
+    return df[rng.random(len(df)) > 0.1]  # ~10 % de jours manquants
+
+
+def _panel_run(df: pd.DataFrame):
+    panel = build_panel(df, "Ventes", ["Produit"], "Date")
+    start = time.perf_counter()
+    report = gap_report(panel)
+    imputed = impute_panel(panel, "interpolate")
+    return panel, report, imputed, time.perf_counter() - start
+
+
+def main(n_series: int = 400, n_days: int = 1500) -> None:
+    df = _frame(n_series, n_days)
+    panel, report, imputed, panel_s = _panel_run(df)
+
+    start = time.perf_counter()
+    legacy = {
+        key: legacy_gaps(group.set_index("Date")["Ventes"])
+        for key, group in df.groupby("Produit", sort=False)
+    }
+    legacy_s = time.perf_counter() - start
+
+    same = all(
+        report.loc[key, "Manquantes"] == legacy[key][0]
+        and report.loc[key, "Plus longue lacune"] == legacy[key][1]
+        and np.allclose(imputed.column(key), legacy[key][2])
+        for key in panel.keys
+    )
+    _, _, _, double_s = _panel_run(_frame(2 * n_series, n_days))
+    print(f"{n_series} séries × {n_days} jours, identiques: {same}")
+    print(f"pandas par série:             {legacy_s:.2f} s")
+    print(f"panel (rapport + imputation): {panel_s:.3f} s -> {legacy_s / panel_s:.0f}x")
+    print(f"panel × 2 séries:             {double_s:.3f} s ({double_s / panel_s:.1f}x, linéaire)")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
@@ -0,0 +1,67 @@
+"""Benchmark: jours fériés / Ramadan / vacances calculés date par date vs table précalculée.
+
+Usage: python benchmarks/bench_holidays.py [nb_series] [nb_jours]
+"""
+import os
+import sys
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.holidays import (  # noqa: E402
+    FERIE,
+    FIXED_HOLIDAYS,
+    HOLIDAY_SINCE,
+    ISLAMIC_HOLIDAYS,
+    RAMADAN,
+    RAMADAN_MONTH,
+    SCHOOL_BREAKS,
+    VACANCES,
+    holiday_flags,
+    islamic_to_days,
+)
+
+_EPOCH = date(1970, 1, 1).toordinal()
+
+
+def naive_flags(day: pd.Timestamp) -> int:
+    """Une date à la fois: règles civiles, puis conversion hégirienne des années voisines."""
+    flags = 0
+    key = (day.month, day.day)
+    if key in FIXED_HOLIDAYS and day.year >= HOLIDAY_SINCE.get(key, 0):
+        flags |= FERIE
+    if any(start <= key <= end for start, end in SCHOOL_BREAKS):
+        flags |= VACANCES
+    n = day.toordinal() - _EPOCH
+    hijri = (day.year - 622) * 33 // 32
+    for year in (hijri - 1, hijri, hijri + 1, hijri + 2):
+        if any(int(islamic_to_days(year, m, d)) == n for m, d in ISLAMIC_HOLIDAYS):
+            flags |= FERIE
+        if int(islamic_to_days(year, RAMADAN_MONTH, 1)) <= n < int(islamic_to_days(year, RAMADAN_MONTH + 1, 1)):
+            flags |= RAMADAN
+    return flags
+
+
+def main(n_series: int = 20, n_days: int = 1500) -> None:
+    days = pd.date_range("2020-01-01", periods=n_days, freq="D")
+
+    start = time.perf_counter()
+    naive = [np.array([naive_flags(d) for d in days], dtype=np.uint8) for _ in range(n_series)]
+    naive_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fast = [holiday_flags(days) for _ in range(n_series)]
+    fast_s = time.perf_counter() - start
+
+    same = all(np.array_equal(a, b) for a, b in zip(naive, fast))
+    print(f"{n_series} séries × {n_days} jours, identiques: {same}")
+    print(f"date par date:   {naive_s:.2f} s")
+    print(f"table par jour:  {fast_s:.4f} s -> {naive_s / fast_s:.0f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
@@ -0,0 +1,55 @@
+"""Benchmark: clic « Générer » répété (horizon raccourci / allongé, bande de confiance)
+avec run_model (réajustement à chaque fois) vs cached_run_model (modèle ajusté en cache).
+
+Usage: python benchmarks/bench_model_cache.py [nb_jours]
+"""
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.features import FOURIER_TERMS, fourier_columns  # noqa: E402
+from models.model_cache import cached_run_model, model_cache_stats  # noqa: E402
+from models.registry import MODELS, ForecastSeries, run_model  # noqa: E402
+
+# Clics successifs: (horizon, bande de confiance)
+CLICKS = [(30, False), (14, False), (30, True), (90, True)]
+
+
+def _timed(func, *args, **kwargs) -> float:
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main(n_days: int = 730) -> None:
+    warnings.filterwarnings("ignore")
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2022-01-01", periods=n_days, freq="D")
+    t = np.arange(n_days)
+    values = 150 + 0.05 * t + 30 * np.sin(2 * np.pi * t / 7) + rng.normal(0, 10, n_days)
+    df_ts = pd.DataFrame({"Valeurs": np.maximum(values, 0)}, index=dates)
+    series = ForecastSeries(df_ts, "D", "bench", ("Ventes", n_days), fourier_columns(FOURIER_TERMS["D"]))
+
+    print(f"{n_days} jours, clics (horizon, bande): {CLICKS}")
+    print(f"{'':28s} {'run_model':>10s}  {'1er clic':>9s}  {'clics suivants (ms)':s}")
+    for label, cls in MODELS.items():
+        if not cls.available:
+            print(f"{cls.name:28s} indisponible ({cls.requirement})")
+            continue
+        refit = sum(_timed(run_model, label, series, h, confidence=c) for h, c in CLICKS[1:])
+        first = _timed(cached_run_model, label, series, *CLICKS[0])
+        repeats = [_timed(cached_run_model, label, series, h, confidence=c) * 1000 for h, c in CLICKS[1:]]
+        print(f"{cls.name:28s} {refit:9.2f}s  {first:8.2f}s  " + "  ".join(f"{ms:8.1f}" for ms in repeats))
+    stats = model_cache_stats()
+    print(f"cache: {stats['entries']} modèles, {stats['bytes'] / 1024 / 1024:.1f} Mo, "
+          f"{stats['hits']} succès, {stats['predictions']} prévisions prolongées")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:2]))
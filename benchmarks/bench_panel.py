@@ -0,0 +1,51 @@
+"""Benchmark: prepare_series par catégorie vs panel construit en un seul groupby.
+
+Usage: python benchmarks/bench_panel.py [nb_lignes] [nb_produits]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.forecasting import prepare_series  # noqa: E402
+from models.panel import build_panel  # noqa: E402
+
+
+def _frame(n_rows: int, n_products: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    days = pd.date_range("2019-01-01", periods=max(n_rows // n_products, 30), freq="D")
+    return pd.DataFrame({
+        "Date": rng.choice(days, n_rows),
+        "Produit": pd.Categorical(rng.integers(0, n_products, n_rows).astype(str)),
+        "Ventes": rng.integers(0, 300, n_rows),
+    })
+
+
+def main(n_rows: int = 1_000_000, n_products: int = 400) -> None:
+    df = _frame(n_rows, n_products)
+    products = list(df["Produit"].cat.categories)
+
+    start = time.perf_counter()
+    legacy = {p: prepare_series(df, "Ventes", "Produit", "Date", p)[0] for p in products}
+    legacy_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    panel = build_panel(df, "Ventes", ["Produit"], "Date")
+    build_s = time.perf_counter() - start
+    start = time.perf_counter()
+    series = {p: panel.series(p)[0] for p in products}
+    extract_s = time.perf_counter() - start
+
+    same = all(np.allclose(legacy[p]["Valeurs"].to_numpy(), series[p]["Valeurs"].to_numpy()) for p in products)
+    print(f"{n_rows:,} lignes, {n_products} produits, résultats identiques: {same}")
+    print(f"prepare_series × {n_products}: {legacy_s:.2f} s")
+    print(f"build_panel:                {build_s:.3f} s (+ extraction {extract_s:.3f} s) -> "
+          f"{legacy_s / (build_s + extract_s):.0f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
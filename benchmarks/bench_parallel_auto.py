@@ -0,0 +1,62 @@
+"""Benchmark: Auto séquentiel (run_model l'un après l'autre) vs pool de processus (run_models).
+
+Usage: python benchmarks/bench_parallel_auto.py [nb_jours] [processus] [budget_s]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.features import FOURIER_TERMS, fourier_columns  # noqa: E402
+from models.registry import AUTO_MODELS, MODELS, ForecastSeries, run_model  # noqa: E402
+from models.scheduler import ModelPool  # noqa: E402
+
+HORIZON = 30
+
+
+def _pool_run(pool: ModelPool, jobs, series, timeout: float):
+    start = time.perf_counter()
+    first, board = None, {}
+    for outcome in pool.run(jobs, series, HORIZON, timeout=timeout):
+        first = first or time.perf_counter() - start
+        board[outcome.name] = outcome.error or f"MAE {outcome.result.mae:.2f}"
+    return first, time.perf_counter() - start, board
+
+
+def main(n_days: int = 1000, workers: int = 0, timeout: float = 120.0) -> None:
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2022-01-01", periods=n_days, freq="D")
+    t = np.arange(n_days)
+    values = 150 + 0.05 * t + 30 * np.sin(2 * np.pi * t / 7) + rng.normal(0, 10, n_days)
+    df_ts = pd.DataFrame({"Valeurs": np.maximum(values, 0)}, index=dates)
+    series = ForecastSeries(df_ts, "D", "bench", ("Ventes", n_days), fourier_columns(FOURIER_TERMS["D"]))
+    jobs = [(label, params) for label, params in AUTO_MODELS.items() if MODELS[label].available]
+
+    start = time.perf_counter()
+    sequential = {}
+    for label, params in jobs:
+        model_start = time.perf_counter()
+        run_model(label, series, HORIZON, confidence=False, **params)
+        sequential[MODELS[label].name] = time.perf_counter() - model_start
+    sequential_s = time.perf_counter() - start
+
+    pool = ModelPool(workers or os.cpu_count() or 1)
+    cold_first, cold_s, _ = _pool_run(pool, jobs, series, timeout)
+    warm_first, warm_s, board = _pool_run(pool, jobs, series, timeout)
+    pool.close()
+
+    slowest = max(sequential, key=sequential.get)
+    print(f"{n_days} jours, {len(jobs)} modèles, {pool.size} processus, budget {timeout:g} s")
+    print(f"séquentiel:          {sequential_s:.2f} s (le plus lent: {slowest} {sequential[slowest]:.2f} s)")
+    print(f"pool (démarrage):    {cold_s:.2f} s, premier résultat après {cold_first:.2f} s")
+    print(f"pool (processus prêts): {warm_s:.2f} s, premier résultat après {warm_first:.2f} s")
+    for name, status in board.items():
+        print(f"  {name:20s} {status}")
+
+
+if __name__ == "__main__":
+    main(*(float(a) if i == 2 else int(a) for i, a in enumerate(sys.argv[1:4])))
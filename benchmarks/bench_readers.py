@@ -0,0 +1,25 @@
+"""Benchmark: chaque lecteur du registre d'ingestion, brut et compressé.
+
+Usage: python benchmarks/bench_readers.py [nb_lignes]
+"""
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.ingestion import benchmark_readers  # noqa: E402
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ventes_historique.csv")
+
+
+def main(n_rows: int = 200_000) -> None:
+    base = pd.read_csv(SAMPLE, sep=';')
+    big = pd.concat([base] * (n_rows // len(base) + 1), ignore_index=True).iloc[:n_rows]
+    print(f"{n_rows} lignes, {len(big.columns)} colonnes")
+    print(benchmark_readers(big, readers=["csv", "tsv", "parquet", "json"], compressions=(None, "gz", "xz")).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
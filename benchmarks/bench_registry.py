@@ -0,0 +1,39 @@
+"""Benchmark: modèles du registre exécutés hors Streamlit (backtest + ajustement + prévision).
+
+Usage: python benchmarks/bench_registry.py [nb_jours] [horizon]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.features import FOURIER_TERMS, fourier_columns  # noqa: E402
+from models.registry import MODELS, ForecastSeries, run_model  # noqa: E402
+
+
+def main(n_days: int = 730, horizon: int = 30) -> None:
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2022-01-01", periods=n_days, freq="D")
+    t = np.arange(n_days)
+    values = 150 + 0.05 * t + 30 * np.sin(2 * np.pi * t / 7) + rng.normal(0, 10, n_days)
+    df_ts = pd.DataFrame({"Valeurs": np.maximum(values, 0)}, index=dates)
+    series = ForecastSeries(df_ts, "D", "bench", ("Ventes", n_days), fourier_columns(FOURIER_TERMS["D"]))
+
+    print(f"{n_days} jours, horizon {horizon}")
+    for label, cls in MODELS.items():
+        if not cls.available:
+            print(f"{cls.name:28s} indisponible ({cls.requirement})")
+            continue
+        start = time.perf_counter()
+        result = run_model(label, series, horizon)
+        elapsed = time.perf_counter() - start
+        print(f"{cls.name:28s} {elapsed:6.2f} s  MAE {result.mae:7.2f}  RMSE {result.rmse:7.2f}  "
+              f"moyenne {result.forecasts.mean():7.2f}")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
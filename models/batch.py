@@ -0,0 +1,238 @@
+import math
+import os
+import signal
+import threading
+from contextlib import contextmanager
+from typing import Callable, Hashable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from models.features import FOURIER_TERMS, fourier_columns
+from models.forecasting import future_dates
+from models.panel import ExogPanel, SeriesPanel
+from models.model_cache import cached_run_model
+from models.registry import AUTO_MODELS, CV_FOLDS, MODELS, ForecastSeries, ModelResult, auto_candidates
+from models.scheduler import MODEL_TIMEOUT_S, ModelPool, model_pool, with_threads
+
+AUTO = "Auto (Comparaison)"
+# Séries par tâche du pool (plafond; réduit pour garder ~4 tâches par processus)
+BATCH_CHUNK_SIZE = int(os.getenv("VENTESPRO_BATCH_CHUNK", "32"))
+CHUNKS_PER_WORKER = 4
+BATCH_COLUMNS = ["Modèle", "Date", "Prévision", "Borne basse", "Borne haute", "MAE", "RMSE", "Erreur"]
+
+
+def run_auto(
+    series: ForecastSeries,
+    horizon: int,
+    confidence: bool = False,
+    n_jobs: Optional[int] = None,
+    folds: int = CV_FOLDS,
+) -> ModelResult:
+    """Auto dans le processus courant: candidats auto_candidates, meilleur MAE de backtest
+    (ou de validation à origine glissante si folds > 1)."""
+    best = None
+    for label in auto_candidates(series):
+        params = AUTO_MODELS[label] if n_jobs is None else with_threads(label, AUTO_MODELS[label], n_jobs)
+        try:
+            result = cached_run_model(label, series, horizon, confidence, folds=folds, **params)
+        except Exception:
+            continue
+        if result.mae is not None and (best is None or result.mae < best.mae):
+            best = result
+    if best is None:
+        raise ValueError("aucun modèle n'a pu être évalué (historique trop court pour un backtest ?)")
+    return best
+
+
+class _SeriesTimeout(Exception):
+    pass
+
+
+def _on_alarm(signum, frame):
+    raise _SeriesTimeout()
+
+
+@contextmanager
+def _series_deadline(seconds: float):
+    """Interrompt le bloc après seconds (SIGALRM, thread principal d'un processus POSIX).
+
+    Sans SIGALRM (Windows) ou hors du thread principal, seul le budget du lot s'applique.
+    Un calcul natif qui ne rend jamais la main à Python n'est interrompu qu'à son retour.
+    """
+    if not hasattr(signal, "setitimer") or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+    previous = signal.signal(signal.SIGALRM, _on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _forecast_chunk(
+    items, label, horizon, freq, fourier_cols, recursive, confidence, n_jobs, dataset_key, series_key, folds,
+    timeout=MODEL_TIMEOUT_S,
+):
+    """Tâche du pool: prévision de chaque série du lot, chacune avec un budget de timeout
+    secondes; une erreur ou un dépassement n'interrompt pas le lot."""
+    done = []
+    for key, df_ts, exog, future_exog, exog_names in items:
+        series = ForecastSeries(
+            df_ts, freq, dataset_key, (series_key, key), fourier_cols, exog, exog_names, future_exog, recursive,
+        )
+        try:
+            with _series_deadline(timeout):
+                if label == AUTO:
+                    result = run_auto(series, horizon, confidence, n_jobs, folds)
+                else:
+                    result = cached_run_model(
+                        label, series, horizon, confidence, folds=folds, **with_threads(label, {}, n_jobs)
+                    )
+            done.append((key, result, None))
+        except _SeriesTimeout:
+            done.append((key, None, f"délai dépassé ({timeout:g} s)"))
+        except Exception as exc:
+            done.append((key, None, f"{type(exc).__name__}: {exc}"))
+    return done
+
+
+def _key_frame(panel: SeriesPanel, keys: List[Hashable], repeats: np.ndarray) -> pd.DataFrame:
+    """Colonnes de clé (une par colonne de regroupement) répétées repeats fois par série."""
+    names = list(panel.key_names) or ["Série"]
+    tuples = [key if isinstance(key, tuple) else (key,) for key in keys]
+    columns = list(zip(*tuples)) if tuples else [() for _ in names]
+    return pd.DataFrame({name: np.repeat(np.array(col, dtype=object), repeats) for name, col in zip(names, columns)})
+
+
+def batch_table(panel: SeriesPanel, outcomes: dict) -> pd.DataFrame:
+    """Table longue: une ligne par période prévue, une seule (Erreur) par série en échec.
+
+    outcomes: clé -> (ModelResult ou None, erreur ou None); ordre des clés du panel.
+    """
+    keys = [k for k in panel.keys if k in outcomes]
+    repeats, dates, forecasts, lower, upper = [], [], [], [], []
+    for key in keys:
+        result = outcomes[key][0]
+        n = 1 if result is None else len(result.forecasts)
+        nan = np.full(n, np.nan)
+        repeats.append(n)
+        if result is None:
+            dates.append(np.full(n, np.datetime64("NaT"), dtype="datetime64[ns]"))
+            forecasts.append(nan)
+        else:
+            dates.append(np.asarray(result.dates, dtype="datetime64[ns]"))
+            forecasts.append(np.asarray(result.forecasts, dtype=np.float64))
+        lower.append(nan if result is None or result.lower is None else result.lower)
+        upper.append(nan if result is None or result.upper is None else result.upper)
+    repeats = np.asarray(repeats, dtype=np.int64)
+    results = [outcomes[k][0] for k in keys]
+
+    def _per_series(values, dtype=object) -> np.ndarray:
+        return np.repeat(np.array(values, dtype=dtype), repeats)
+
+    def _concat(parts, dtype=np.float64) -> np.ndarray:
+        return np.concatenate(parts).astype(dtype) if parts else np.empty(0, dtype=dtype)
+
+    table = _key_frame(panel, keys, repeats)
+    table["Modèle"] = _per_series([r.model if r is not None else None for r in results])
+    table["Date"] = pd.DatetimeIndex(_concat(dates, "datetime64[ns]"))
+    table["Prévision"] = _concat(forecasts)
+    table["Borne basse"] = _concat(lower)
+    table["Borne haute"] = _concat(upper)
+    table["MAE"] = _per_series([np.nan if r is None or r.mae is None else r.mae for r in results], np.float64)
+    table["RMSE"] = _per_series([np.nan if r is None or r.rmse is None else r.rmse for r in results], np.float64)
+    table["Erreur"] = _per_series([outcomes[k][1] for k in keys])
+    return table
+
+
+def batch_summary(table: pd.DataFrame) -> pd.DataFrame:
+    """Une ligne par série: modèle, MAE, RMSE, total prévu, erreur."""
+    keys = [c for c in table.columns if c not in BATCH_COLUMNS]
+    return table.groupby(keys, sort=False, dropna=False).agg(
+        Modèle=("Modèle", "first"),
+        MAE=("MAE", "first"),
+        RMSE=("RMSE", "first"),
+        **{"Total prévu": ("Prévision", lambda values: values.sum(min_count=1))},
+        Erreur=("Erreur", "first"),
+    ).reset_index()
+
+
+def batch_forecast(
+    panel: SeriesPanel,
+    label: str,
+    horizon: int,
+    use_fourier: bool = True,
+    recursive: bool = True,
+    confidence: bool = False,
+    exog_panel: Optional[ExogPanel] = None,
+    future_exog_values: Optional[dict] = None,
+    dataset_key: Optional[Hashable] = None,
+    series_key: Hashable = (),
+    chunk_size: int = BATCH_CHUNK_SIZE,
+    timeout: float = MODEL_TIMEOUT_S,
+    pool: Optional[ModelPool] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+    folds: int = CV_FOLDS,
+) -> pd.DataFrame:
+    """Prévision de toutes les séries du panel avec le modèle label (clé de MODELS ou AUTO).
+
+    Les séries sont réparties en lots (plus longues d'abord) exécutés en parallèle par le
+    pool, chaque série avec un budget de timeout secondes. Un lot perdu en entier (processus
+    tué, calcul natif bloqué) est relancé série par série. Rend la table longue de batch_table
+    (colonnes de clé + BATCH_COLUMNS). progress(séries traitées, total) après chaque lot.
+    folds > 1: MAE / RMSE (et choix d'Auto) par validation à origine glissante.
+    dataset_key / series_key: comme pour cached_build_features, series_key décrivant la
+    configuration commune (cible, fréquence, agrégation, lacunes...); la clé de chaque série
+    y est ajoutée.
+    """
+    if label != AUTO and label not in MODELS:
+        raise ValueError(f"Modèle inconnu: {label} (attendu: {AUTO}, {', '.join(MODELS)})")
+    pool = pool or model_pool()
+    fourier_cols = fourier_columns(FOURIER_TERMS[panel.freq]) if use_fourier else []
+    outcomes = {}
+    items = []
+    for key in panel.keys:
+        df_ts, _, err = panel.series(key)
+        if err:
+            outcomes[key] = (None, err)
+            continue
+        exog, future_exog, exog_names = None, None, []
+        if exog_panel is not None:
+            exog_names = exog_panel.names
+            exog = exog_panel.series(key, df_ts.index)
+            future_exog = exog_panel.series(key, future_dates(df_ts.index[-1], horizon, panel.freq))
+            for i, name in enumerate(exog_names):
+                if name in (future_exog_values or {}):
+                    future_exog[:, i] = future_exog_values[name]
+        items.append((key, df_ts, exog, future_exog, exog_names))
+
+    # Plus longues séries d'abord: les derniers lots, courts, équilibrent la fin du calcul
+    items.sort(key=lambda item: len(item[1]), reverse=True)
+    workers = min(pool.size, max(1, len(items)))
+    size = max(1, min(chunk_size, math.ceil(len(items) / (workers * CHUNKS_PER_WORKER))))
+    chunks = [items[i:i + size] for i in range(0, len(items), size)]
+    n_jobs = pool.threads(len(chunks))
+    args = (
+        label, horizon, panel.freq, fourier_cols, recursive, confidence, n_jobs, dataset_key, series_key, folds,
+        timeout,
+    )
+    total, done = len(panel.keys), len(outcomes)
+    if progress:
+        progress(done, total)
+    # Second passage: séries des lots perdus, une par tâche (seule la fautive échoue)
+    retry = []
+    for pass_chunks in (chunks, retry):
+        tasks = [(i, _forecast_chunk, (chunk,) + args, {}) for i, chunk in enumerate(pass_chunks)]
+        for i, result, error, _ in pool.imap(tasks, timeout * len(pass_chunks[0]) if tasks else timeout):
+            if result is None and len(pass_chunks[i]) > 1:
+                retry.extend([item] for item in pass_chunks[i])
+                continue
+            for key, series_result, series_error in result or [(item[0], None, error) for item in pass_chunks[i]]:
+                outcomes[key] = (series_result, series_error)
+            done += len(pass_chunks[i])
+            if progress:
+                progress(done, total)
+    return batch_table(panel, outcomes)
@@ -0,0 +1,122 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Sequence
+
+import pandas as pd
+
+from models.features import FEATURE_SPEC_VERSION, FeatureGraph, build_features, series_graph
+from utils.cache import cache_get, cache_put, derive_key
+
+FEATURE_STORE_MAX_BYTES = int(os.getenv("VENTESPRO_FEATURE_STORE_MB", "256")) * 1024 * 1024
+FEATURE_STORE_SPILL = os.getenv("VENTESPRO_FEATURE_STORE_SPILL", "1") != "0"
+
+_lock = threading.Lock()
+_store: "OrderedDict[str, tuple]" = OrderedDict()
+_sizes: Dict[str, int] = {}
+_total_bytes = 0  # somme de _sizes
+_stats = {"hits": 0, "disk_hits": 0, "misses": 0, "spilled": 0}
+
+
+def feature_key(dataset_key: str, series_key: Hashable) -> str:
+    """Clé = (empreinte du jeu de données, clé de série, version de la spécification des features)."""
+    return derive_key(dataset_key, "features", series_key, FEATURE_SPEC_VERSION)
+
+
+def cached_series_graph(df_ts: pd.DataFrame, dataset_key: str, series_key: Hashable) -> FeatureGraph:
+    """FeatureGraph de la série (cumuls, calendrier...) partagé par build_features et les
+    modèles qui lisent des moyennes glissantes (même clé que le magasin)."""
+    return series_graph(
+        (dataset_key, "serie", series_key),
+        lambda: (df_ts["Valeurs"].to_numpy(dtype="float64"), df_ts.index),
+    )
+
+
+def _nbytes(entry: tuple) -> int:
+    df_feat, X, y, _ = entry
+    return int(df_feat.memory_usage(index=False).sum() + X.memory_usage(index=False).sum() + y.nbytes)
+
+
+def _from_frame(df_feat: pd.DataFrame) -> tuple:
+    columns = [c for c in df_feat.columns if c not in ("Date", "Valeurs")]
+    return df_feat, df_feat[columns], df_feat["Valeurs"], columns
+
+
+def _remember(key: str, entry: tuple, max_bytes: int, spill: bool) -> None:
+    global _total_bytes
+    size = _nbytes(entry)
+    with _lock:
+        _store[key] = entry
+        _store.move_to_end(key)
+        _total_bytes += size - _sizes.get(key, 0)
+        _sizes[key] = size
+        evicted = []
+        while len(_store) > 1 and _total_bytes > max_bytes:
+            old_key, old_entry = _store.popitem(last=False)
+            _total_bytes -= _sizes.pop(old_key, 0)
+            evicted.append((old_key, old_entry))
+    # Écriture disque hors verrou: les entrées évincées restent relisables (cache_get)
+    for old_key, old_entry in evicted if spill else ():
+        if cache_put(old_key, old_entry[0]):
+            _stats["spilled"] += 1
+
+
+def cached_build_features(
+    df_ts: pd.DataFrame,
+    dataset_key: Optional[str],
+    series_key: Hashable,
+    max_bytes: Optional[int] = None,
+    spill: Optional[bool] = None,
+    exog=None,
+    exog_names: Sequence[str] = (),
+    columns: Optional[Sequence[str]] = None,
+):
+    """build_features mémorisé: même retour (df_feat, X, y, feature_cols).
+
+    Cache mémoire LRU borné en octets (VENTESPRO_FEATURE_STORE_MB), partagé entre les
+    modèles, les backtests et les reruns; les entrées évincées sont écrites en Parquet
+    dans le cache disque (VENTESPRO_FEATURE_STORE_SPILL=0 pour désactiver) et relues au
+    besoin. series_key doit décrire entièrement df_ts et les exogènes (cible, catégorie,
+    fréquence...); exog_names et columns (sous-ensemble de FEATURE_COLS) entrent dans la
+    clé, activer ou retirer des exogènes ne relit donc jamais l'ancienne matrice.
+    Sans dataset_key, pas de mémorisation.
+    """
+    if dataset_key is None:
+        return build_features(df_ts, exog, exog_names, columns)
+    max_bytes = FEATURE_STORE_MAX_BYTES if max_bytes is None else max_bytes
+    spill = FEATURE_STORE_SPILL if spill is None else spill
+    key = feature_key(
+        dataset_key, (series_key, tuple(exog_names)) + (() if columns is None else (tuple(columns),))
+    )
+
+    with _lock:
+        entry = _store.get(key)
+        if entry is not None:
+            _store.move_to_end(key)
+            _stats["hits"] += 1
+            return entry
+
+    df_feat = cache_get(key) if spill else None
+    if df_feat is not None:
+        _stats["disk_hits"] += 1
+        entry = _from_frame(df_feat)
+    else:
+        _stats["misses"] += 1
+        graph = cached_series_graph(df_ts, dataset_key, series_key)
+        entry = build_features(df_ts, exog, exog_names, columns, graph)
+    _remember(key, entry, max_bytes, spill)
+    return entry
+
+
+def feature_store_stats() -> Dict[str, int]:
+    """Compteurs (succès mémoire / disque, calculs, évictions écrites) et taille en mémoire."""
+    with _lock:
+        return {**_stats, "entries": len(_store), "bytes": _total_bytes}
+
+
+def clear_feature_store() -> None:
+    global _total_bytes
+    with _lock:
+        _store.clear()
+        _sizes.clear()
+        _total_bytes = 0
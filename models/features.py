@@ -0,0 +1,403 @@
+import re
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from models.forecasting import future_dates
+from utils.holidays import HOLIDAY_COLS, holiday_features
+
+DATE_COLS = ["Jour", "Mois", "JourSemaine", "JourAnnee", "Trimestre"]
+CALENDAR_COLS = DATE_COLS + HOLIDAY_COLS
+FEATURE_COLS = ["Temps"] + CALENDAR_COLS + ["MA_7", "MA_30", "Lag_1"]
+# Incrémenter quand FEATURE_COLS ou leur calcul change (invalide le magasin de features)
+FEATURE_SPEC_VERSION = "3"
+# Positions dans FEATURE_COLS
+CALENDAR_SLICE = slice(1, 1 + len(CALENDAR_COLS))
+MA_SHORT, MA_LONG, LAG = (FEATURE_COLS.index(c) for c in ("MA_7", "MA_30", "Lag_1"))
+CALENDAR_MARGIN_DAYS = 3 * 366
+MA_WINDOWS = (7, 30)
+GRAPH_CACHE_MAX_ENTRIES = 16
+# Saisonnalités de Fourier par fréquence: (période en jours, ordre)
+FOURIER_TERMS = {
+    "D": ((7, 3), (365.25, 6)),
+    "W": ((365.25, 6),),
+    "M": ((365.25, 3),),
+}
+
+_calendar_lock = threading.Lock()
+_calendar = {"origin": 0, "table": np.empty((0, len(DATE_COLS)), dtype=np.float32)}
+_graph_cache: "OrderedDict[Hashable, FeatureGraph]" = OrderedDict()
+_fourier_tables: Dict[float, dict] = {}
+
+
+def _build_calendar(first_day: int, last_day: int) -> np.ndarray:
+    dates = pd.DatetimeIndex(np.arange(first_day, last_day + 1).astype("datetime64[D]"))
+    return np.column_stack([
+        dates.day, dates.month, dates.dayofweek, dates.dayofyear, dates.quarter,
+    ]).astype(np.float32)
+
+
+def _calendar_covering(lo: int, hi: int) -> Tuple[np.ndarray, int]:
+    """Table jour -> attributs calendaires couvrant [lo, hi] (numéros de jour depuis 1970).
+
+    Construite une fois puis agrandie (avec marge) si une série ou un horizon en sort:
+    toutes les séries et tous les backtests lisent la même table.
+    """
+    with _calendar_lock:
+        origin, table = _calendar["origin"], _calendar["table"]
+        if len(table) and origin <= lo and hi < origin + len(table):
+            return table, origin
+        first = min(lo, origin) if len(table) else lo
+        last = max(hi, origin + len(table) - 1) if len(table) else hi
+        first, last = first - CALENDAR_MARGIN_DAYS, last + CALENDAR_MARGIN_DAYS
+        table = _build_calendar(first, last)
+        table.flags.writeable = False
+        _calendar.update(origin=first, table=table)
+        return table, first
+
+
+def calendar_features(dates, previous=None) -> np.ndarray:
+    """Attributs calendaires (..., 8) en float32: date lue dans la table partagée (aucun .dt
+    recalculé) puis part de jours fériés / Ramadan / vacances de la période (utils.holidays;
+    previous: date précédant la première période, voir holiday_features)."""
+    days = np.asarray(dates, dtype="datetime64[D]")
+    out = np.empty(days.shape + (len(CALENDAR_COLS),), dtype=np.float32)
+    if days.size == 0:
+        return out
+    out[..., :len(DATE_COLS)] = _date_parts(days.astype(np.int64))
+    out[..., len(DATE_COLS):] = holiday_features(days, previous)
+    return out
+
+
+def _cumulative(values: np.ndarray, axis: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """Sommes et nombres d'observations cumulés (les NaN ne comptent pas)."""
+    observed = ~np.isnan(values)
+    return np.cumsum(np.where(observed, values, 0.0), axis=axis), np.cumsum(observed, axis=axis)
+
+
+def _window_mean(cumulative, window: int, min_periods: int = 1, axis: int = 0) -> np.ndarray:
+    """Moyenne glissante lue dans les cumuls (une soustraction par point, quelle que soit la fenêtre)."""
+    sums, counts = cumulative
+    lagged_sums = np.zeros_like(sums)
+    lagged_counts = np.zeros_like(counts)
+    index = [slice(None)] * sums.ndim
+    shifted = [slice(None)] * sums.ndim
+    index[axis], shifted[axis] = slice(window, None), slice(None, -window)
+    lagged_sums[tuple(index)] = sums[tuple(shifted)]
+    lagged_counts[tuple(index)] = counts[tuple(shifted)]
+    n = counts - lagged_counts
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(n >= max(min_periods, 1), (sums - lagged_sums) / n, np.nan)
+
+
+def _rolling_means(values: np.ndarray, window: int, axis: int = 0) -> np.ndarray:
+    """Moyenne glissante (min_periods=1) par sommes cumulées; les NaN ne comptent pas."""
+    return _window_mean(_cumulative(values, axis), window, axis=axis)
+
+
+def _lag(values: np.ndarray, k: int) -> np.ndarray:
+    """Décalage de k pas; les k premiers points reprennent la première valeur."""
+    out = np.empty_like(values)
+    if len(values):
+        out[:k] = values[0]
+        out[k:] = values[:len(values) - k]
+    return out
+
+
+def _date_parts(days: np.ndarray) -> np.ndarray:
+    if days.size == 0:
+        return np.empty(days.shape + (len(DATE_COLS),), dtype=np.float32)
+    table, origin = _calendar_covering(int(days.min()), int(days.max()))
+    return table[days - origin]
+
+
+def _fourier_covering(period: float, order: int, lo: int, hi: int) -> Tuple[np.ndarray, int]:
+    """Table jour -> [sin 1, cos 1, ..., sin K, cos K] de la période, phase fixée au
+    1970-01-01 (historique et horizon partagent les mêmes valeurs). Une table par période,
+    agrandie (plage ou nombre d'harmoniques) comme la table calendaire."""
+    with _calendar_lock:
+        entry = _fourier_tables.get(period)
+        if entry is not None:
+            origin, table = entry["origin"], entry["table"]
+            if origin <= lo and hi < origin + len(table) and table.shape[1] >= 2 * order:
+                return table, origin
+            lo, hi = min(lo, origin), max(hi, origin + len(table) - 1)
+            order = max(order, table.shape[1] // 2)
+        first, last = lo - CALENDAR_MARGIN_DAYS, hi + CALENDAR_MARGIN_DAYS
+        angles = 2 * np.pi * np.arange(first, last + 1)[:, None] / period * np.arange(1, order + 1)[None, :]
+        table = np.empty((last - first + 1, 2 * order), dtype=np.float32)
+        table[:, 0::2] = np.sin(angles)
+        table[:, 1::2] = np.cos(angles)
+        table.flags.writeable = False
+        _fourier_tables[period] = {"origin": first, "table": table}
+        return table, first
+
+
+def _fourier_column(days: np.ndarray, period: float, kind: str, k: int) -> np.ndarray:
+    if days.size == 0:
+        return np.empty(days.shape, dtype=np.float32)
+    table, origin = _fourier_covering(period, k, int(days.min()), int(days.max()))
+    return table[days - origin, 2 * (k - 1) + (kind == "cos")]
+
+
+def fourier_columns(terms: Sequence[Tuple[float, int]]) -> List[str]:
+    """Noms des termes de Fourier: Fourier_<période>_sin<k> / _cos<k>, k = 1..ordre."""
+    return [
+        f"Fourier_{period:g}_{kind}{k}"
+        for period, order in terms for k in range(1, order + 1) for kind in ("sin", "cos")
+    ]
+
+
+def is_date_feature(name: str) -> bool:
+    """Feature déterminée par la seule date (calculable sur l'horizon), hors FEATURE_COLS."""
+    return _FOURIER_PATTERN.match(name) is not None
+
+
+def date_feature_matrix(dates, columns: Sequence[str]) -> np.ndarray:
+    """Features ne dépendant que des dates (Fourier, calendrier) pour des dates quelconques,
+    par exemple l'horizon: (len(dates), len(columns)) float32."""
+    return FeatureGraph(np.zeros(len(dates)), dates).matrix(columns)
+
+
+@dataclass(frozen=True)
+class Transform:
+    """Nœud du graphe de features: compute(*valeurs de deps)."""
+    deps: Tuple[str, ...]
+    compute: Callable
+
+
+# Entrées du graphe (fournies, jamais calculées)
+GRAPH_INPUTS = ("values", "dates", "previous")
+TRANSFORMS: Dict[str, Transform] = {
+    "days": Transform(("dates",), lambda dates: np.asarray(dates, dtype="datetime64[D]").astype(np.int64)),
+    "date_parts": Transform(("days",), _date_parts),
+    "holiday_shares": Transform(("dates", "previous"), holiday_features),
+    "cumulative": Transform(("values",), _cumulative),
+    "Temps": Transform(("values",), lambda values: np.arange(len(values))),
+    **{c: Transform(("date_parts",), partial(lambda i, parts: parts[:, i], i)) for i, c in enumerate(DATE_COLS)},
+    **{c: Transform(("holiday_shares",), partial(lambda i, s: s[:, i], i)) for i, c in enumerate(HOLIDAY_COLS)},
+}
+_FOURIER_PATTERN = re.compile(r"Fourier_(\d+(?:\.\d+)?)_(sin|cos)(\d+)$")
+# Familles paramétrées: MA_<w> (min_periods=1), MA_<w>_pleine (fenêtre complète, comme
+# pandas rolling(w)), Lag_<k> et Fourier_<période>_<sin|cos><k>
+TRANSFORM_PATTERNS: List[Tuple["re.Pattern", Callable[..., Transform]]] = [
+    (re.compile(r"MA_(\d+)$"), lambda w: Transform(("cumulative",), partial(_window_mean, window=int(w)))),
+    (re.compile(r"MA_(\d+)_pleine$"), lambda w: Transform(
+        ("cumulative",), partial(_window_mean, window=int(w), min_periods=int(w))
+    )),
+    (re.compile(r"Lag_(\d+)$"), lambda k: Transform(("values",), partial(_lag, k=int(k)))),
+    (_FOURIER_PATTERN, lambda period, kind, k: Transform(
+        ("days",), partial(_fourier_column, period=float(period), kind=kind, k=int(k))
+    )),
+]
+
+_graph_lock = threading.Lock()
+_graph_stats = {"computed": Counter(), "reused": Counter()}
+
+
+def resolve_transform(name: str) -> Transform:
+    if name in TRANSFORMS:
+        return TRANSFORMS[name]
+    for pattern, factory in TRANSFORM_PATTERNS:
+        match = pattern.match(name)
+        if match:
+            return factory(*match.groups())
+    raise KeyError(f"Feature inconnue: {name}")
+
+
+class FeatureGraph:
+    """Évaluation paresseuse des features d'une série: seules les colonnes demandées et leurs
+    dépendances sont calculées, chaque résultat intermédiaire une seule fois (cumuls partagés
+    par toutes les moyennes glissantes, table calendaire par tous les attributs de date).
+
+    computed / reused tracent ce qui a été calculé ou relu (cumul global: feature_graph_stats).
+    """
+
+    def __init__(self, values, dates, previous=None):
+        self._results = {
+            "values": np.asarray(values, dtype=np.float64),
+            "dates": np.asarray(dates, dtype="datetime64[ns]"),
+            "previous": previous,
+        }
+        self.computed: List[str] = []
+        self.reused: Counter = Counter()
+
+    def get(self, name: str) -> np.ndarray:
+        if name in self._results:
+            if name not in GRAPH_INPUTS:
+                self.reused[name] += 1
+                with _graph_lock:
+                    _graph_stats["reused"][name] += 1
+            return self._results[name]
+        transform = resolve_transform(name)
+        result = transform.compute(*(self.get(dep) for dep in transform.deps))
+        self._results[name] = result
+        self.computed.append(name)
+        with _graph_lock:
+            _graph_stats["computed"][name] += 1
+        return result
+
+    def matrix(self, columns: Sequence[str]) -> np.ndarray:
+        """Matrice (n, len(columns)) float32 contiguë."""
+        X = np.empty((len(self._results["values"]), len(columns)), dtype=np.float32)
+        for i, name in enumerate(columns):
+            X[:, i] = self.get(name)
+        return X
+
+    def report(self) -> Dict[str, List[str]]:
+        return {"calculées": list(self.computed), "réutilisées": sorted(self.reused)}
+
+
+def feature_graph_stats() -> pd.DataFrame:
+    """Par transformation: nombre de calculs et de réutilisations depuis le démarrage."""
+    with _graph_lock:
+        names = sorted(set(_graph_stats["computed"]) | set(_graph_stats["reused"]))
+        return pd.DataFrame({
+            "Transformation": names,
+            "Calculée": [_graph_stats["computed"][n] for n in names],
+            "Réutilisée": [_graph_stats["reused"][n] for n in names],
+        })
+
+
+def series_graph(key: Hashable, build: Callable[[], Tuple[np.ndarray, object]]) -> FeatureGraph:
+    """FeatureGraph partagé entre onglets et reruns (LRU GRAPH_CACHE_MAX_ENTRIES).
+
+    build() -> (values, dates) n'est appelé qu'en cas d'absence; key doit décrire entièrement
+    la série (empreinte du jeu, colonne, agrégation...).
+    """
+    with _graph_lock:
+        graph = _graph_cache.get(key)
+        if graph is not None:
+            _graph_cache.move_to_end(key)
+            return graph
+    graph = FeatureGraph(*build())
+    with _graph_lock:
+        _graph_cache[key] = graph
+        while len(_graph_cache) > GRAPH_CACHE_MAX_ENTRIES:
+            _graph_cache.popitem(last=False)
+    return graph
+
+
+def feature_matrix(values: np.ndarray, dates, columns: Optional[Sequence[str]] = None) -> np.ndarray:
+    """Matrice (n, len(columns)) float32 contiguë, colonnes FEATURE_COLS par défaut; seules
+    les transformations nécessaires aux colonnes demandées sont évaluées (FeatureGraph)."""
+    return FeatureGraph(values, dates).matrix(FEATURE_COLS if columns is None else columns)
+
+
+def future_feature_matrix(
+    values: np.ndarray, dates, horizon: int, freq: str = "D"
+) -> Tuple[pd.DatetimeIndex, np.ndarray]:
+    """Features des horizon périodes suivantes (MA et lag figés sur le dernier point observé)."""
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    index = future_dates(pd.Timestamp(dates[-1]), horizon, freq=freq)
+    X = np.empty((horizon, len(FEATURE_COLS)), dtype=np.float32)
+    X[:, 0] = np.arange(n, n + horizon)
+    X[:, CALENDAR_SLICE] = calendar_features(index, previous=dates[-1])
+    X[:, MA_SHORT] = values[-min(n, MA_WINDOWS[0]):].mean()
+    X[:, MA_LONG] = values[-min(n, MA_WINDOWS[1]):].mean()
+    X[:, LAG] = values[-1]
+    return index, X
+
+
+def panel_feature_matrices(panel) -> np.ndarray:
+    """Features de toutes les séries d'un SeriesPanel: tenseur (séries, périodes, 12) float32.
+
+    Le calendrier est lu une seule fois pour tout le panel; moyennes glissantes et lag
+    sont calculés sur la grille entière. Pour la série j, seules les lignes
+    panel.first[j]..panel.last[j] sont significatives (Temps = 0 à panel.first[j]).
+    """
+    values = np.asarray(panel.values, dtype=np.float64).T  # (séries, périodes), contigu par série
+    n_series, n_dates = values.shape
+    X = np.empty((n_series, n_dates, len(FEATURE_COLS)), dtype=np.float32)
+    X[:, :, 0] = np.arange(n_dates)[None, :] - panel.first[:, None]
+    X[:, :, CALENDAR_SLICE] = calendar_features(panel.dates)[None, :, :]
+    X[:, :, MA_SHORT] = _rolling_means(values, MA_WINDOWS[0], axis=1)
+    X[:, :, MA_LONG] = _rolling_means(values, MA_WINDOWS[1], axis=1)
+    X[:, 0, LAG] = values[:, 0]
+    X[:, 1:, LAG] = values[:, :-1]
+    # Début de chaque série: lag = première valeur (comme build_features)
+    rows = np.flatnonzero(panel.first < n_dates)
+    X[rows, panel.first[rows], LAG] = values[rows, panel.first[rows]]
+    return X
+
+
+def build_features(
+    df_ts: pd.DataFrame,
+    exog: Optional[np.ndarray] = None,
+    exog_names: Sequence[str] = (),
+    columns: Optional[Sequence[str]] = None,
+    graph: Optional[FeatureGraph] = None,
+):
+    """Features pour RF/XGB basées sur une vraie colonne date (index) + rolling + lag.
+
+    columns: colonnes utilisées par le modèle, parmi FEATURE_COLS et les termes de Fourier
+    (FEATURE_COLS par défaut); les autres ne sont pas calculées. graph: FeatureGraph de df_ts
+    déjà partiellement évalué (series_graph). exog (n, k), aligné sur df_ts (voir
+    ExogPanel.series), ajoute k colonnes exog_names.
+    """
+    columns = list(FEATURE_COLS if columns is None else columns)
+    unknown = [c for c in columns if c not in FEATURE_COLS and not is_date_feature(c)]
+    if unknown:
+        raise ValueError(f"Colonnes hors FEATURE_COLS / Fourier: {unknown}")
+    dates = pd.DatetimeIndex(df_ts.index)
+    values = df_ts["Valeurs"].to_numpy(dtype=np.float64)
+    X = (graph or FeatureGraph(values, dates)).matrix(columns)
+    if exog is not None and len(exog_names):
+        X = np.hstack([X, np.asarray(exog, dtype=np.float32)])
+        columns += list(exog_names)
+    X = pd.DataFrame(X, columns=columns, copy=False)
+    tmp = X.assign(Date=dates, Valeurs=values)
+    y = pd.Series(values, name="Valeurs")
+    return tmp, X, y, columns
+
+
+def extra_columns(feature_cols) -> List[str]:
+    """Colonnes ajoutées après FEATURE_COLS: termes de Fourier et exogènes, dans l'ordre."""
+    return [c for c in feature_cols if c not in FEATURE_COLS]
+
+
+def future_exog_matrix(df_feat: pd.DataFrame, feature_cols, horizon: int, future_exog=None) -> np.ndarray:
+    """Exogènes de l'horizon (horizon, k): future_exog fourni (tableau ou DataFrame aux colonnes
+    exogènes) ou, à défaut, dernière valeur observée reprise sur tout l'horizon."""
+    names = [c for c in extra_columns(feature_cols) if not is_date_feature(c)]
+    if future_exog is None:
+        last = df_feat[names].iloc[-1].to_numpy(dtype=np.float32)
+        return np.tile(last, (horizon, 1))
+    if isinstance(future_exog, pd.DataFrame):
+        future_exog = future_exog[names].to_numpy()
+    future_exog = np.asarray(future_exog, dtype=np.float32).reshape(-1, len(names))
+    if len(future_exog) != horizon:
+        raise ValueError(f"future_exog: {len(future_exog)} lignes pour un horizon de {horizon}")
+    return future_exog
+
+
+def future_extra_matrix(df_feat: pd.DataFrame, feature_cols, index, future_exog=None) -> np.ndarray:
+    """Colonnes extra_columns sur l'horizon index: termes de Fourier calculés sur les dates
+    futures, exogènes selon future_exog_matrix. (len(index), k) float32."""
+    names = extra_columns(feature_cols)
+    out = np.empty((len(index), len(names)), dtype=np.float32)
+    dated = [i for i, c in enumerate(names) if is_date_feature(c)]
+    exog = [i for i, c in enumerate(names) if not is_date_feature(c)]
+    if dated:
+        out[:, dated] = date_feature_matrix(index, [names[i] for i in dated])
+    if exog:
+        out[:, exog] = future_exog_matrix(df_feat, feature_cols, len(index), future_exog)
+    return out
+
+
+def build_future_features(df_feat: pd.DataFrame, feature_cols, horizon: int, freq: str = "D", future_exog=None):
+    """Future features cohérentes avec build_features (Fourier et exogènes: voir future_extra_matrix)."""
+    index, X = future_feature_matrix(df_feat["Valeurs"].to_numpy(), df_feat["Date"].to_numpy(), horizon, freq)
+    columns = list(FEATURE_COLS)
+    names = extra_columns(feature_cols)
+    if names:
+        X = np.hstack([X, future_extra_matrix(df_feat, feature_cols, index, future_exog)])
+        columns += names
+    future = pd.DataFrame(X, index=index, columns=columns, copy=False)
+    return index, future[feature_cols]
@@ -3,6 +3,38 @@ from typing import Optional, Tuple
 import numpy as np
 import pandas as pd
 
+from utils.dates import parse_dates
+
+# Règles pandas par fréquence (libellé = fin de période); 'ME' n'existe qu'à partir de pandas 2.2
+_MONTH_END = "ME" if tuple(int(p) for p in pd.__version__.split('.')[:2]) >= (2, 2) else "M"
+FREQUENCIES = {"D": "D", "W": "W", "M": _MONTH_END}
+FREQUENCY_LABELS = {"D": "Jour", "W": "Semaine", "M": "Mois"}
+SEASON_LENGTHS = {"D": 7, "W": 52, "M": 12}
+AGGREGATIONS = {"sum": "Somme", "mean": "Moyenne"}
+MIN_POINTS = 14
+# Au-delà, l'état SARIMAX (m=52 en hebdomadaire) rend l'ajustement ~10x plus lent que le quotidien
+MAX_SARIMA_SEASON = 12
+# Historique journalier au-delà duquel Auto remplace SARIMA par Tendance linéaire + Fourier
+LONG_DAILY_HISTORY = 730
+
+
+def freq_rule(freq: str) -> str:
+    """Code de fréquence ('D', 'W', 'M') -> règle pandas; une règle pandas est rendue telle quelle."""
+    return FREQUENCIES.get(freq, freq)
+
+
+def season_length(freq: str) -> int:
+    """Période saisonnière naturelle: semaine (D), année (W, M)."""
+    return SEASON_LENGTHS.get(freq, 7)
+
+
+def sarima_seasonal_order(n_points: int, freq: str) -> Tuple[int, int, int, int]:
+    """Ordre saisonnier SARIMA: (1, 1, 1, m) si au moins deux saisons et m raisonnable."""
+    m = season_length(freq)
+    if m > MAX_SARIMA_SEASON or n_points < 2 * m:
+        return (0, 0, 0, 0)
+    return (1, 1, 1, m)
+
 
 def prepare_series(
     df_base: pd.DataFrame,
@@ -10,9 +42,23 @@ def prepare_series(
     cat_col: str,
     date_col: Optional[str],
     produit_value: str,
+    freq: str = "D",
+    agg: str = "sum",
 ) -> Tuple[Optional[pd.DataFrame], Optional[bool], Optional[str]]:
-    """Retourne une série avec DateTimeIndex quotidien + colonne 'Valeurs' (float)."""
-    work = df_base.copy()
+    """Retourne une série régulière (DateTimeIndex à la fréquence freq) + colonne 'Valeurs' (float).
+
+    Les lignes d'une même période (plusieurs régions, plusieurs transactions par jour...)
+    sont agrégées explicitement par agg ('sum' ou 'mean'); les périodes vides reprennent
+    la dernière valeur connue.
+    """
+    if agg not in AGGREGATIONS:
+        raise ValueError(f"Agrégation inconnue: {agg} (attendu: {', '.join(AGGREGATIONS)})")
+    work = df_base
+    if date_col and date_col != "Aucune" and date_col not in work.columns and work.index.name == date_col:
+        # Jeu indexé par date (index_by_date): l'index redevient une colonne
+        work = work.reset_index()
+    else:
+        work = work.copy()
 
     if cat_col != "Aucune":
         work = work[work[cat_col] == produit_value].copy()
@@ -27,7 +73,7 @@ def prepare_series(
     used_date_col = None
     if date_col and date_col != "Aucune" and date_col in work.columns:
         used_date_col = date_col
-        work[used_date_col] = pd.to_datetime(work[used_date_col], errors="coerce")
+        work[used_date_col] = parse_dates(work[used_date_col])
         work = work.dropna(subset=[used_date_col]).sort_values(used_date_col)
         if len(work) > 0:
             work = work.set_index(used_date_col)
@@ -43,74 +89,22 @@ def prepare_series(
     df_ts = df_ts.dropna()
 
     df_ts = df_ts.sort_index()
-    df_ts = df_ts.asfreq("D")
-    df_ts["Valeurs"] = df_ts["Valeurs"].ffill()
+    resampled = df_ts["Valeurs"].resample(freq_rule(freq))
+    # min_count=1: une période sans ligne donne NaN (puis report), pas une somme nulle
+    values = resampled.sum(min_count=1) if agg == "sum" else resampled.mean()
+    df_ts = values.ffill().to_frame("Valeurs")
 
-    if len(df_ts) < 14:
-        return None, None, "Au moins 14 points de données sont requis pour les prévisions."
+    if len(df_ts) < MIN_POINTS:
+        return None, None, f"Au moins {MIN_POINTS} points de données sont requis pour les prévisions."
 
     return df_ts, has_date, None
 
 
 def future_dates(last_date, horizon: int, freq: str = "D") -> pd.DatetimeIndex:
-    return pd.date_range(start=last_date, periods=horizon + 1, freq=freq)[1:]
+    return pd.date_range(start=last_date, periods=horizon + 1, freq=freq_rule(freq))[1:]
 
 
 def basic_confidence_band(forecast_values: np.ndarray, std: float):
     lower = np.maximum(forecast_values - 1.96 * std, 0)
     upper = forecast_values + 1.96 * std
     return lower, upper
-
-
-def build_features(df_ts: pd.DataFrame):
-    """Features pour RF/XGB basées sur une vraie colonne date (index) + rolling + lag."""
-    tmp = df_ts.copy().reset_index().rename(columns={"index": "Date"})
-    tmp["Date"] = pd.to_datetime(tmp["Date"], errors="coerce")
-
-    tmp["Temps"] = np.arange(len(tmp))
-    tmp["Jour"] = tmp["Date"].dt.day
-    tmp["Mois"] = tmp["Date"].dt.month
-    tmp["JourSemaine"] = tmp["Date"].dt.dayofweek
-    tmp["JourAnnee"] = tmp["Date"].dt.dayofyear
-    tmp["Trimestre"] = tmp["Date"].dt.quarter
-
-    tmp["MA_7"] = tmp["Valeurs"].rolling(7, min_periods=1).mean()
-    tmp["MA_30"] = tmp["Valeurs"].rolling(30, min_periods=1).mean()
-    tmp["Lag_1"] = tmp["Valeurs"].shift(1)
-    tmp["Lag_1"] = tmp["Lag_1"].fillna(tmp["Valeurs"].iloc[0])
-
-    feature_cols = [
-        "Temps",
-        "Jour",
-        "Mois",
-        "JourSemaine",
-        "JourAnnee",
-        "Trimestre",
-        "MA_7",
-        "MA_30",
-        "Lag_1",
-    ]
-    X = tmp[feature_cols]
-    y = tmp["Valeurs"].astype(float)
-    return tmp, X, y, feature_cols
-
-
-def build_future_features(df_feat: pd.DataFrame, feature_cols, horizon: int):
-    """Future features cohérentes avec build_features."""
-    last_date = pd.to_datetime(df_feat["Date"].iloc[-1])
-    future_dates_index = future_dates(last_date, horizon, freq="D")
-
-    future = pd.DataFrame(index=future_dates_index)
-    future["Temps"] = np.arange(df_feat["Temps"].iloc[-1] + 1, df_feat["Temps"].iloc[-1] + 1 + horizon)
-
-    future["Jour"] = future.index.day
-    future["Mois"] = future.index.month
-    future["JourSemaine"] = future.index.dayofweek
-    future["JourAnnee"] = future.index.dayofyear
-    future["Trimestre"] = future.index.quarter
-
-    future["MA_7"] = df_feat["MA_7"].iloc[-1]
-    future["MA_30"] = df_feat["MA_30"].iloc[-1]
-    future["Lag_1"] = df_feat["Valeurs"].iloc[-1]
-
-    return future_dates_index, future[feature_cols]
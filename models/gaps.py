@@ -0,0 +1,171 @@
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Hashable, Sequence
+
+import numpy as np
+import pandas as pd
+
+from models.forecasting import season_length
+from models.panel import SeriesPanel
+
+GAP_STRATEGIES = {
+    "ffill": "Dernière valeur connue",
+    "seasonal": "Saisonnière (même période, saison précédente)",
+    "interpolate": "Interpolation linéaire",
+    "zero": "Zéro",
+}
+# Cellules à imputer en plus des périodes manquantes
+GAP_KINDS = {"censored": "Ruptures de stock", "zero_runs": "Longues séquences de zéros"}
+# Longueur minimale d'une séquence de zéros suspecte, par fréquence
+ZERO_RUN_MIN = {"D": 7, "W": 3, "M": 2}
+IMPUTED_CACHE_MAX_ENTRIES = 8
+
+_imputed_cache: "OrderedDict[Hashable, SeriesPanel]" = OrderedDict()
+
+
+@dataclass
+class GapMasks:
+    """Masques (séries × périodes) d'un panel; tout est False hors [first, last] de chaque série."""
+    inside: np.ndarray
+    missing: np.ndarray  # période sans aucune ligne
+    zeros: np.ndarray  # période observée à 0
+    zero_runs: np.ndarray  # zéros dans une séquence d'au moins ZERO_RUN_MIN périodes
+    censored: np.ndarray  # rupture de stock (stock <= 0)
+
+
+def _run_lengths(mask: np.ndarray) -> np.ndarray:
+    """Longueur de la séquence de True contenant chaque cellule (0 ailleurs), ligne par ligne."""
+    starts = mask.copy()
+    starts[:, 1:] &= ~mask[:, :-1]
+    run_id = np.cumsum(starts.ravel())
+    lengths = np.bincount(run_id, weights=mask.ravel()).astype(np.int64)
+    return np.where(mask, lengths[run_id].reshape(mask.shape), 0)
+
+
+def _inside(panel: SeriesPanel) -> np.ndarray:
+    periods = np.arange(len(panel.dates))
+    return (periods >= panel.first[:, None]) & (periods <= panel.last[:, None])
+
+
+def detect_gaps(panel: SeriesPanel) -> GapMasks:
+    """Périodes manquantes, zéros, longues séquences de zéros et ruptures, pour tout le panel."""
+    inside = _inside(panel)
+    observed = panel.observed.T if panel.observed is not None else ~np.isnan(panel.values.T)
+    zeros = inside & observed & (panel.values.T == 0)
+    censored = inside & (panel.censored.T if panel.censored is not None else False)
+    return GapMasks(
+        inside=inside,
+        missing=inside & ~observed,
+        zeros=zeros,
+        zero_runs=_run_lengths(zeros) >= ZERO_RUN_MIN.get(panel.freq, ZERO_RUN_MIN["D"]),
+        censored=censored,
+    )
+
+
+def gap_report(panel: SeriesPanel, masks: GapMasks = None) -> pd.DataFrame:
+    """Une ligne par série: périodes, manquantes, plus longue lacune, zéros, ruptures."""
+    masks = masks or detect_gaps(panel)
+    periods = masks.inside.sum(axis=1)
+    missing = masks.missing.sum(axis=1)
+    keys = panel.keys
+    if len(panel.key_names) > 1:
+        index = pd.MultiIndex.from_tuples(keys, names=list(panel.key_names))
+    else:
+        index = pd.Index(keys, name=panel.key_names[0] if panel.key_names else None)
+    report = pd.DataFrame({
+        "Périodes": periods,
+        "Manquantes": missing,
+        "Plus longue lacune": _run_lengths(masks.missing).max(axis=1, initial=0),
+        "Zéros": masks.zeros.sum(axis=1),
+        "Zéros prolongés": masks.zero_runs.sum(axis=1),
+        "Ruptures": masks.censored.sum(axis=1),
+        "% manquant": np.round(100 * missing / np.maximum(periods, 1), 1),
+    }, index=index)
+    return report.sort_values("% manquant", ascending=False)
+
+
+def _previous_valid(valid: np.ndarray) -> np.ndarray:
+    """Indice de la dernière cellule valide <= t (-1 si aucune), ligne par ligne."""
+    return np.maximum.accumulate(np.where(valid, np.arange(valid.shape[1]), -1), axis=1)
+
+
+def _next_valid(valid: np.ndarray) -> np.ndarray:
+    """Indice de la première cellule valide >= t (n si aucune), ligne par ligne."""
+    n = valid.shape[1]
+    return np.minimum.accumulate(np.where(valid, np.arange(n), n)[:, ::-1], axis=1)[:, ::-1]
+
+
+def _take(values: np.ndarray, index: np.ndarray) -> np.ndarray:
+    return np.take_along_axis(values, np.clip(index, 0, values.shape[1] - 1), axis=1)
+
+
+def _fill(values: np.ndarray, valid: np.ndarray, strategy: str, season: int) -> np.ndarray:
+    """Valeurs de remplacement de chaque cellule (utilisées seulement là où valid est False)."""
+    n = values.shape[1]
+    previous, following = _previous_valid(valid), _next_valid(valid)
+    # Repli commun: dernière valeur connue, sinon première valeur suivante
+    fallback = np.where(previous >= 0, _take(values, previous), _take(values, following))
+    if strategy == "zero":
+        return np.zeros_like(values)
+    if strategy == "interpolate":
+        both = (previous >= 0) & (following < n)
+        span = np.maximum(following - previous, 1)
+        weight = (np.arange(n) - previous) / span
+        line = _take(values, previous) + weight * (_take(values, following) - _take(values, previous))
+        return np.where(both, line, fallback)
+    if strategy == "seasonal":
+        # Dernière valeur valide de même phase (t - season, t - 2·season...): report par phase
+        padded = -(-n // season) * season
+        index = np.full((values.shape[0], padded), -1)
+        index[:, :n] = np.where(valid, np.arange(n), -1)
+        index = np.maximum.accumulate(index.reshape(values.shape[0], -1, season), axis=1)
+        same_phase = index.reshape(values.shape[0], padded)[:, :n]
+        return np.where(same_phase >= 0, _take(values, same_phase), fallback)
+    if strategy == "ffill":
+        return fallback
+    raise ValueError(f"Stratégie inconnue: {strategy} (attendu: {', '.join(GAP_STRATEGIES)})")
+
+
+def impute_panel(
+    panel: SeriesPanel,
+    strategy: str = "ffill",
+    kinds: Sequence[str] = (),
+    masks: GapMasks = None,
+) -> SeriesPanel:
+    """Panel dont les périodes manquantes (et, selon kinds, les ruptures / longues séquences de
+    zéros) sont remplacées selon strategy, pour toutes les séries à la fois (coût linéaire
+    en séries × périodes). Les cellules hors [first, last] restent NaN.
+    """
+    masks = masks or detect_gaps(panel)
+    targets = masks.missing.copy()
+    for kind in kinds:
+        if kind not in GAP_KINDS:
+            raise ValueError(f"Type de lacune inconnu: {kind} (attendu: {', '.join(GAP_KINDS)})")
+        targets |= getattr(masks, kind)
+    raw = np.asarray(panel.values, dtype=np.float64).T  # (séries, périodes)
+    valid = masks.inside & ~targets & ~np.isnan(raw)
+    filled = _fill(np.where(valid, raw, 0.0), valid, strategy, season_length(panel.freq))
+    result = np.where(masks.inside, np.where(valid, raw, filled), np.nan)
+    values = np.asfortranarray(result.T)
+    values.flags.writeable = False
+    return replace(panel, values=values)
+
+
+def impute_panel_cached(
+    panel: SeriesPanel,
+    panel_key: Hashable,
+    strategy: str = "ffill",
+    kinds: Sequence[str] = (),
+) -> SeriesPanel:
+    """impute_panel mémorisé (LRU); panel_key identifie le panel (clé de build_panel_cached)."""
+    if strategy == "ffill" and not kinds:
+        return panel  # comportement par défaut de build_panel
+    key = (panel_key, strategy, tuple(sorted(kinds)))
+    if key in _imputed_cache:
+        _imputed_cache.move_to_end(key)
+        return _imputed_cache[key]
+    imputed = impute_panel(panel, strategy, kinds)
+    _imputed_cache[key] = imputed
+    while len(_imputed_cache) > IMPUTED_CACHE_MAX_ENTRIES:
+        _imputed_cache.popitem(last=False)
+    return imputed
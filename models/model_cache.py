@@ -0,0 +1,303 @@
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from models.registry import (
+    CV_FOLDS, MAX_HORIZON, ForecastModel, ForecastSeries, ModelResult, ensure_available, get_model,
+)
+from utils.cache import cache_get_blob, cache_put_blob, derive_key
+
+MODEL_CACHE_MAX_BYTES = int(os.getenv("VENTESPRO_MODEL_CACHE_MB", "512")) * 1024 * 1024
+MODEL_CACHE_SPILL = os.getenv("VENTESPRO_MODEL_CACHE_SPILL", "1") != "0"
+# À incrémenter si le contenu des entrées change (entrées disque illisibles sinon)
+MODEL_CACHE_VERSION = "2"
+# Paramètres sans effet sur le modèle ajusté (threads): hors de la clé
+_RUNTIME_PARAMS = ("n_jobs",)
+
+_lock = threading.Lock()
+_store: "OrderedDict[str, FittedEntry]" = OrderedDict()
+_sizes: Dict[str, int] = {}
+_total_bytes = 0  # somme de _sizes
+_stats = {"hits": 0, "disk_hits": 0, "misses": 0, "predictions": 0, "spilled": 0}
+
+
+@dataclass
+class _Forecast:
+    """Prévision d'un modèle ajusté (+ bande) sur l'horizon le plus long demandé jusqu'ici.
+
+    future_exog: exogènes futurs sur toute la longueur prévue, None si le modèle ne les lit pas.
+    """
+    recursive: bool
+    future_exog: Optional[np.ndarray]
+    forecasts: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+
+    def covers(self, recursive: bool, future_exog: Optional[np.ndarray], horizon: int) -> bool:
+        """Mêmes conditions de prévision sur les horizon premières périodes."""
+        if self.recursive != recursive or len(self.forecasts) < horizon:
+            return False
+        if self.future_exog is None or future_exog is None:
+            return self.future_exog is None and future_exog is None
+        return np.array_equal(self.future_exog[:horizon], future_exog[:horizon])
+
+    @property
+    def nbytes(self) -> int:
+        arrays = (self.forecasts, self.lower, self.upper, self.future_exog)
+        return sum(a.nbytes for a in arrays if a is not None)
+
+
+@dataclass
+class FittedEntry:
+    """Modèle ajusté sur tout l'historique, ses scores (par nombre de plis de validation et
+    mode récursif) et ses prévisions déjà calculées."""
+    model: ForecastModel
+    scores: Dict[Tuple[int, bool], Optional[Tuple[float, float]]] = field(default_factory=dict)
+    forecasts: List[_Forecast] = field(default_factory=list)
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def __getstate__(self):
+        return {k: v for k, v in self.__dict__.items() if k != "lock"}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state, lock=threading.Lock())
+
+    def forecast_bytes(self) -> int:
+        return sum(f.nbytes for f in self.forecasts)
+
+    def forecast(self, series: ForecastSeries, horizon: int) -> Tuple[_Forecast, bool]:
+        """(_Forecast couvrant horizon, True si elle vient d'être calculée)."""
+        # Exogènes futurs comparés seulement pour les modèles qui les lisent
+        future_exog = series.future_exog if self.model.uses_future_exog else None
+        for known in self.forecasts:
+            if known.covers(series.recursive, future_exog, horizon):
+                return known, False
+        # Modèles peu coûteux à prolonger: MAX_HORIZON d'emblée, les horizons suivants sont des tranches
+        steps = max(horizon, MAX_HORIZON) if self.model.full_horizon else horizon
+        forecasts = self.model.predict(series, steps)
+        lower, upper = self.model.band(series, forecasts)
+        known = _Forecast(
+            series.recursive, None if future_exog is None else future_exog[:len(forecasts)], forecasts, lower, upper
+        )
+        # Remplace les prévisions plus courtes de même configuration
+        self.forecasts = [
+            f for f in self.forecasts if not known.covers(f.recursive, f.future_exog, len(f.forecasts))
+        ] + [known]
+        return known, True
+
+    def result(
+        self, series: ForecastSeries, horizon: int, confidence: bool, backtest: bool, folds: int = CV_FOLDS
+    ) -> Tuple[ModelResult, bool]:
+        """ModelResult sur horizon (tranche des prévisions en cache), True si l'entrée a changé."""
+        # Le mode récursif change les prévisions des plis (modèles à arbres): dans la clé
+        score_key = (max(1, folds), series.recursive)
+        changed = False
+        with self.lock:  # predict / band ne sont pas réentrants (Prophet mémorise sa dernière prévision)
+            if backtest and score_key not in self.scores:
+                self.scores[score_key], changed = self.model.evaluate(series, score_key[0]), True
+            known, computed = self.forecast(series, horizon)
+        scores = self.scores.get(score_key) if backtest else None
+        mae, rmse = scores if scores is not None else (None, None)
+        result = ModelResult(
+            self.model.name,
+            series.future_dates(horizon),
+            known.forecasts[:horizon].copy(),
+            known.lower[:horizon].copy() if confidence else None,
+            known.upper[:horizon].copy() if confidence else None,
+            mae,
+            rmse,
+        )
+        return result, changed or computed
+
+
+def series_digest(series: ForecastSeries) -> str:
+    """Empreinte BLAKE2b du contenu de la série: valeurs, dates, fréquence, Fourier, exogènes
+    historiques. Les exogènes futurs et le mode récursif ne servent qu'à la prévision."""
+    h = hashlib.blake2b(digest_size=20)
+    h.update(repr((series.freq, tuple(series.fourier_columns), tuple(series.exog_names))).encode("utf-8"))
+    h.update(np.ascontiguousarray(series.y).tobytes())
+    h.update(series.df_ts.index.asi8.tobytes())
+    if series.exog is not None:
+        h.update(np.ascontiguousarray(series.exog, dtype=np.float64).tobytes())
+    return h.hexdigest()
+
+
+def model_key(label: str, series: ForecastSeries, params: dict) -> str:
+    """Clé = (contenu de la série, modèle, hyperparamètres effectifs)."""
+    model = get_model(label, **params)
+    fitted_params = sorted((k, repr(v)) for k, v in model.params.items() if k not in _RUNTIME_PARAMS)
+    return derive_key(series_digest(series), "modele", type(model).__name__, fitted_params, MODEL_CACHE_VERSION)
+
+
+def _lookup(key: str, spill: bool) -> Tuple[Optional[FittedEntry], bool, Optional[int]]:
+    """(entrée ou None, True si relue sur disque, taille comptée pour l'entrée)."""
+    with _lock:
+        entry = _store.get(key)
+        if entry is not None:
+            _store.move_to_end(key)
+            _stats["hits"] += 1
+            return entry, False, _sizes.get(key)
+    data = cache_get_blob(key) if spill else None
+    if data is None:
+        return None, False, None
+    try:
+        entry = pickle.loads(data)  # écrit par ce cache (répertoire local de l'application)
+    except Exception:
+        return None, False, None
+    _stats["disk_hits"] += 1
+    return entry, True, len(data)
+
+
+def _dumps(entry: FittedEntry) -> Optional[bytes]:
+    """Pickle de l'entrée, None si le modèle n'est pas sérialisable."""
+    try:
+        return pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return None
+
+
+def remember(
+    key: str,
+    entry: FittedEntry,
+    max_bytes: Optional[int] = None,
+    spill: Optional[bool] = None,
+    data: Optional[bytes] = None,
+    size: Optional[int] = None,
+) -> None:
+    """Range (ou remet à jour) entry; évince les moins récemment utilisées au-delà de max_bytes.
+
+    La taille d'une entrée est celle de son pickle (data, si déjà calculé), ou size quand
+    l'appelant la connaît déjà (prévision ajoutée à une entrée comptée). Un modèle non
+    sérialisable n'est pas gardé.
+    """
+    global _total_bytes
+    max_bytes = MODEL_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    spill = MODEL_CACHE_SPILL if spill is None else spill
+    if size is None:
+        data = _dumps(entry) if data is None else data
+        if data is None:
+            return
+        size = len(data)
+    with _lock:
+        _store[key] = entry
+        _store.move_to_end(key)
+        _total_bytes += size - _sizes.get(key, 0)
+        _sizes[key] = size
+        evicted = []
+        while len(_store) > 1 and _total_bytes > max_bytes:
+            old_key, old_entry = _store.popitem(last=False)
+            _total_bytes -= _sizes.pop(old_key, 0)
+            evicted.append((old_key, old_entry))
+    # Écriture disque hors verrou: les entrées évincées restent relisables (cache_get_blob)
+    for old_key, old_entry in evicted if spill else ():
+        data = _dumps(old_entry)
+        if data is not None and cache_put_blob(old_key, data):
+            _stats["spilled"] += 1
+
+
+def cached_result(
+    label: str,
+    series: ForecastSeries,
+    horizon: int,
+    confidence: bool = True,
+    backtest: bool = True,
+    folds: int = CV_FOLDS,
+    spill: Optional[bool] = None,
+    **params,
+) -> Optional[ModelResult]:
+    """ModelResult tiré d'un modèle déjà ajusté (mémoire ou disque), None s'il faut l'ajuster."""
+    spill = MODEL_CACHE_SPILL if spill is None else spill
+    key = model_key(label, series, params)
+    entry, from_disk, size = _lookup(key, spill)
+    if entry is None:
+        _stats["misses"] += 1
+        return None
+    before = entry.forecast_bytes()
+    result, changed = entry.result(series, horizon, confidence, backtest, folds)
+    if changed:
+        _stats["predictions"] += 1
+    if changed or from_disk:
+        # Le modèle ajusté n'a pas changé: taille comptée + prévisions ajoutées, sans re-pickle
+        remember(key, entry, spill=spill, size=None if size is None else size + entry.forecast_bytes() - before)
+    return result
+
+
+def fit_entry(
+    label: str,
+    series: ForecastSeries,
+    horizon: int,
+    confidence: bool = True,
+    backtest: bool = True,
+    folds: int = CV_FOLDS,
+    **params,
+) -> Tuple[ModelResult, str, FittedEntry]:
+    """Ajuste le modèle et rend (ModelResult, clé, entrée à ranger avec remember())."""
+    model = get_model(label, **params)
+    ensure_available(model)
+    entry = FittedEntry(model.fit(series))
+    result, _ = entry.result(series, horizon, confidence, backtest, folds)
+    return result, model_key(label, series, params), entry
+
+
+def fit_portable(
+    label: str,
+    series: ForecastSeries,
+    horizon: int,
+    confidence: bool = True,
+    backtest: bool = True,
+    folds: int = CV_FOLDS,
+    **params,
+) -> Tuple[ModelResult, str, Optional[bytes]]:
+    """fit_entry pour le pool de processus: l'entrée voyage en pickle (None si non
+    sérialisable), à ranger dans le cache du processus principal avec remember_portable()."""
+    result, key, entry = fit_entry(label, series, horizon, confidence, backtest, folds, **params)
+    return result, key, _dumps(entry)
+
+
+def remember_portable(key: str, data: Optional[bytes]) -> None:
+    if data is not None:
+        remember(key, pickle.loads(data), data=data)
+
+
+def cached_run_model(
+    label: str,
+    series: ForecastSeries,
+    horizon: int,
+    confidence: bool = True,
+    backtest: bool = True,
+    folds: int = CV_FOLDS,
+    **params,
+) -> ModelResult:
+    """run_model mémorisé: le modèle ajusté est gardé (LRU borné par VENTESPRO_MODEL_CACHE_MB,
+    entrées évincées écrites sur disque sauf VENTESPRO_MODEL_CACHE_SPILL=0).
+
+    Changer l'horizon, la bande de confiance ou les exogènes futurs ne réajuste pas: les
+    prévisions sont prolongées depuis le modèle en cache, ou simplement tranchées.
+    """
+    result = cached_result(label, series, horizon, confidence, backtest, folds, **params)
+    if result is not None:
+        return result
+    result, key, entry = fit_entry(label, series, horizon, confidence, backtest, folds, **params)
+    remember(key, entry)
+    return result
+
+
+def model_cache_stats() -> Dict[str, int]:
+    """Compteurs (succès mémoire / disque, ajustements, prévisions prolongées, évictions
+    écrites) et taille en mémoire."""
+    with _lock:
+        return {**_stats, "entries": len(_store), "bytes": _total_bytes}
+
+
+def clear_model_cache() -> None:
+    global _total_bytes
+    with _lock:
+        _store.clear()
+        _sizes.clear()
+        _total_bytes = 0
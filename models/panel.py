@@ -0,0 +1,310 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from models.forecasting import AGGREGATIONS, MIN_POINTS, freq_rule
+from utils.dates import parse_dates
+from utils.feature_engineering import ExogSpec, encode_exog
+from utils.holidays import HOLIDAY_COLS, holiday_features
+
+PANEL_CACHE_MAX_ENTRIES = 8
+ALL_SERIES = "Globale"
+
+_panel_cache: "OrderedDict[Hashable, object]" = OrderedDict()
+
+
+@dataclass
+class SeriesPanel:
+    """Toutes les séries d'un jeu, alignées sur un calendrier commun (jour, semaine ou mois).
+
+    values[:, j] est la série keys[j] (agrégat par période, trous comblés par la dernière valeur
+    connue, voir models.gaps pour les autres stratégies); avant sa première et après sa
+    dernière observation, elle vaut NaN. observed (périodes × séries) marque les périodes
+    ayant au moins une ligne, censored celles en rupture de stock (stock <= 0).
+    Stockage en ordre Fortran: chaque série est un bloc contigu, extrait sans copie.
+    """
+    dates: pd.DatetimeIndex
+    values: np.ndarray  # (n_dates, n_series), float64
+    keys: List[Hashable]
+    key_names: Tuple[str, ...]
+    first: np.ndarray  # première ligne observée, par série
+    last: np.ndarray  # dernière ligne observée, par série
+    freq: str = "D"
+    observed: Optional[np.ndarray] = None  # (n_dates, n_series), bool
+    censored: Optional[np.ndarray] = None  # (n_dates, n_series), bool
+    position: Dict[Hashable, int] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self):
+        self.position = {k: j for j, k in enumerate(self.keys)}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key) -> bool:
+        return key in self.position
+
+    def column(self, key) -> np.ndarray:
+        """Vue (sans copie) sur la série key, de sa première à sa dernière observation."""
+        j = self.position[key]
+        return self.values[self.first[j]:self.last[j] + 1, j]
+
+    def series(self, key) -> Tuple[Optional[pd.DataFrame], Optional[bool], Optional[str]]:
+        """Même contrat que prepare_series: (df_ts avec 'Valeurs', has_date, erreur)."""
+        if key not in self.position:
+            return None, None, "Aucune donnée après nettoyage."
+        j = self.position[key]
+        if self.last[j] < self.first[j]:
+            return None, None, "Aucune donnée après nettoyage."
+        values = self.column(key)
+        if len(values) < MIN_POINTS:
+            return None, None, f"Au moins {MIN_POINTS} points de données sont requis pour les prévisions."
+        index = self.dates[self.first[j]:self.last[j] + 1]
+        return pd.DataFrame({"Valeurs": values}, index=index, copy=False), True, None
+
+
+def _date_values(df: pd.DataFrame, date_col: Optional[str]) -> pd.Series:
+    if date_col and date_col in df.columns:
+        return parse_dates(df[date_col])
+    if isinstance(df.index, pd.DatetimeIndex):
+        return pd.Series(df.index, index=df.index)
+    raise ValueError("Le panel nécessite une colonne date (ou un index de dates).")
+
+
+def _period_ids(dates: np.ndarray, freq: str) -> np.ndarray:
+    """Numéro de période (jour, semaine lundi-dimanche ou mois) depuis 1970."""
+    if freq == "M":
+        return dates.astype("datetime64[M]").astype(np.int64)
+    days = dates.astype("datetime64[D]").astype(np.int64)
+    if freq == "W":
+        return (days + 3) // 7  # le 01/01/1970 est un jeudi
+    return days
+
+
+def _period_labels(origin: int, n_periods: int, freq: str) -> pd.DatetimeIndex:
+    """Libellés des périodes (fin de période, comme resample/future_dates)."""
+    if freq == "M":
+        start = np.datetime64(origin + 1, "M").astype("datetime64[D]") - 1
+    elif freq == "W":
+        start = np.datetime64(7 * origin + 3, "D")
+    else:
+        start = np.datetime64(origin, "D")
+    return pd.date_range(start, periods=n_periods, freq=freq_rule(freq))
+
+
+def _series_codes(df: pd.DataFrame, group_cols: List[str]) -> Tuple[np.ndarray, List[Hashable]]:
+    """Code de série par ligne (-1 = clé manquante) et clés, dans l'ordre d'apparition."""
+    if len(group_cols) == 1:
+        codes, uniques = pd.factorize(df[group_cols[0]], sort=False)
+        return codes, list(uniques)
+    if group_cols:
+        codes, uniques = pd.MultiIndex.from_arrays([df[c] for c in group_cols]).factorize()
+        return codes, list(uniques)
+    return np.zeros(len(df), dtype=np.intp), [ALL_SERIES]
+
+
+def build_panel(
+    df: pd.DataFrame,
+    target_col: str,
+    group_cols: Sequence[str] = (),
+    date_col: Optional[str] = None,
+    freq: str = "D",
+    agg: str = "sum",
+    stock_col: Optional[str] = None,
+) -> SeriesPanel:
+    """Un seul passage (période × groupes) vers une grille dense: une colonne par série.
+
+    Sans group_cols, une seule série ALL_SERIES (total par période). date_col peut être une
+    colonne ou l'index (DataFrame indexé par date). freq ('D', 'W', 'M') et agg ('sum',
+    'mean') suivent la même convention que prepare_series. stock_col: une ligne à stock <= 0
+    marque sa période comme censurée (ventes limitées par la rupture).
+    """
+    if agg not in AGGREGATIONS:
+        raise ValueError(f"Agrégation inconnue: {agg} (attendu: {', '.join(AGGREGATIONS)})")
+    group_cols = [c for c in group_cols if c and c != "Aucune"]
+    dates = _date_values(df, date_col).to_numpy(dtype="datetime64[ns]")
+    target = pd.to_numeric(df[target_col], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    codes, keys = _series_codes(df, group_cols)
+    valid = ~(np.isnat(dates) | np.isnan(target)) & (codes >= 0)
+
+    # Grille (séries × périodes) remplie par bincount: un seul passage sur les lignes
+    period = _period_ids(dates[valid], freq)
+    origin = int(period.min()) if len(period) else 0
+    n_dates = int(period.max()) - origin + 1 if len(period) else 0
+    n_series = len(keys)
+    flat = codes[valid].astype(np.int64) * n_dates + (period - origin)
+    sums = np.bincount(flat, weights=target[valid], minlength=n_series * n_dates).reshape(n_series, n_dates)
+    counts = np.bincount(flat, minlength=n_series * n_dates).reshape(n_series, n_dates)
+    observed = counts > 0
+    censored = None
+    if stock_col and stock_col in df.columns:
+        stock = pd.to_numeric(df[stock_col], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)[valid]
+        censored = np.bincount(flat, weights=stock <= 0, minlength=n_series * n_dates).reshape(n_series, n_dates) > 0
+    if agg == "mean":
+        sums = sums / np.maximum(counts, 1)
+
+    has_any = observed.any(axis=1)
+    first = np.where(has_any, observed.argmax(axis=1), n_dates)
+    last = np.where(has_any, n_dates - 1 - observed[:, ::-1].argmax(axis=1), -1)
+
+    # Report de la dernière valeur observée (ffill vectorisé), NaN hors [first, last]
+    grid = np.where(observed, sums, np.nan)
+    source = np.maximum.accumulate(np.where(observed, np.arange(n_dates), 0), axis=1)
+    grid = np.take_along_axis(grid, source, axis=1)
+    grid[np.arange(n_dates) > last[:, None]] = np.nan
+    values = grid.T  # (périodes × séries), ordre Fortran: chaque série est contiguë
+    calendar = _period_labels(origin, n_dates, freq)
+    panel = SeriesPanel(
+        dates=calendar,
+        values=values,
+        keys=keys,
+        key_names=tuple(group_cols),
+        first=first,
+        last=last,
+        freq=freq,
+        observed=observed.T,
+        censored=None if censored is None else censored.T,
+    )
+    for array in (panel.values, panel.observed, panel.censored):
+        if array is not None:
+            array.flags.writeable = False  # partagé entre sessions
+    return panel
+
+
+def _cached(key: Hashable, build):
+    if key in _panel_cache:
+        _panel_cache.move_to_end(key)
+        return _panel_cache[key]
+    value = build()
+    _panel_cache[key] = value
+    while len(_panel_cache) > PANEL_CACHE_MAX_ENTRIES:
+        _panel_cache.popitem(last=False)
+    return value
+
+
+def build_panel_cached(
+    df: pd.DataFrame,
+    target_col: str,
+    group_cols: Sequence[str],
+    date_col: Optional[str],
+    dataset_key: Hashable,
+    freq: str = "D",
+    agg: str = "sum",
+    stock_col: Optional[str] = None,
+) -> SeriesPanel:
+    """build_panel mémorisé par clé de jeu de données (LRU, partagé entre sessions)."""
+    key = (dataset_key, target_col, tuple(group_cols), date_col, freq, agg, stock_col)
+    return _cached(key, lambda: build_panel(df, target_col, group_cols, date_col, freq, agg, stock_col))
+
+
+@dataclass
+class ExogPanel:
+    """Variables exogènes encodées (utils.feature_engineering) par série et par période.
+
+    values[j] est la matrice (périodes, k) de la série keys[j]: moyenne par période pour
+    les numériques et booléens (part de lignes en promo...), dernier code observé pour les
+    catégories; les périodes sans ligne reprennent la dernière valeur connue.
+    """
+    specs: List[ExogSpec]
+    dates: pd.DatetimeIndex
+    values: np.ndarray  # (séries, périodes, k), float32
+    keys: List[Hashable]
+    origin: int
+    freq: str
+    position: Dict[Hashable, int] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self):
+        self.position = {k: j for j, k in enumerate(self.keys)}
+
+    @property
+    def names(self) -> List[str]:
+        return [spec.feature for spec in self.specs]
+
+    def series(self, key, index) -> np.ndarray:
+        """Exogènes (len(index), k) alignées sur index; au-delà de l'historique (horizon),
+        la dernière valeur connue est reprise (scénario par défaut), sauf pour Férié, lu
+        dans le calendrier des jours fériés (utils.holidays)."""
+        j = self.position[key]
+        index = np.asarray(index, dtype="datetime64[ns]")
+        pos = _period_ids(index, self.freq) - self.origin
+        out = self.values[j, np.clip(pos, 0, len(self.dates) - 1)]
+        future = pos >= len(self.dates)
+        ferie = [i for i, spec in enumerate(self.specs) if spec.name == "Ferie"]
+        if ferie and future.any():
+            previous = self.dates[-1] if len(self.dates) else None
+            shares = holiday_features(index[future], previous=previous)[:, HOLIDAY_COLS.index("Ferie")]
+            for i in ferie:
+                out[future, i] = shares
+        return out
+
+
+def build_exog_panel(
+    df: pd.DataFrame,
+    specs: Sequence[ExogSpec],
+    group_cols: Sequence[str] = (),
+    date_col: Optional[str] = None,
+    freq: str = "D",
+) -> ExogPanel:
+    """Grille des exogènes en un passage (même découpage série × période que build_panel)."""
+    group_cols = [c for c in group_cols if c and c != "Aucune"]
+    specs = list(specs)
+    dates = _date_values(df, date_col).to_numpy(dtype="datetime64[ns]")
+    codes, keys = _series_codes(df, group_cols)
+    valid = ~np.isnat(dates) & (codes >= 0)
+    encoded = encode_exog(df, specs)[valid]
+
+    period = _period_ids(dates[valid], freq)
+    origin = int(period.min()) if len(period) else 0
+    n_dates = int(period.max()) - origin + 1 if len(period) else 0
+    n_series, cells = len(keys), len(keys) * n_dates
+    flat = codes[valid].astype(np.int64) * n_dates + (period - origin)
+
+    grid = np.full((cells, len(specs)), np.nan, dtype=np.float32)
+    for i, spec in enumerate(specs):
+        col = encoded[:, i]
+        present = ~np.isnan(col)
+        if spec.kind == "categorical":
+            # Dernière ligne observée de chaque cellule (lignes triées par date)
+            last_row = np.full(cells, -1, dtype=np.int64)
+            np.maximum.at(last_row, flat[present], np.flatnonzero(present))
+            hit = last_row >= 0
+            grid[hit, i] = col[last_row[hit]]
+        else:
+            sums = np.bincount(flat[present], weights=col[present], minlength=cells)
+            counts = np.bincount(flat[present], minlength=cells)
+            hit = counts > 0
+            grid[hit, i] = sums[hit] / counts[hit]
+
+    # Report de la dernière valeur connue le long des périodes, puis de la première vers l'arrière
+    grid = grid.reshape(n_series, n_dates, len(specs))
+    observed = ~np.isnan(grid)
+    steps = np.arange(n_dates)[None, :, None]
+    source = np.maximum.accumulate(np.where(observed, steps, 0), axis=1)
+    grid = np.take_along_axis(grid, source, axis=1)
+    backward = np.minimum.accumulate(np.where(observed, steps, n_dates - 1)[:, ::-1], axis=1)[:, ::-1]
+    grid = np.where(np.isnan(grid), np.take_along_axis(grid, backward, axis=1), grid)
+    grid = np.nan_to_num(grid, nan=0.0)
+    grid.flags.writeable = False  # partagé entre sessions
+    return ExogPanel(
+        specs=specs,
+        dates=_period_labels(origin, n_dates, freq),
+        values=grid,
+        keys=keys,
+        origin=origin,
+        freq=freq,
+    )
+
+
+def build_exog_panel_cached(
+    df: pd.DataFrame,
+    specs: Sequence[ExogSpec],
+    group_cols: Sequence[str],
+    date_col: Optional[str],
+    dataset_key: Hashable,
+    freq: str = "D",
+) -> ExogPanel:
+    """build_exog_panel mémorisé par clé de jeu de données (même LRU que les panels)."""
+    key = ("exogenes", dataset_key, tuple(specs), tuple(group_cols), date_col, freq)
+    return _cached(key, lambda: build_exog_panel(df, specs, group_cols, date_col, freq))
@@ -0,0 +1,144 @@
+from typing import Callable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from models.features import (
+    CALENDAR_SLICE,
+    FEATURE_COLS,
+    LAG,
+    MA_LONG,
+    MA_SHORT,
+    MA_WINDOWS,
+    build_future_features,
+    calendar_features,
+    extra_columns,
+    future_extra_matrix,
+)
+from models.forecasting import future_dates
+
+RING_SIZE = max(MA_WINDOWS)
+
+
+class LagState:
+    """État lag/moyennes glissantes de plusieurs séries, mis à jour en O(1) par pas.
+
+    Un tampon circulaire (séries × RING_SIZE) garde les dernières valeurs; les sommes
+    courantes des fenêtres MA_7/MA_30 sont ajustées à chaque valeur ajoutée (entrée -
+    sortie) au lieu d'être recalculées.
+    """
+
+    def __init__(self, histories: Sequence[np.ndarray]):
+        n_series = len(histories)
+        self.ring = np.zeros((n_series, RING_SIZE), dtype=np.float64)
+        self.seen = np.zeros(n_series, dtype=np.int64)  # nombre total de valeurs vues
+        self.sums = {w: np.zeros(n_series, dtype=np.float64) for w in MA_WINDOWS}
+        self.last = np.zeros(n_series, dtype=np.float64)
+        for j, history in enumerate(histories):
+            tail = np.asarray(history, dtype=np.float64)[-RING_SIZE:]
+            self.ring[j, :len(tail)] = tail
+            self.seen[j] = len(history)
+            for w in MA_WINDOWS:
+                self.sums[w][j] = tail[-w:].sum()
+            self.last[j] = tail[-1]
+        # Position d'écriture suivante = plus ancienne valeur une fois le tampon plein
+        self.pos = np.minimum(self.seen, RING_SIZE) % RING_SIZE
+        self._rows = np.arange(n_series)
+
+    def means(self, window: int) -> np.ndarray:
+        return self.sums[window] / np.minimum(self.seen, window)
+
+    def push(self, values: np.ndarray) -> None:
+        """Ajoute une valeur par série (prévision du pas courant)."""
+        for w in MA_WINDOWS:
+            leaving = self.ring[self._rows, (self.pos - w) % RING_SIZE]
+            self.sums[w] += values - np.where(self.seen >= w, leaving, 0.0)
+        self.ring[self._rows, self.pos] = values
+        self.pos = (self.pos + 1) % RING_SIZE
+        self.seen += 1
+        self.last = values.astype(np.float64, copy=True)
+
+
+def recursive_forecast(
+    predict: Union[Callable[[np.ndarray], np.ndarray], List],
+    histories: Sequence[np.ndarray],
+    last_dates: Sequence,
+    horizon: int,
+    freq: str = "D",
+    clip_min: float = 0.0,
+    exog_future: Optional[np.ndarray] = None,
+) -> Tuple[List[pd.DatetimeIndex], np.ndarray]:
+    """Prévision récursive sur horizon pas pour plusieurs séries à la fois.
+
+    À chaque pas, les features (FEATURE_COLS) de toutes les séries sont lues dans LagState,
+    la prévision est faite en un appel, puis réinjectée (lag, MA_7, MA_30). predict est une
+    fonction (n_séries, 12) -> (n_séries,) (modèle global) ou une liste de modèles
+    (un .predict par série). exog_future (n_séries, horizon, k) ajoute k colonnes
+    connues à l'avance (Fourier, exogènes) après FEATURE_COLS. Retourne les dates futures
+    par série et (n_séries, horizon).
+    """
+    n_series = len(histories)
+    state = LagState(histories)
+    indexes = [future_dates(pd.Timestamp(d), horizon, freq=freq) for d in last_dates]
+    calendar = calendar_features(
+        np.stack([idx.to_numpy() for idx in indexes]),
+        previous=np.asarray([pd.Timestamp(d).to_datetime64() for d in last_dates], dtype="datetime64[D]"),
+    )
+    lengths = np.array([len(h) for h in histories], dtype=np.float32)
+
+    forecasts = np.empty((n_series, horizon), dtype=np.float64)
+    n_exog = 0 if exog_future is None else exog_future.shape[2]
+    X = np.empty((n_series, len(FEATURE_COLS) + n_exog), dtype=np.float32)
+    for t in range(horizon):
+        X[:, 0] = lengths + t
+        X[:, CALENDAR_SLICE] = calendar[:, t]
+        X[:, MA_SHORT] = state.means(MA_WINDOWS[0])
+        X[:, MA_LONG] = state.means(MA_WINDOWS[1])
+        X[:, LAG] = state.last
+        if n_exog:
+            X[:, len(FEATURE_COLS):] = exog_future[:, t]
+        if callable(predict):
+            step = np.asarray(predict(X), dtype=np.float64)
+        else:
+            step = np.array([float(m.predict(X[j:j + 1])[0]) for j, m in enumerate(predict)])
+        step = np.maximum(step, clip_min)
+        forecasts[:, t] = step
+        state.push(step)
+    return indexes, forecasts
+
+
+def predict_horizon(
+    model,
+    df_feat: pd.DataFrame,
+    feature_cols,
+    horizon: int,
+    freq: str = "D",
+    recursive: bool = True,
+    future_exog=None,
+):
+    """Dates futures + prévisions d'un modèle entraîné sur build_features (une série).
+
+    recursive=False reproduit l'ancien comportement (MA et lag figés sur le dernier point).
+    future_exog: exogènes de l'horizon (voir future_exog_matrix); les termes de Fourier de
+    feature_cols sont calculés sur les dates futures.
+    """
+    if not recursive:
+        index, future_X = build_future_features(df_feat, feature_cols, horizon, freq, future_exog)
+        return index, np.maximum(np.asarray(model.predict(future_X), dtype=float), 0)
+
+    names = extra_columns(feature_cols)
+    last_date = df_feat["Date"].iloc[-1]
+    exog = None
+    if names:
+        index = future_dates(pd.Timestamp(last_date), horizon, freq=freq)
+        exog = future_extra_matrix(df_feat, feature_cols, index, future_exog)[None]
+    columns = list(FEATURE_COLS) + names
+
+    def _predict(X: np.ndarray) -> np.ndarray:
+        return model.predict(pd.DataFrame(X, columns=columns, copy=False)[feature_cols])
+
+    indexes, forecasts = recursive_forecast(
+        _predict, [df_feat["Valeurs"].to_numpy()], [last_date], horizon, freq,
+        exog_future=exog,
+    )
+    return indexes[0], forecasts[0]
@@ -0,0 +1,691 @@
+import importlib
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import mean_absolute_error, mean_squared_error
+
+from models.feature_store import cached_build_features, cached_series_graph
+from models.features import (
+    FEATURE_COLS,
+    FeatureGraph,
+    build_future_features,
+    date_feature_matrix,
+    extra_columns,
+    is_date_feature,
+)
+from models.forecasting import (
+    LONG_DAILY_HISTORY,
+    basic_confidence_band,
+    freq_rule,
+    future_dates,
+    sarima_seasonal_order,
+    season_length,
+)
+from models.recursive import predict_horizon, recursive_forecast
+
+try:
+    from xgboost import XGBRegressor
+    _XGBOOST_OK = True
+except Exception:
+    _XGBOOST_OK = False
+_PROPHET_OK = importlib.util.find_spec("prophet") is not None
+_STATSMODELS_OK = importlib.util.find_spec("statsmodels") is not None
+_SARIMAX_OK = _STATSMODELS_OK and importlib.util.find_spec("statsmodels.tsa.statespace.sarimax") is not None
+
+# Part de l'historique servant à l'apprentissage du backtest (le reste sert de test)
+TRAIN_SHARE = 0.8
+# Horizon maximal de l'écran de prévision
+MAX_HORIZON = 365
+# Plis de la validation à origine glissante (1 = backtest unique sur la part 1 - TRAIN_SHARE)
+CV_FOLDS = int(os.getenv("VENTESPRO_CV_FOLDS", "1"))
+
+
+@dataclass
+class ForecastSeries:
+    """Série à prévoir et tout ce que les modèles partagent: historique, fréquence, termes de
+    Fourier, exogènes (historique et horizon) et clés des caches de features.
+
+    df_ts: DatetimeIndex régulier + colonne 'Valeurs' (prepare_series / SeriesPanel.series).
+    Sans dataset_key, les features sont recalculées (pas de magasin partagé).
+    """
+    df_ts: pd.DataFrame
+    freq: str = "D"
+    dataset_key: Optional[Hashable] = None
+    series_key: Hashable = None
+    fourier_columns: Sequence[str] = ()
+    exog: Optional[np.ndarray] = None
+    exog_names: Sequence[str] = ()
+    future_exog: Optional[np.ndarray] = None
+    recursive: bool = True
+    _graph: Optional[FeatureGraph] = field(default=None, repr=False, compare=False)
+
+    @property
+    def y(self) -> np.ndarray:
+        return self.df_ts["Valeurs"].to_numpy(dtype=np.float64)
+
+    @property
+    def season(self) -> int:
+        return season_length(self.freq)
+
+    def split_index(self, share: float = TRAIN_SHARE) -> int:
+        return int(len(self.df_ts) * share)
+
+    def future_dates(self, horizon: int) -> pd.DatetimeIndex:
+        return future_dates(self.df_ts.index[-1], horizon, self.freq)
+
+    def graph(self) -> FeatureGraph:
+        """FeatureGraph de la série (partagé via le magasin de features si dataset_key)."""
+        if self._graph is None:
+            if self.dataset_key is None:
+                self._graph = FeatureGraph(self.y, self.df_ts.index)
+            else:
+                self._graph = cached_series_graph(self.df_ts, self.dataset_key, self.series_key)
+        return self._graph
+
+    def matrix(self, columns: Sequence[str]) -> np.ndarray:
+        """Colonnes du FeatureGraph sur l'historique (seules celles-ci sont calculées)."""
+        return self.graph().matrix(list(columns))
+
+    def fourier_future(self, horizon: int) -> np.ndarray:
+        return date_feature_matrix(self.future_dates(horizon), list(self.fourier_columns))
+
+    def features(self, columns: Sequence[str]):
+        """(df_feat, X, y, feature_cols) de build_features sur columns, via le magasin de features."""
+        return cached_build_features(
+            self.df_ts, self.dataset_key, self.series_key,
+            exog=self.exog, exog_names=self.exog_names, columns=list(columns),
+        )
+
+
+@dataclass
+class ModelResult:
+    """Prévision d'un modèle: dates et valeurs de l'horizon, bande à 95 % et backtest."""
+    model: str
+    dates: pd.DatetimeIndex
+    forecasts: np.ndarray
+    lower: Optional[np.ndarray] = None
+    upper: Optional[np.ndarray] = None
+    mae: Optional[float] = None
+    rmse: Optional[float] = None
+
+    def frame(self) -> pd.DataFrame:
+        return pd.DataFrame({"Date": self.dates, "Prévision": self.forecasts})
+
+
+@dataclass
+class CrossValidation:
+    """Validation à origine glissante: prévisions de chaque pli (plis × horizon) et réalisé."""
+    model: str
+    origins: pd.DatetimeIndex  # première date prévue de chaque pli
+    actual: np.ndarray
+    predicted: np.ndarray
+
+    def fold_scores(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(MAE, RMSE) de chaque pli, calculés en une fois sur la matrice des erreurs."""
+        errors = self.actual - self.predicted
+        return np.abs(errors).mean(axis=1), np.sqrt((errors ** 2).mean(axis=1))
+
+    def scores(self) -> Tuple[float, float]:
+        """(MAE, RMSE) sur l'ensemble des plis."""
+        errors = self.actual - self.predicted
+        return float(np.abs(errors).mean()), float(np.sqrt((errors ** 2).mean()))
+
+    def frame(self) -> pd.DataFrame:
+        mae, rmse = self.fold_scores()
+        return pd.DataFrame({"Origine": self.origins, "Périodes": self.actual.shape[1], "MAE": mae, "RMSE": rmse})
+
+
+def rolling_origins(n: int, folds: int, horizon: Optional[int] = None, start: int = 0) -> Tuple[np.ndarray, int]:
+    """(origines, horizon) de folds plis consécutifs de horizon périodes; l'origine d'un pli
+    est l'indice de sa première période prévue. Sans horizon, les périodes après start sont
+    partagées entre les plis, le premier partant de start (même découpage que le backtest);
+    sinon les plis finissent à n. Aucune origine si l'historique est trop court.
+    """
+    folds = max(1, folds)
+    if horizon is None:
+        horizon = (n - start) // folds
+        origins = start + horizon * np.arange(folds)
+    else:
+        origins = n - horizon * np.arange(folds, 0, -1)
+    if horizon < 1 or origins[0] < 1:
+        return np.empty(0, dtype=np.int64), horizon
+    return origins, horizon
+
+
+def _scores(actual, predicted) -> Tuple[float, float]:
+    actual = np.asarray(actual, dtype=float)
+    predicted = np.asarray(predicted, dtype=float)
+    return mean_absolute_error(actual, predicted), float(np.sqrt(mean_squared_error(actual, predicted)))
+
+
+def _std(values) -> float:
+    values = np.asarray(values, dtype=float)
+    return float(np.std(values)) if len(values) > 1 else 0.0
+
+
+class ForecastModel:
+    """Modèle du registre: fit sur les end premiers points, predict sur l'horizon qui suit,
+    backtest (MAE, RMSE) sur la fin de l'historique.
+
+    Une instance n'ajuste qu'une série; les paramètres (nb d'arbres...) passent au constructeur.
+    """
+    name = ""
+    status = ""
+    requirement = None  # paquet pip manquant si available est False
+    available = True
+    # Prévoir MAX_HORIZON coûte autant que l'horizon demandé (pas de récursion coûteuse
+    # ni d'exogènes futurs): le cache des modèles prévoit alors d'emblée MAX_HORIZON
+    full_horizon = True
+    # predict() lit series.future_exog (sinon les exogènes futurs ne changent pas la prévision)
+    uses_future_exog = False
+    defaults: Dict[str, object] = {}
+
+    def __init__(self, **params):
+        self.params = {**self.defaults, **params}
+        self.end = None
+
+    def fit(self, series: ForecastSeries, end: Optional[int] = None) -> "ForecastModel":
+        self.end = len(series.df_ts) if end is None else end
+        self._fit(series, series.y[:self.end])
+        return self
+
+    def _fit(self, series: ForecastSeries, y: np.ndarray) -> None:
+        raise NotImplementedError
+
+    def feature_columns(self, series: ForecastSeries) -> List[str]:
+        """Colonnes du FeatureGraph de la série lues par le modèle (aucune par défaut): le
+        graphe n'évalue que celles-ci et leurs dépendances."""
+        return []
+
+    def predict(self, series: ForecastSeries, horizon: int) -> np.ndarray:
+        """Prévisions (>= 0) des horizon périodes qui suivent le point end."""
+        return np.maximum(np.asarray(self._forecast(series, horizon), dtype=float), 0)
+
+    def _forecast(self, series: ForecastSeries, horizon: int) -> np.ndarray:
+        """Prévisions brutes (non bornées à 0, utilisées telles quelles par le backtest)."""
+        raise NotImplementedError
+
+    def band(self, series: ForecastSeries, forecasts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return basic_confidence_band(forecasts, self.residual_std(series))
+
+    def residual_std(self, series: ForecastSeries) -> float:
+        return _std(series.y)
+
+    def backtest(self, series: ForecastSeries, split: Optional[int] = None) -> Optional[Tuple[float, float]]:
+        """(MAE, RMSE) d'un modèle ajusté sur les split premiers points, None si impossible."""
+        n = len(series.df_ts)
+        split = series.split_index() if split is None else split
+        if not 0 < split < n:
+            return None
+        model = type(self)(**self.params).fit(series, split)
+        return _scores(series.y[split:], model._forecast(series, n - split))
+
+    def fitted_at(self, series: ForecastSeries, end: int) -> "ForecastModel":
+        """Ce modèle s'il est ajusté sur les end premiers points, sinon une copie ajustée."""
+        return self if self.end == end else type(self)(**self.params).fit(series, end)
+
+    def rolling_forecasts(
+        self, series: ForecastSeries, origins: np.ndarray, horizon: int, refit: bool = False
+    ) -> np.ndarray:
+        """Prévisions brutes (plis × horizon) depuis chaque origine.
+
+        Sans refit, les modèles qui le permettent sont ajustés une fois (première origine) et
+        leur état est prolongé jusqu'aux origines suivantes. Par défaut: un ajustement par
+        origine (modèles sans état à prolonger: tendance linéaire, Prophet).
+        """
+        return np.stack([self.fitted_at(series, origin)._forecast(series, horizon) for origin in origins])
+
+    def cross_validate(
+        self, series: ForecastSeries, folds: int = CV_FOLDS, horizon: Optional[int] = None, refit: bool = False
+    ) -> Optional[CrossValidation]:
+        """Validation à origine glissante sur la fin de l'historique (après split_index()),
+        None si l'historique est trop court."""
+        origins, horizon = rolling_origins(len(series.df_ts), folds, horizon, series.split_index())
+        if not len(origins):
+            return None
+        predicted = np.asarray(self.rolling_forecasts(series, origins, horizon, refit), dtype=float)
+        rows = origins[:, None] + np.arange(horizon)
+        return CrossValidation(self.name, series.df_ts.index[origins], series.y[rows], predicted)
+
+    def evaluate(self, series: ForecastSeries, folds: int = CV_FOLDS) -> Optional[Tuple[float, float]]:
+        """(MAE, RMSE): backtest unique si folds <= 1, sinon validation à origine glissante."""
+        if folds <= 1:
+            return self.backtest(series)
+        cv = self.cross_validate(series, folds)
+        return cv.scores() if cv is not None else None
+
+
+class NaiveModel(ForecastModel):
+    name = "Naïf"
+    status = "📌 Modèle naïf (dernière valeur)..."
+
+    def _fit(self, series, y):
+        self.last = float(y[-1])
+
+    def _forecast(self, series, horizon):
+        return np.full(horizon, self.last)
+
+    def rolling_forecasts(self, series, origins, horizon, refit=False):
+        return np.repeat(series.y[origins - 1][:, None], horizon, axis=1)
+
+    def residual_std(self, series):
+        return _std(series.y[-30:])
+
+
+class LinearTrendModel(ForecastModel):
+    name = "Tendance linéaire"
+    status = "📈 Tendance linéaire..."
+
+    def _design(self, start, stop, fourier) -> np.ndarray:
+        return np.column_stack([np.arange(start, stop), fourier])
+
+    def feature_columns(self, series):
+        return list(series.fourier_columns)
+
+    def _fit(self, series, y):
+        self.X = self._design(0, len(y), series.matrix(self.feature_columns(series))[:len(y)])
+        self.y = y
+        self.model = LinearRegression().fit(self.X, y)
+
+    def _forecast(self, series, horizon):
+        if self.end == len(series.df_ts):
+            fourier = series.fourier_future(horizon)
+        else:
+            fourier = series.matrix(self.feature_columns(series))[self.end:self.end + horizon]
+        return self.model.predict(self._design(self.end, self.end + horizon, fourier))
+
+    def residual_std(self, series):
+        return _std(self.y - self.model.predict(self.X))
+
+
+class SmartMovingAverageModel(ForecastModel):
+    """Moyennes mobiles 7/14/30 pondérées + pente des 14 derniers points, amortie."""
+    name = "Moyenne Mobile Intelligente"
+    status = "📈 Moyenne Mobile Intelligente..."
+
+    def feature_columns(self, series):
+        return ["MA_7", "MA_14", "MA_30"]
+
+    def _fit(self, series, y):
+        if self.end == len(series.df_ts):
+            graph = series.graph()
+            ma_7, ma_14, ma_30 = (float(graph.get(c)[-1]) for c in self.feature_columns(series))
+        else:
+            ma_7, ma_14, ma_30 = (float(np.mean(y[-w:])) for w in (7, 14, 30))
+        recent = y[-14:]
+        self.slope = float(LinearRegression().fit(np.arange(len(recent)).reshape(-1, 1), recent).coef_[0])
+        self.base = ma_7 * 0.5 + ma_14 * 0.3 + ma_30 * 0.2
+        self.y = y
+
+    def _forecast(self, series, horizon):
+        steps = np.arange(horizon)
+        return self.base + self.slope * (steps + 1) * 0.98 ** (steps / 7)
+
+    def residual_std(self, series):
+        tail = self.y[-30:]
+        return float(np.std(tail, ddof=1)) if len(tail) > 1 else 0.0
+
+    def backtest(self, series, split=None):
+        # Référence historique: moyenne des 7 derniers points de l'apprentissage
+        n = len(series.df_ts)
+        split = series.split_index() if split is None else split
+        if not 0 < split < n:
+            return None
+        baseline = float(np.mean(series.y[max(0, split - 7):split]))
+        return _scores(series.y[split:], np.full(n - split, max(baseline, 0)))
+
+    def rolling_forecasts(self, series, origins, horizon, refit=False):
+        # Même référence que backtest(), à chaque origine
+        baseline = np.maximum([np.mean(series.y[max(0, origin - 7):origin]) for origin in origins], 0)
+        return np.repeat(baseline[:, None], horizon, axis=1)
+
+
+class HoltWintersModel(ForecastModel):
+    name = "Holt-Winters"
+    status = "❄️ Holt-Winters..."
+    requirement = "statsmodels"
+    available = _STATSMODELS_OK
+
+    def _fit(self, series, y):
+        from statsmodels.tsa.holtwinters import ExponentialSmoothing
+
+        season = series.season
+        seasonal_period = season if len(y) >= 2 * season else max(2, len(y) // 2)
+        try:
+            self.spec = {"trend": "add", "seasonal": "add", "seasonal_periods": seasonal_period}
+            self.model = ExponentialSmoothing(y, **self.spec, initialization_method="estimated").fit()
+        except Exception:
+            self.spec = {"trend": "add", "seasonal": None}
+            self.model = ExponentialSmoothing(y, **self.spec, initialization_method="estimated").fit()
+        self.y = y
+
+    def _forecast(self, series, horizon):
+        return self.model.forecast(horizon)
+
+    def rolling_forecasts(self, series, origins, horizon, refit=False):
+        if refit:
+            return super().rolling_forecasts(series, origins, horizon, refit)
+        from statsmodels.tsa.holtwinters import ExponentialSmoothing
+
+        # Lissages et états initiaux de la première origine: simple filtrage, sans optimisation
+        base = self.fitted_at(series, origins[0])
+        params = base.model.params
+        initial = {"initial_level": params["initial_level"], "initial_trend": params["initial_trend"]}
+        if base.spec["seasonal"]:
+            initial["initial_seasonal"] = params["initial_seasons"]
+        smoothing = {k: params[k] for k in ("smoothing_level", "smoothing_trend", "smoothing_seasonal")}
+        forecasts = []
+        for origin in origins:
+            model = ExponentialSmoothing(series.y[:origin], **base.spec, initialization_method="known", **initial)
+            forecasts.append(model.fit(**smoothing, optimized=False).forecast(horizon))
+        return np.stack(forecasts)
+
+    def residual_std(self, series):
+        return _std(self.y - self.model.fittedvalues) if len(self.y) > 2 else _std(self.y)
+
+
+class _TreeModel(ForecastModel):
+    """Random Forest / XGBoost sur build_features. Comme l'écran historique, fit() sans end
+    n'apprend que sur la part TRAIN_SHARE: le reste sert au backtest (prévision sur tout le
+    reste depuis le point de coupure, comme un pli de rolling_forecasts) et predict() part
+    toujours de la fin de l'historique (predict_horizon)."""
+    full_horizon = False  # un predict par pas (récursif), exogènes futurs limités à l'horizon
+    uses_future_exog = True
+
+    def feature_columns(self, series):
+        # recursive_forecast / build_future_features remplissent FEATURE_COLS par position
+        return FEATURE_COLS + list(series.fourier_columns)
+
+    def fit(self, series, end=None):
+        self.end = series.split_index() if end is None else end
+        _, X, y, _ = series.features(self.feature_columns(series))
+        self.model = self._estimator()
+        self._train(X.iloc[:self.end], y.iloc[:self.end])
+        return self
+
+    def _estimator(self):
+        raise NotImplementedError
+
+    def _train(self, X, y) -> None:
+        self.model.fit(X, y)
+
+    def predict(self, series, horizon):
+        df_feat, _, _, feature_cols = series.features(self.feature_columns(series))
+        _, forecasts = predict_horizon(
+            self.model, df_feat, feature_cols, horizon, series.freq, series.recursive, series.future_exog
+        )
+        return forecasts
+
+    def _test_predictions(self, series, split):
+        _, X, y, _ = series.features(self.feature_columns(series))
+        model = self if self.end == split else type(self)(**self.params).fit(series, split)
+        X_test = X.iloc[split:]
+        return y.iloc[split:].to_numpy(), model.model.predict(X_test) if len(X_test) else np.array([])
+
+    def backtest(self, series, split=None):
+        """Pli unique de rolling_forecasts: mêmes prévisions multi-pas que la validation."""
+        n = len(series.df_ts)
+        split = series.split_index() if split is None else split
+        if not 0 < split < n:
+            return None
+        predicted = self.rolling_forecasts(series, np.array([split]), n - split)[0]
+        return _scores(series.y[split:], predicted)
+
+    def rolling_forecasts(self, series, origins, horizon, refit=False):
+        """Comme predict() depuis chaque origine, sur la matrice de features complète (lignes
+        < origine pour l'apprentissage, exogènes réalisés de l'horizon). Sans refit, le modèle
+        de la première origine sert à tous les plis: lag et moyennes mobiles suivent l'historique."""
+        df_feat, _, _, feature_cols = series.features(self.feature_columns(series))
+        models = [self.fitted_at(series, o) for o in origins] if refit else [self.fitted_at(series, origins[0])]
+        rows = origins[:, None] + np.arange(horizon)
+
+        if not series.recursive:
+            # Lag et moyennes mobiles figés à chaque origine, exogènes réalisés de l'horizon
+            names = [c for c in extra_columns(feature_cols) if not is_date_feature(c)]
+            exog = df_feat[names].to_numpy(dtype=np.float32) if names else None
+            future = [
+                build_future_features(
+                    df_feat.iloc[:o], feature_cols, horizon, series.freq, None if exog is None else exog[o:o + horizon]
+                )[1]
+                for o in origins
+            ]
+            if refit:
+                predicted = [m.model.predict(X) for m, X in zip(models, future)]
+            else:
+                predicted = np.split(models[0].model.predict(pd.concat(future)), len(origins))
+            return np.maximum(np.stack(predicted).astype(float), 0)
+
+        # Récursion des plis en parallèle (une ligne par pli et par pas)
+        names = extra_columns(feature_cols)
+        columns = list(FEATURE_COLS) + names
+        exog = df_feat[names].to_numpy(dtype=np.float32)[rows] if names else None
+        values = df_feat["Valeurs"].to_numpy()
+
+        def _predict(X: np.ndarray) -> np.ndarray:
+            frame = pd.DataFrame(X, columns=columns, copy=False)[feature_cols]
+            if not refit:
+                return models[0].model.predict(frame)
+            return np.array([m.model.predict(frame.iloc[j:j + 1])[0] for j, m in enumerate(models)])
+
+        _, forecasts = recursive_forecast(
+            _predict, [values[:o] for o in origins], df_feat["Date"].iloc[origins - 1], horizon, series.freq,
+            exog_future=exog,
+        )
+        return forecasts
+
+
+class RandomForestModel(_TreeModel):
+    name = "Random Forest"
+    status = "🌳 Random Forest..."
+    defaults = {"n_estimators": 200, "max_depth": 8, "random_state": 42, "n_jobs": -1}
+
+    def _estimator(self):
+        return RandomForestRegressor(**self.params)
+
+    def residual_std(self, series):
+        actual, predicted = self._test_predictions(series, self.end)
+        if len(predicted) > 1:
+            return _std(actual - predicted)
+        return float(series.df_ts["Valeurs"].std())
+
+
+class XGBoostModel(_TreeModel):
+    name = "XGBoost"
+    status = "⚡ XGBoost..."
+    requirement = "xgboost"
+    available = _XGBOOST_OK
+    defaults = {
+        "n_estimators": 250, "max_depth": 6, "learning_rate": 0.05,
+        "subsample": 0.9, "colsample_bytree": 0.9, "random_state": 42, "n_jobs": -1,
+    }
+
+    def _estimator(self):
+        return XGBRegressor(**self.params)
+
+    def _train(self, X, y):
+        self.model.fit(X, y, verbose=False)
+
+    def residual_std(self, series):
+        tail = series.y[-30:]
+        return float(np.std(tail, ddof=1)) if len(tail) > 1 else 0.0
+
+
+class _StateSpaceModel(ForecastModel):
+    """ARIMA / SARIMA statsmodels: bande = intervalle de confiance du modèle."""
+    requirement = "statsmodels"
+
+    def _forecast(self, series, horizon):
+        return self.model.forecast(steps=horizon, **self._forecast_kw(series, horizon))
+
+    def _forecast_kw(self, series, horizon) -> dict:
+        return {}
+
+    def _exog_rows(self, series, start, stop) -> dict:
+        """Exogènes des périodes historiques [start, stop) (kwargs statsmodels)."""
+        return {}
+
+    def rolling_forecasts(self, series, origins, horizon, refit=False):
+        if refit:
+            return super().rolling_forecasts(series, origins, horizon, refit)
+        # Ajusté une fois; l'état est prolongé sur les nouvelles observations de chaque pli
+        # (extend: filtre de Kalman seul, paramètres inchangés)
+        results, previous = self.fitted_at(series, origins[0]).model, origins[0]
+        forecasts = []
+        for origin in origins:
+            if origin > previous:
+                results = results.extend(series.y[previous:origin], **self._exog_rows(series, previous, origin))
+                previous = origin
+            forecasts.append(results.forecast(steps=horizon, **self._exog_rows(series, origin, origin + horizon)))
+        return np.stack(forecasts)
+
+    def band(self, series, forecasts):
+        try:
+            ci = self.model.get_forecast(steps=len(forecasts), **self._forecast_kw(series, len(forecasts))).conf_int()
+            ci = np.asarray(ci, dtype=float)
+            return np.maximum(ci[:, 0], 0), ci[:, 1]
+        except Exception:
+            return super().band(series, forecasts)
+
+
+class ArimaModel(_StateSpaceModel):
+    """ARIMA(1, 1, 1); les termes de Fourier de la série servent d'exogènes."""
+    name = "ARIMA"
+    status = "📊 ARIMA..."
+    available = _STATSMODELS_OK
+    defaults = {"order": (1, 1, 1)}
+
+    def _fit(self, series, y):
+        from statsmodels.tsa.arima.model import ARIMA
+
+        exog = series.matrix(self.feature_columns(series))[:len(y)] if len(series.fourier_columns) else None
+        self.model = ARIMA(y, exog=exog, order=self.params["order"]).fit()
+
+    def _forecast_kw(self, series, horizon):
+        if len(series.fourier_columns) and self.end == len(series.df_ts):
+            return {"exog": series.fourier_future(horizon)}
+        return self._exog_rows(series, self.end, self.end + horizon)
+
+    def feature_columns(self, series):
+        return list(series.fourier_columns)
+
+    def _exog_rows(self, series, start, stop):
+        if not len(series.fourier_columns):
+            return {}
+        return {"exog": series.matrix(self.feature_columns(series))[start:stop]}
+
+
+class SarimaModel(_StateSpaceModel):
+    """SARIMA(1, 1, 1)(1, 1, 1, m) si au moins deux saisons (sarima_seasonal_order)."""
+    name = "SARIMA"
+    status = "🧭 SARIMA..."
+    available = _SARIMAX_OK
+    defaults = {"order": (1, 1, 1)}
+
+    def _fit(self, series, y):
+        from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+        seasonal_order = sarima_seasonal_order(len(y), series.freq)
+        self.model = SARIMAX(y, order=self.params["order"], seasonal_order=seasonal_order).fit(disp=False)
+
+
+class ProphetModel(ForecastModel):
+    name = "Prophet"
+    status = "🧠 Prophet..."
+    requirement = "prophet"
+    available = _PROPHET_OK
+
+    def _fit(self, series, y):
+        from prophet import Prophet
+
+        # Index nommé ou non (prepare_series le nomme 'Date'): colonnes construites explicitement
+        frame = pd.DataFrame({"ds": series.df_ts.index[:len(y)], "y": y})
+        self.model = Prophet(daily_seasonality=series.freq == "D")
+        self.model.fit(frame)
+        self.frame = None
+
+    def _forecast(self, series, horizon):
+        future = self.model.make_future_dataframe(periods=horizon, freq=freq_rule(series.freq), include_history=False)
+        self.frame = self.model.predict(future)  # yhat_lower / yhat_upper pour band()
+        return self.frame["yhat"].to_numpy(dtype=float)
+
+    def band(self, series, forecasts):
+        return np.maximum(self.frame["yhat_lower"].to_numpy(dtype=float), 0), self.frame["yhat_upper"].to_numpy(dtype=float)
+
+
+# Libellé de l'écran de prévision -> classe du modèle
+MODELS: Dict[str, type] = {
+    "Naïf (Dernière valeur)": NaiveModel,
+    "Tendance linéaire": LinearTrendModel,
+    "Moyenne Mobile Intelligente": SmartMovingAverageModel,
+    "Holt-Winters": HoltWintersModel,
+    "Random Forest": RandomForestModel,
+    "XGBoost": XGBoostModel,
+    "ARIMA": ArimaModel,
+    "SARIMA": SarimaModel,
+    "Prophet": ProphetModel,
+}
+# Modèles comparés par Auto, avec leurs paramètres (forêts plus légères que l'écran dédié)
+AUTO_MODELS: Dict[str, dict] = {
+    "Naïf (Dernière valeur)": {},
+    "Tendance linéaire": {},
+    "Holt-Winters": {},
+    "Random Forest": {"n_estimators": 150},
+    "XGBoost": {"n_estimators": 200, "colsample_bytree": 1.0},
+    "ARIMA": {},
+    "SARIMA": {},
+    "Prophet": {},
+}
+
+
+def auto_candidates(series: ForecastSeries) -> List[str]:
+    """Libellés AUTO_MODELS disponibles pour series. Sur un long historique journalier,
+    Tendance linéaire + Fourier couvre les saisonnalités de SARIMA pour une fraction du coût."""
+    long_daily = bool(series.fourier_columns) and series.freq == "D" and len(series.df_ts) > LONG_DAILY_HISTORY
+    return [
+        label for label in AUTO_MODELS
+        if MODELS[label].available and not (long_daily and label == "SARIMA")
+    ]
+
+
+def get_model(label: str, **params) -> ForecastModel:
+    """Instance du modèle label (clé de MODELS ou nom court, ex. 'Naïf')."""
+    for key, cls in MODELS.items():
+        if label in (key, cls.name):
+            return cls(**params)
+    raise ValueError(f"Modèle inconnu: {label} (attendu: {', '.join(MODELS)})")
+
+
+def ensure_available(model: ForecastModel) -> None:
+    """ImportError si la dépendance du modèle manque."""
+    if not model.available:
+        raise ImportError(f"{model.name}: installez {model.requirement} (pip install {model.requirement})")
+
+
+def run_model(
+    label: str,
+    series: ForecastSeries,
+    horizon: int,
+    confidence: bool = True,
+    backtest: bool = True,
+    folds: int = CV_FOLDS,
+    **params,
+) -> ModelResult:
+    """Unité de travail indépendante de Streamlit: évaluation (backtest, ou validation à
+    origine glissante si folds > 1), ajustement sur l'historique et prévision de l'horizon
+    (+ bande à 95 % si confidence).
+
+    Lève ImportError si la dépendance du modèle manque; les erreurs d'ajustement remontent.
+    """
+    model = get_model(label, **params)
+    ensure_available(model)
+    model.fit(series)
+    scores = model.evaluate(series, folds) if backtest else None
+    forecasts = model.predict(series, horizon)
+    lower, upper = model.band(series, forecasts) if confidence else (None, None)
+    mae, rmse = scores if scores is not None else (None, None)
+    return ModelResult(model.name, series.future_dates(horizon), forecasts, lower, upper, mae, rmse)
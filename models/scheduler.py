@@ -0,0 +1,275 @@
+import atexit
+import multiprocessing as mp
+import os
+import threading
+import time
+import warnings
+from dataclasses import dataclass, replace
+from multiprocessing.connection import wait
+from typing import Callable, Hashable, Iterator, List, Optional, Sequence, Tuple
+
+from models.model_cache import cached_result, fit_portable, remember_portable
+from models.registry import CV_FOLDS, MODELS, ForecastSeries, ModelResult
+
+# Budget (secondes, horloge murale) d'un modèle; au-delà, son processus est tué
+MODEL_TIMEOUT_S = float(os.getenv("VENTESPRO_MODEL_TIMEOUT_S", "120"))
+# Processus de calcul (0 = nombre de cœurs)
+MODEL_WORKERS = int(os.getenv("VENTESPRO_MODEL_WORKERS", "0")) or os.cpu_count() or 1
+# Délai (secondes) entre l'envoi d'une tâche et son début (processus neuf: imports compris)
+WORKER_START_S = float(os.getenv("VENTESPRO_WORKER_START_S", "60"))
+POLL_S = 0.05
+
+# 'spawn': pas de fork d'un processus Streamlit multi-thread (OpenMP de XGBoost / sklearn)
+_context = mp.get_context("spawn")
+
+
+@dataclass
+class ModelOutcome:
+    """Résultat d'un modèle exécuté dans le pool: result, ou error (exception, délai dépassé)."""
+    label: str
+    result: Optional[ModelResult]
+    error: Optional[str]
+    seconds: float
+
+    @property
+    def name(self) -> str:
+        return MODELS[self.label].name
+
+
+# Tâche du pool: (étiquette, fonction de module, args, kwargs), pour pouvoir être sérialisée
+Task = Tuple[Hashable, Callable, tuple, dict]
+
+
+def _serve(conn) -> None:
+    """Boucle d'un processus de calcul: une tâche à la fois, None pour s'arrêter.
+
+    Signale le début de chaque tâche: le budget ne compte pas le démarrage du processus.
+    """
+    warnings.filterwarnings("ignore")  # comme app.py (convergence statsmodels...)
+    while True:
+        job = conn.recv()
+        if job is None:
+            return
+        func, args, kwargs = job
+        conn.send(("start",))
+        start = time.perf_counter()
+        try:
+            result, error = func(*args, **kwargs), None
+        except Exception as exc:
+            result, error = None, f"{type(exc).__name__}: {exc}"
+        conn.send(("done", result, error, time.perf_counter() - start))
+
+
+class _Worker:
+    def __init__(self):
+        self.conn, child = _context.Pipe()
+        self.process = _context.Process(target=_serve, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+        self.tag = None
+        self.submitted = None  # envoi de la tâche en cours
+        self.started = None  # début de la tâche en cours (message 'start' du processus)
+
+    def submit(self, task: Task) -> None:
+        """Envoie la tâche; OSError / ValueError si le processus est mort entre-temps."""
+        tag, func, args, kwargs = task
+        self.conn.send((func, args, kwargs))
+        self.tag, self.submitted, self.started = tag, time.perf_counter(), None
+
+    def elapsed(self) -> float:
+        """Secondes depuis le début de la tâche (depuis son envoi tant qu'elle n'a pas commencé)."""
+        return time.perf_counter() - (self.started or self.submitted)
+
+    def overdue(self, timeout: float) -> Optional[str]:
+        """Motif d'abandon si la tâche dépasse son budget, ou si elle n'a pas commencé dans
+        WORKER_START_S (processus bloqué ou mort au démarrage)."""
+        if self.started is None:
+            if self.elapsed() > max(WORKER_START_S, timeout):
+                return f"processus non démarré ({max(WORKER_START_S, timeout):g} s)"
+            return None
+        return f"délai dépassé ({timeout:g} s)" if self.elapsed() > timeout else None
+
+    def kill(self) -> None:
+        self.process.terminate()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.kill()
+
+
+class ModelPool:
+    """Processus de calcul persistants (imports sklearn / statsmodels payés une fois) qui
+    exécutent des tâches (run_model, lots de séries...) en parallèle, chacune avec son
+    budget de temps.
+
+    Une tâche qui dépasse son budget est rapportée en échec et son processus remplacé.
+    Plusieurs lots (reruns Streamlit concurrents) peuvent tourner en même temps: le verrou
+    ne protège que la liste des processus libres.
+    """
+
+    def __init__(self, workers: int = MODEL_WORKERS):
+        self.size = max(1, workers)
+        self._idle: List[_Worker] = []
+        self._lock = threading.Lock()
+
+    def _acquire(self) -> _Worker:
+        with self._lock:
+            worker = self._idle.pop() if self._idle else None
+        return worker or _Worker()
+
+    def _release(self, worker: _Worker) -> None:
+        """Rend worker aux processus libres (arrêté s'il y en a déjà size)."""
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(worker)
+                return
+        worker.stop()
+
+    def _submit(self, task: Task) -> _Worker:
+        """Processus libre qui a accepté task; un processus mort en attente est remplacé."""
+        worker = self._acquire()
+        try:
+            worker.submit(task)
+        except (OSError, ValueError):
+            worker.kill()
+            worker = _Worker()
+            worker.submit(task)
+        return worker
+
+    def threads(self, n_tasks: int) -> int:
+        """n_jobs par tâche: les cœurs sont partagés entre les processus actifs."""
+        return max(1, (os.cpu_count() or 1) // max(1, min(self.size, n_tasks)))
+
+    def run(
+        self,
+        jobs: Sequence[Tuple[str, dict]],
+        series: ForecastSeries,
+        horizon: int,
+        confidence: bool = False,
+        timeout: float = MODEL_TIMEOUT_S,
+        folds: int = CV_FOLDS,
+    ) -> Iterator[ModelOutcome]:
+        """Exécute jobs [(libellé MODELS, paramètres)] et rend chaque ModelOutcome dès qu'il
+        est prêt (ordre d'achèvement). Abandonner l'itération tue les jobs en cours.
+
+        Les modèles déjà ajustés (cache des modèles du processus principal) ne repartent pas
+        dans le pool; les autres y sont ajustés et reviennent remplir ce cache.
+        """
+        fits = []
+        for label, params in jobs:
+            start = time.perf_counter()
+            try:
+                result = cached_result(label, series, horizon, confidence, folds=folds, **params)
+            except Exception:
+                result = None  # entrée illisible ou prolongation en échec: nouvel ajustement
+            if result is None:
+                fits.append((label, params))
+            else:
+                yield ModelOutcome(label, result, None, time.perf_counter() - start)
+        if not fits:
+            return
+        payload = replace(series, _graph=None)  # le graphe de features est recalculé côté processus
+        n_jobs = self.threads(len(fits))
+        tasks = [
+            (label, fit_portable, (label, payload, horizon, confidence, True, folds), with_threads(label, params, n_jobs))
+            for label, params in fits
+        ]
+        for label, fitted, error, seconds in self.imap(tasks, timeout):
+            result = None
+            if fitted is not None:
+                result, key, data = fitted
+                remember_portable(key, data)
+            yield ModelOutcome(label, result, error, seconds)
+
+    def imap(
+        self, tasks: Sequence[Task], timeout: float = MODEL_TIMEOUT_S
+    ) -> Iterator[Tuple[Hashable, object, Optional[str], float]]:
+        """(étiquette, résultat, erreur, secondes) de chaque tâche, dans l'ordre d'achèvement.
+
+        Abandonner l'itération (ou fermer le générateur) tue les tâches en cours.
+        """
+        workers = min(self.size, len(tasks))
+        pending = list(tasks)
+        busy: List[_Worker] = []
+        try:
+            while pending or busy:
+                while pending and len(busy) < workers:
+                    busy.append(self._submit(pending.pop(0)))
+
+                for conn in wait([w.conn for w in busy], timeout=POLL_S):
+                    worker = next(w for w in busy if w.conn is conn)
+                    try:
+                        message = conn.recv()
+                    except (EOFError, OSError):  # processus mort (mémoire, signal...)
+                        busy.remove(worker)
+                        self._replace(worker)
+                        yield worker.tag, None, "processus interrompu", worker.elapsed()
+                        continue
+                    if message[0] == "start":
+                        worker.started = time.perf_counter()
+                        continue
+                    _, result, error, seconds = message
+                    busy.remove(worker)
+                    self._release(worker)
+                    yield worker.tag, result, error, seconds
+
+                for worker in list(busy):
+                    reason = worker.overdue(timeout)
+                    if reason is None:
+                        continue
+                    busy.remove(worker)
+                    seconds = worker.elapsed()
+                    self._replace(worker)
+                    yield worker.tag, None, reason, seconds
+        finally:
+            for worker in busy:
+                self._replace(worker)
+
+    def _replace(self, worker: _Worker) -> None:
+        """Tue worker et démarre aussitôt son remplaçant (imports en arrière-plan)."""
+        worker.kill()
+        self._release(_Worker())
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.stop()
+
+
+def with_threads(label: str, params: dict, n_jobs: int) -> dict:
+    """params avec n_jobs pour les modèles qui en ont un (forêts), sauf s'il est déjà fixé."""
+    if "n_jobs" in MODELS[label].defaults and "n_jobs" not in params:
+        return {**params, "n_jobs": n_jobs}
+    return params
+
+
+_pool: Optional[ModelPool] = None
+
+
+def model_pool() -> ModelPool:
+    """ModelPool partagé par les reruns Streamlit (créé au premier appel)."""
+    global _pool
+    if _pool is None:
+        _pool = ModelPool()
+        atexit.register(_pool.close)
+    return _pool
+
+
+def run_models(
+    jobs: Sequence[Tuple[str, dict]],
+    series: ForecastSeries,
+    horizon: int,
+    confidence: bool = False,
+    timeout: float = MODEL_TIMEOUT_S,
+    folds: int = CV_FOLDS,
+) -> Iterator[ModelOutcome]:
+    """ModelPool.run sur le pool partagé."""
+    return model_pool().run(jobs, series, horizon, confidence, timeout, folds)
@@ -0,0 +1,141 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from utils.schema import parse_booleans
+
+# Une vente est identifiée par (Date, Produit, Region): une ligne delta sur la même clé remplace l'ancienne
+APPEND_KEYS = ("Produit", "Region")
+MAX_INVALID_RATIO = 0.0
+
+
+class AppendError(ValueError):
+    """Fichier delta incompatible avec le jeu de données enregistré."""
+
+
+def append_keys(base: pd.DataFrame, keys: Optional[Sequence[str]] = None) -> List[str]:
+    """Colonnes de déduplication (hors date) présentes dans le jeu de données."""
+    return [c for c in (keys if keys is not None else APPEND_KEYS) if c in base.columns]
+
+
+def validate_delta(delta: pd.DataFrame, base: pd.DataFrame, date_col: str) -> List[str]:
+    """Compare le delta au schéma enregistré; retourne la liste des problèmes (vide = compatible)."""
+    problems = []
+    expected = [date_col] + list(base.columns)
+    missing = [c for c in expected if c not in delta.columns]
+    if missing:
+        problems.append(f"Colonnes manquantes: {', '.join(missing)}")
+    for name in base.columns:
+        if name not in delta.columns:
+            continue
+        col, dtype = delta[name], base[name].dtype
+        values = col.dropna()
+        if len(values) == 0:
+            continue
+        if pd.api.types.is_bool_dtype(dtype):
+            bad = parse_booleans(values).isna()
+        elif pd.api.types.is_numeric_dtype(dtype):
+            bad = pd.to_numeric(values, errors="coerce").isna()
+        else:
+            continue
+        if bad.mean() > MAX_INVALID_RATIO:
+            problems.append(f"'{name}': {int(bad.sum())} valeur(s) non compatibles avec le type {dtype}")
+    return problems
+
+
+def conform_delta(delta: pd.DataFrame, base: pd.DataFrame) -> pd.DataFrame:
+    """Projette le delta sur les colonnes du jeu enregistré et aligne les types (catégories exclues)."""
+    out = {}
+    for name in base.columns:
+        col, dtype = delta[name], base[name].dtype
+        if pd.api.types.is_bool_dtype(dtype):
+            mapped = parse_booleans(col)
+            out[name] = mapped.astype("boolean" if col.isna().any() else dtype)
+        elif pd.api.types.is_numeric_dtype(dtype):
+            values = pd.to_numeric(col, errors="coerce")
+            # Même type si l'aller-retour est exact; sinon pd.concat élargira (ex: int16 -> int32)
+            if dtype.kind == "f" or not values.isna().any():
+                cast = values.astype(dtype)
+                if bool(((cast == values) | values.isna()).all()):
+                    values = cast
+            out[name] = values
+        else:
+            out[name] = col
+    return pd.DataFrame(out, index=delta.index)
+
+
+def _union_categories(head: pd.DataFrame, tail: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Étend les catégories pour que pd.concat conserve les colonnes catégorielles."""
+    for name in head.columns:
+        dtype = head[name].dtype
+        if not isinstance(dtype, pd.CategoricalDtype):
+            continue
+        new = pd.Index(pd.unique(tail[name].dropna().astype(str))).difference(dtype.categories.astype(str))
+        categories = dtype.categories.append(new) if len(new) else dtype.categories
+        if len(new):
+            head = head.assign(**{name: head[name].cat.add_categories(new)})
+        tail = tail.assign(**{name: pd.Categorical(tail[name], categories=categories)})
+    return head, tail
+
+
+def merge_delta(
+    base: pd.DataFrame,
+    delta: pd.DataFrame,
+    keys: Optional[Sequence[str]] = None,
+    date_col: Optional[str] = None,
+) -> Tuple[pd.DataFrame, Dict[str, object]]:
+    """Fusionne un delta dans le jeu enregistré: dates en index (trié, index_by_date) ou, avec
+    date_col, en colonne (résultat trié par date et réindexé 0..n-1).
+
+    Sur la clé (date, *keys), toutes les lignes enregistrées de même clé sont retirées au
+    profit de celle du delta; dans le delta, la dernière gagne. Si le jeu est trié par date,
+    seule la partition des dates >= première date du delta est comparée et retriée:
+    l'historique antérieur n'est ni haché ni retrié (pd.concat le recopie cependant).
+    """
+    keys = append_keys(base, keys)
+    if len(delta) == 0:
+        return base, {"ajoutees": 0, "remplacees": 0, "debut": None, "historique_intact": len(base)}
+
+    def _dates(df: pd.DataFrame) -> pd.Index:
+        return pd.Index(df[date_col]) if date_col is not None else df.index
+
+    base_dates = _dates(base)
+    if date_col is None and delta.index.dtype != base.index.dtype:
+        delta = delta.set_axis(delta.index.astype(base.index.dtype), axis=0)
+    elif date_col is not None and delta[date_col].dtype != base[date_col].dtype:
+        delta = delta.assign(**{date_col: delta[date_col].astype(base[date_col].dtype)})
+    order = _dates(delta).argsort(kind="stable")
+    delta = delta.iloc[order]
+
+    start = _dates(delta)[0]
+    cut = int(base_dates.searchsorted(start, side="left")) if base_dates.is_monotonic_increasing else 0
+    head, tail = base.iloc[:cut], base.iloc[cut:]
+
+    def _keys(df: pd.DataFrame) -> pd.MultiIndex:
+        return pd.MultiIndex.from_arrays([_dates(df)] + [df[k].astype(str) for k in keys])
+
+    delta_keys = _keys(delta)
+    duplicated = delta_keys.duplicated(keep="last")
+    delta, delta_keys = delta[~duplicated], delta_keys[~duplicated]
+    tail_keys = _keys(tail)
+    replaced = tail_keys.isin(delta_keys)
+    known = delta_keys.isin(tail_keys[replaced])
+
+    head, delta = _union_categories(head, delta)
+    _, tail = _union_categories(head, tail)
+    partition = pd.concat([tail[~replaced], delta])
+    if date_col is None:
+        partition = partition.sort_index(kind="stable")
+        merged = pd.concat([head, partition])
+    else:
+        partition = partition.sort_values(date_col, kind="stable")
+        merged = pd.concat([head, partition], ignore_index=True)
+    merged.attrs = dict(base.attrs)
+    report = {
+        "ajoutees": int((~known).sum()),
+        "remplacees": int(known.sum()),
+        "lignes_retirees": int(replaced.sum()),
+        "debut": start,
+        "historique_intact": cut,
+    }
+    return merged, report
@@ -0,0 +1,123 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+import pandas as pd
+
+from utils.cache import CACHE_DIR, CACHE_MAX_BYTES, evict_lru
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc  # noqa: F401
+    _ARROW_OK = True
+except Exception:
+    _ARROW_OK = False
+
+ATTRS_METADATA_KEY = b"ventespro_attrs"
+# DataFrames mappés gardés ouverts par processus (les moins récemment utilisés sont relâchés)
+SHARED_FRAMES_MAX_ENTRIES = int(os.getenv("VENTESPRO_SHARED_FRAMES", "8"))
+
+# Un seul DataFrame adossé au mmap par clé et par processus; chaque session en reçoit une vue
+_shared: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def _store_path(key: str, store_dir: Optional[str] = None) -> str:
+    return os.path.join(store_dir or CACHE_DIR, f"{key}.arrow")
+
+
+def publish_frame(key: str, df: pd.DataFrame, store_dir: Optional[str] = None) -> Optional[str]:
+    """Écrit le DataFrame en Arrow IPC non compressé (mappable en mémoire). Retourne le chemin."""
+    if not _ARROW_OK:
+        return None
+    store_dir = store_dir or CACHE_DIR
+    path = _store_path(key, store_dir)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(store_dir, exist_ok=True)
+        table = pa.Table.from_pandas(df, preserve_index=True)
+        if df.attrs:
+            metadata = dict(table.schema.metadata or {})
+            metadata[ATTRS_METADATA_KEY] = json.dumps(df.attrs, default=str).encode("utf-8")
+            table = table.replace_schema_metadata(metadata)
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return None
+    evict_lru(store_dir, CACHE_MAX_BYTES, keep=path)
+    return path
+
+
+def open_shared_frame(key: str, store_dir: Optional[str] = None) -> Optional[pd.DataFrame]:
+    """Vue en lecture seule sur le DataFrame mappé en mémoire (None si absent).
+
+    Les colonnes numériques sans valeurs manquantes pointent directement sur le fichier
+    mappé: la mémoire physique est partagée entre sessions et processus. Au plus
+    SHARED_FRAMES_MAX_ENTRIES restent ouverts (LRU); un DataFrame relâché reste lisible
+    par les vues existantes et est rouvert depuis le fichier au besoin.
+    """
+    if not _ARROW_OK:
+        return None
+    with _lock:
+        df = _shared.get(key)
+        if df is not None:
+            _shared.move_to_end(key)
+        else:
+            path = _store_path(key, store_dir)
+            if not os.path.exists(path):
+                return None
+            try:
+                source = pa.memory_map(path, "r")
+                table = pa.ipc.open_file(source).read_all()
+                df = table.to_pandas(split_blocks=True, self_destruct=False)
+                raw_attrs = (table.schema.metadata or {}).get(ATTRS_METADATA_KEY)
+                if raw_attrs:
+                    df.attrs = json.loads(raw_attrs)
+                os.utime(path, None)
+            except Exception:
+                return None
+            _shared[key] = df
+            while len(_shared) > SHARED_FRAMES_MAX_ENTRIES:
+                _shared.popitem(last=False)
+    view = df.copy(deep=False)
+    view.attrs = dict(df.attrs)
+    return view
+
+
+def share_frame(
+    key: str,
+    build: Callable[[], Optional[pd.DataFrame]],
+    store_dir: Optional[str] = None,
+) -> Optional[pd.DataFrame]:
+    """Retourne une vue du DataFrame partagé; le construit et le publie au premier appel.
+
+    Sans pyarrow (ou si l'écriture échoue), le DataFrame construit est retourné tel quel.
+    """
+    view = open_shared_frame(key, store_dir)
+    if view is not None:
+        return view
+    df = build()
+    if df is None:
+        return None
+    if publish_frame(key, df, store_dir) is None:
+        return df
+    view = open_shared_frame(key, store_dir)
+    return view if view is not None else df
+
+
+def release_shared_frame(key: str) -> None:
+    """Oublie la référence processus (le mmap est libéré quand plus aucune vue ne l'utilise)."""
+    with _lock:
+        _shared.pop(key, None)
+
+
+def release_shared_frames() -> None:
+    """Oublie toutes les références processus (ex. après changement de jeu de données)."""
+    with _lock:
+        _shared.clear()
@@ -0,0 +1,136 @@
+import hashlib
+import os
+from typing import Optional
+
+import pandas as pd
+
+CACHE_DIR = os.getenv("VENTESPRO_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".ventespro", "cache"))
+CACHE_MAX_BYTES = int(os.getenv("VENTESPRO_CACHE_MAX_MB", "2048")) * 1024 * 1024
+HASH_CHUNK_BYTES = 8 * 1024 * 1024
+CACHE_EXTENSIONS = (".parquet", ".arrow", ".pkl")
+
+
+def file_content_hash(file, salt: str = "") -> str:
+    """Empreinte BLAKE2b du contenu d'un fichier (lu par blocs, position restaurée au début)."""
+    h = hashlib.blake2b(digest_size=20)
+    h.update(salt.encode("utf-8"))
+    file.seek(0)
+    while True:
+        chunk = file.read(HASH_CHUNK_BYTES)
+        if not chunk:
+            break
+        h.update(chunk if isinstance(chunk, bytes) else chunk.encode("utf-8"))
+    file.seek(0)
+    return h.hexdigest()
+
+
+def derive_key(base: str, *params) -> str:
+    """Clé de cache dérivée: empreinte de base + hachage court des paramètres."""
+    digest = hashlib.blake2b(repr(params).encode("utf-8"), digest_size=6).hexdigest()
+    return f"{base}-{digest}"
+
+
+def _entry_path(key: str, cache_dir: Optional[str] = None) -> str:
+    return os.path.join(cache_dir or CACHE_DIR, f"{key}.parquet")
+
+
+def cache_get(key: str, cache_dir: Optional[str] = None) -> Optional[pd.DataFrame]:
+    """Retourne le DataFrame en cache (et le marque comme récemment utilisé) ou None."""
+    path = _entry_path(key, cache_dir)
+    if not os.path.exists(path):
+        return None
+    try:
+        df = pd.read_parquet(path)
+        os.utime(path, None)
+        return df
+    except Exception:
+        # Entrée corrompue ou moteur Parquet absent: on l'ignore
+        return None
+
+
+def cache_put(
+    key: str,
+    df: pd.DataFrame,
+    cache_dir: Optional[str] = None,
+    max_bytes: Optional[int] = None,
+) -> bool:
+    """Écrit le DataFrame en Parquet (écriture atomique) puis applique l'éviction LRU."""
+    cache_dir = cache_dir or CACHE_DIR
+    path = _entry_path(key, cache_dir)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        df.to_parquet(tmp_path, index=True)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+    evict_lru(cache_dir, CACHE_MAX_BYTES if max_bytes is None else max_bytes, keep=path)
+    return True
+
+
+def _blob_path(key: str, cache_dir: Optional[str] = None) -> str:
+    return os.path.join(cache_dir or CACHE_DIR, f"{key}.pkl")
+
+
+def cache_get_blob(key: str, cache_dir: Optional[str] = None) -> Optional[bytes]:
+    """Octets en cache (pickle d'un modèle ajusté...) ou None; même LRU que les DataFrames."""
+    path = _blob_path(key, cache_dir)
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        os.utime(path, None)
+        return data
+    except OSError:
+        return None
+
+
+def cache_put_blob(
+    key: str,
+    data: bytes,
+    cache_dir: Optional[str] = None,
+    max_bytes: Optional[int] = None,
+) -> bool:
+    """Écrit des octets (écriture atomique) puis applique l'éviction LRU."""
+    cache_dir = cache_dir or CACHE_DIR
+    path = _blob_path(key, cache_dir)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+    evict_lru(cache_dir, CACHE_MAX_BYTES if max_bytes is None else max_bytes, keep=path)
+    return True
+
+
+def evict_lru(cache_dir: str, max_bytes: int, keep: Optional[str] = None) -> int:
+    """Supprime les entrées les moins récemment utilisées au-delà de max_bytes. Retourne le nb supprimé."""
+    try:
+        entries = [
+            e for e in os.scandir(cache_dir)
+            if e.is_file() and e.name.endswith(CACHE_EXTENSIONS)
+        ]
+    except FileNotFoundError:
+        return 0
+
+    stats = sorted(((e.stat().st_mtime, e.stat().st_size, e.path) for e in entries))
+    total = sum(size for _, size, _ in stats)
+    removed = 0
+    for _, size, path in stats:
+        if total <= max_bytes:
+            break
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+            total -= size
+            removed += 1
+        except OSError:
+            continue
+    return removed
@@ -1,73 +1,171 @@
 import base64
-import traceback
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 import streamlit as st
 
+from utils.append import AppendError, conform_delta, merge_delta, validate_delta
+from utils.arrow_store import share_frame
+from utils.cache import cache_get, cache_put, derive_key, file_content_hash
+from utils.ingestion import (
+    STREAM_SAMPLE_ROWS,
+    IngestionError,
+    aggregate_csv_chunks,
+    aggregate_daily,
+    compact_dtypes,
+    index_by_date,
+    ingest,
+)
+from utils.schema import coerce_numeric
 
-@st.cache_data(ttl=3600)
-def load_data(file) -> Optional[pd.DataFrame]:
-    """Charge et prépare les données (CSV / Excel / TXT / Parquet)."""
+# Incrémenter quand le DataFrame produit par le chargement change (invalide le cache disque)
+LOADER_VERSION = "2"
+
+
+def load_sample(file, sheet_name=None, nrows: int = STREAM_SAMPLE_ROWS) -> Optional[pd.DataFrame]:
+    """Phase 1: premières lignes seulement (schéma et choix des colonnes avant la lecture complète)."""
     try:
-        file_extension = (file.name.split('.')[-1] if hasattr(file, "name") else "").lower()
-        df = None
-
-        def _read_csv_like(f):
-            separators = [';', ',', '\t', '|']
-            encodings = ['utf-8', 'latin-1']
-            for sep in separators:
-                for enc in encodings:
-                    try:
-                        f.seek(0)
-                        _df = pd.read_csv(f, sep=sep, encoding=enc)
-                        if _df is not None and len(_df.columns) > 1:
-                            return _df
-                    except Exception:
-                        continue
-            try:
-                f.seek(0)
-                _df = pd.read_csv(f, sep=None, engine="python")
-                if _df is not None and len(_df.columns) > 1:
-                    return _df
-            except Exception:
-                return None
-            return None
-
-        if file_extension in ['csv', 'txt', 'tsv']:
-            df = _read_csv_like(file)
-        elif file_extension in ['xlsx', 'xls']:
-            file.seek(0)
-            df = pd.read_excel(file)
-        elif file_extension in ['parquet']:
-            try:
-                file.seek(0)
-                df = pd.read_parquet(file)
-            except Exception as exc:
-                st.error(
-                    "❌ Lecture Parquet impossible (pyarrow/fastparquet requis). "
-                    f"Détail: {str(exc)}"
-                )
-                st.code(traceback.format_exc())
-                return None
-        else:
-            df = _read_csv_like(file)
-            if df is None:
-                st.error("❌ Format de fichier non supporté. Utilisez CSV, Excel, TXT/TSV ou Parquet.")
-                return None
-
-        if df is None or len(df.columns) <= 1:
-            st.error("❌ Impossible de lire le fichier ou fichier vide.")
-            return None
-
-        df.columns = [str(c).strip() for c in df.columns]
-        return df
+        df, _ = ingest(file, sheet_name=sheet_name, nrows=nrows)
+    except IngestionError as exc:
+        st.error(str(exc))
+        return None
+    return df
+
 
+def load_daily_cube(
+    file, date_col: str, target_col: str, group_cols: List[str], compact: bool = True
+) -> Optional[pd.DataFrame]:
+    """Cube quotidien agrégé par blocs, mis en cache disque (empreinte du fichier + paramètres)."""
+    key = derive_key(upload_cache_key(file), "cube", date_col, target_col, list(group_cols), compact)
+    cube = cache_get(key)
+    if cube is not None:
+        return cube
+    try:
+        cube = aggregate_csv_chunks(file, date_col, target_col, group_cols)
     except Exception as exc:
-        st.error(f"❌ Erreur lors du chargement du fichier: {str(exc)}")
+        st.error(f"❌ Erreur lors de l'agrégation par blocs: {str(exc)}")
+        return None
+    if compact:
+        cube, report = compact_dtypes(cube)
+        cube.attrs["compaction"] = report
+    cache_put(key, cube)
+    return cube
+
+
+def upload_cache_key(file) -> str:
+    """Empreinte du contenu d'un upload, calculée une seule fois par fichier et par session."""
+    ident = (
+        getattr(file, "file_id", None) or getattr(file, "name", ""),
+        getattr(file, "size", None),
+    )
+    try:
+        memo = st.session_state.setdefault("_upload_hashes", {})
+    except Exception:
+        memo = {}
+    if ident not in memo:
+        memo[ident] = file_content_hash(file, salt=f"v{LOADER_VERSION}:{ident[0]}")
+    return memo[ident]
+
+
+def load_data(
+    file,
+    compact: bool = True,
+    sheet_name=None,
+    usecols: Optional[List[str]] = None,
+    dtypes: Optional[Dict[str, str]] = None,
+    numeric: Optional[List[str]] = None,
+) -> Optional[pd.DataFrame]:
+    """Charge les données depuis le magasin Arrow partagé (clé = empreinte du contenu).
+
+    Le fichier n'est analysé qu'au premier chargement; ensuite chaque session reçoit une
+    vue sur le même DataFrame mappé en mémoire. Avec compact=True, les types sont
+    compactés (voir compact_dtypes) et le rapport est dans df.attrs['compaction'].
+    Phase 2 du chargement: sheet_name / usecols / dtypes (issus de utils.schema) limitent
+    la lecture à une feuille et aux seules colonnes choisies, avec des types explicites;
+    les colonnes numeric (numériques dans l'échantillon) sont converties après lecture, les
+    valeurs illisibles devenant NaN.
+    """
+    key = f"{upload_cache_key(file)}-compact" if compact else upload_cache_key(file)
+    if sheet_name is not None or usecols or dtypes or numeric:
+        key = derive_key(
+            key, sheet_name, sorted(usecols or []), sorted((dtypes or {}).items()), sorted(numeric or []),
+        )
+    return share_frame(key, lambda: _build_frame(file, compact, sheet_name, usecols, dtypes, numeric))
+
+
+def _build_frame(
+    file,
+    compact: bool,
+    sheet_name=None,
+    usecols: Optional[List[str]] = None,
+    dtypes: Optional[Dict[str, str]] = None,
+    numeric: Optional[List[str]] = None,
+) -> Optional[pd.DataFrame]:
+    df = _parse_upload(file, sheet_name=sheet_name, usecols=usecols, dtypes=dtypes)
+    if df is not None and numeric:
+        df = coerce_numeric(df, numeric)
+    if df is not None and compact:
+        df, report = compact_dtypes(df)
+        df.attrs["compaction"] = report
+    return df
+
+
+def _parse_upload(
+    file,
+    sheet_name=None,
+    usecols: Optional[List[str]] = None,
+    dtypes: Optional[Dict[str, str]] = None,
+) -> Optional[pd.DataFrame]:
+    """Charge les données via le moteur d'ingestion; les erreurs sont affichées dans l'UI."""
+    try:
+        df, _ = ingest(file, usecols=usecols, dtypes=dtypes, sheet_name=sheet_name)
+        return df
+    except IngestionError as exc:
+        st.error(str(exc))
         return None
 
 
+def apply_deltas(
+    df: pd.DataFrame,
+    base_key: str,
+    files: List,
+    date_col: str,
+    keys: List[str],
+    cube_target: Optional[str] = None,
+) -> Tuple[pd.DataFrame, List[Dict[str, object]]]:
+    """Mode ajout: fusionne les fichiers delta, dans l'ordre, dans le jeu indexé par date.
+
+    Chaque fusion est publiée dans le magasin Arrow sous la clé (jeu précédent, contenu du
+    delta): l'historique n'est jamais relu et une session suivante reprend le résultat.
+    En mode agrégé (cube_target), le delta est d'abord réduit au même cube quotidien.
+    Un delta incompatible est signalé dans l'UI et ignoré.
+    """
+    reports = []
+    for file in files:
+        key = derive_key(base_key, "delta", upload_cache_key(file), list(keys), cube_target)
+        try:
+            delta, _ = ingest(file)
+            if cube_target is not None:
+                delta = aggregate_daily(delta, date_col, cube_target, keys)
+            problems = validate_delta(delta, df, date_col)
+            if problems:
+                raise AppendError("; ".join(problems))
+        except (IngestionError, AppendError) as exc:
+            st.error(f"❌ Delta '{getattr(file, 'name', '?')}' ignoré: {exc}")
+            continue
+        report: Dict[str, object] = {}
+
+        def _merge(base=df, delta=delta, report=report):
+            merged, stats = merge_delta(base, conform_delta(index_by_date(delta, date_col), base), keys)
+            report.update(stats)
+            return merged
+
+        df = share_frame(key, _merge)
+        base_key = key
+        reports.append({"fichier": getattr(file, "name", "?"), **report})
+    return df, reports
+
+
 def create_download_link(df: pd.DataFrame, filename: str) -> str:
     """Crée un lien de téléchargement pour un DataFrame."""
     csv = df.to_csv(index=False).encode('utf-8')
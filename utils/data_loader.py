@@ -1,17 +1,13 @@
-import pandas as pd
+from utils.ingestion import index_by_date, ingest
 
-def load_data(file):
-    """Charge les données avec conversion correcte de la colonne Date."""
-    df = pd.read_csv(file, sep=";")  # Lire avec le bon séparateur
-    df.columns = df.columns.str.strip()  # Nettoyer les noms de colonnes
 
-    if "Date" in df.columns:
-        df["Date"] = pd.to_datetime(df["Date"], errors='coerce')  # Conversion
-        df = df.dropna(subset=["Date"])  # Supprimer les dates invalides
-        df = df.set_index("Date")  # Définir la colonne Date comme index
+def load_data(file, date_col: str = "Date"):
+    """Charge les données (tout format du registre, sans Streamlit) indexées par la colonne date."""
+    df, _ = ingest(file)
+
+    if date_col in df.columns:
+        df = index_by_date(df, date_col)  # Conversion, dates invalides retirées, tri
     else:
-        raise ValueError(f"⚠️ Colonne 'Date' introuvable ! Colonnes disponibles : {df.columns}")
+        raise ValueError(f"⚠️ Colonne '{date_col}' introuvable ! Colonnes disponibles : {df.columns}")
 
     return df
-
-
@@ -0,0 +1,101 @@
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+import numpy as np
+import pandas as pd
+
+# Ordre = priorité: à succès égal, le format jour/mois (usage FR) l'emporte sur mois/jour
+CANDIDATE_FORMATS = [
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y/%m/%d",
+    "%d/%m/%Y",
+    "%d/%m/%Y %H:%M",
+    "%d/%m/%Y %H:%M:%S",
+    "%d-%m-%Y",
+    "%d.%m.%Y",
+    "%d/%m/%y",
+    "%m/%d/%Y",
+    "%m/%d/%Y %H:%M",
+    "%m-%d-%Y",
+    "%m/%d/%y",
+    "%Y%m%d",
+]
+SAMPLE_SIZE = 500
+MIN_FORMAT_SUCCESS = 0.95
+EXCEL_EPOCH = "1899-12-30"
+PARSED_CACHE_MAX_ENTRIES = 16
+
+_parsed_cache: "OrderedDict[Hashable, np.ndarray]" = OrderedDict()
+
+
+def infer_date_format(values: pd.Series, sample_size: int = SAMPLE_SIZE) -> Optional[str]:
+    """Déduit le format exact à partir d'un échantillon de valeurs distinctes (None si aucun)."""
+    sample = pd.Series(pd.unique(values.dropna().astype(str).str.strip()))
+    sample = sample[sample != ""].head(sample_size)
+    if len(sample) == 0:
+        return None
+
+    best_fmt, best_rate = None, 0.0
+    for fmt in CANDIDATE_FORMATS:
+        rate = float(pd.to_datetime(sample, format=fmt, errors="coerce").notna().mean())
+        if rate > best_rate:
+            best_fmt, best_rate = fmt, rate
+        if rate == 1.0:
+            break
+    return best_fmt if best_rate >= MIN_FORMAT_SUCCESS else None
+
+
+def _parse_numeric(col: pd.Series) -> pd.Series:
+    valid = col.dropna()
+    if len(valid) == 0:
+        return pd.to_datetime(col, errors="coerce")
+    median = float(valid.median())
+    if 19000101 <= median <= 21001231:
+        # Entiers AAAAMMJJ
+        return pd.to_datetime(col.astype("Int64").astype(str), format="%Y%m%d", errors="coerce")
+    if median > 10000:
+        # Numéro de série Excel: jours depuis 1899-12-30
+        return pd.to_datetime(col, unit="D", origin=EXCEL_EPOCH, errors="coerce")
+    return pd.to_datetime(col, errors="coerce", dayfirst=True)
+
+
+def parse_dates(col: pd.Series, fmt: Optional[str] = None) -> pd.Series:
+    """Conversion vectorisée d'une colonne de dates (texte, série Excel, AAAAMMJJ).
+
+    Chaque valeur distincte n'est analysée qu'une fois (factorisation), avec le format
+    déduit d'un échantillon; l'analyse élément par élément n'est qu'un dernier recours.
+    """
+    if pd.api.types.is_datetime64_any_dtype(col):
+        return col
+    if pd.api.types.is_numeric_dtype(col) and not pd.api.types.is_bool_dtype(col):
+        return _parse_numeric(col)
+
+    codes, uniques = pd.factorize(col.astype("string").str.strip(), use_na_sentinel=True)
+    uniques = pd.Series(uniques)
+    fmt = fmt or infer_date_format(uniques)
+    if fmt is not None:
+        parsed = pd.to_datetime(uniques, format=fmt, errors="coerce")
+    else:
+        parsed = pd.to_datetime(uniques, errors="coerce", dayfirst=True, format="mixed")
+
+    values = parsed.to_numpy(dtype="datetime64[ns]")
+    out = np.full(len(codes), np.datetime64("NaT"), dtype="datetime64[ns]")
+    mask = codes >= 0
+    out[mask] = values[codes[mask]]
+    return pd.Series(out, index=col.index, name=col.name)
+
+
+def parse_dates_cached(col: pd.Series, dataset_key: Hashable) -> pd.Series:
+    """parse_dates mémorisé par clé de jeu de données (LRU, partagé entre sessions)."""
+    key = (dataset_key, col.name, len(col))
+    if key in _parsed_cache:
+        _parsed_cache.move_to_end(key)
+        values = _parsed_cache[key]
+    else:
+        values = parse_dates(col).to_numpy(dtype="datetime64[ns]")
+        _parsed_cache[key] = values
+        while len(_parsed_cache) > PARSED_CACHE_MAX_ENTRIES:
+            _parsed_cache.popitem(last=False)
+    return pd.Series(values.copy(), index=col.index, name=col.name)
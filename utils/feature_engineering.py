@@ -1,15 +1,88 @@
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
+
+from utils.holidays import FERIE, holiday_flags
+from utils.schema import CATEGORY_MAX_UNIQUE, boolean_codes, is_boolean
+
+# Variables exogènes reconnues: nom de feature -> colonnes source possibles (première trouvée)
+EXOG_COLUMNS = {
+    "Promo": ("Promo", "Promotion"),
+    "Prix": ("Prix Unitaire", "Prix", "Price"),
+    "Marketing": ("Marketing Budget", "Budget Marketing"),
+    "Meteo": ("Weather", "Météo", "Meteo"),
+    "Ferie": ("Holiday", "Férié", "Ferie"),
+}
+
+
+@dataclass(frozen=True)
+class ExogSpec:
+    name: str
+    column: str
+    kind: str  # 'numeric' | 'boolean' | 'categorical'
+    categories: Tuple = ()
+
+    @property
+    def feature(self) -> str:
+        return f"Exo_{self.name}"
+
+
+def detect_exog(df: pd.DataFrame, exclude: Sequence[str] = ()) -> List[ExogSpec]:
+    """Repère Promo, Prix, Marketing, Météo et Férié et fige leur encodage (catégories stables)."""
+    specs = []
+    for name, candidates in EXOG_COLUMNS.items():
+        column = next((c for c in candidates if c in df.columns and c not in exclude), None)
+        if column is None:
+            continue
+        col = df[column]
+        if is_boolean(col):
+            specs.append(ExogSpec(name, column, "boolean"))
+        elif pd.api.types.is_numeric_dtype(col):
+            specs.append(ExogSpec(name, column, "numeric"))
+        else:
+            categories = col.cat.categories if isinstance(col.dtype, pd.CategoricalDtype) else pd.unique(col.dropna())
+            if len(categories) <= CATEGORY_MAX_UNIQUE:
+                specs.append(ExogSpec(name, column, "categorical", tuple(sorted(map(str, categories)))))
+    return specs
+
+
+def encode_exog(df: pd.DataFrame, specs: Sequence[ExogSpec]) -> np.ndarray:
+    """Matrice (n, k) float32: valeurs numériques, 1/0 pour les booléens, code ordinal pour les catégories.
+
+    Un code par catégorie (pas de one-hot): la mémoire ne dépend pas de la cardinalité.
+    """
+    out = np.empty((len(df), len(specs)), dtype=np.float32)
+    for i, spec in enumerate(specs):
+        col = df[spec.column]
+        if spec.kind == "boolean":
+            out[:, i] = boolean_codes(col)
+        elif spec.kind == "categorical":
+            codes = pd.Categorical(col.astype(str).where(col.notna()), categories=list(spec.categories)).codes
+            out[:, i] = np.where(codes >= 0, codes, np.nan)
+        else:
+            out[:, i] = pd.to_numeric(col, errors="coerce").to_numpy(dtype=np.float32, na_value=np.nan)
+    return out
+
+
 def create_time_features(df):
     """Ajoute des variables temporelles aux données."""
     df["Jour de la semaine"] = df.index.dayofweek
     df["Mois"] = df.index.month
     df["Année"] = df.index.year
-    df["Weekend"] = df["Jour de la semaine"].apply(lambda x: 1 if x >= 5 else 0)
-    df["Holiday"] = df["Holiday"].apply(lambda x: 1 if x == "Yes" else 0)
+    df["Weekend"] = (df["Jour de la semaine"] >= 5).astype(int)
+    if "Holiday" in df.columns:
+        df["Holiday"] = np.nan_to_num(boolean_codes(df["Holiday"])).astype(int)
+    else:
+        df["Holiday"] = ((holiday_flags(df.index) & FERIE) > 0).astype(int)
     return df
 
+
 def encode_categorical_features(df):
-    """Encode les variables catégoriques pour les modèles et les visualisations."""
-    df = pd.get_dummies(df, columns=["Produit", "Region", "Weather"], drop_first=True)
+    """Encode les variables catégoriques pour les modèles et les visualisations (codes, sans one-hot)."""
+    df = df.copy()
+    for column in ("Produit", "Region", "Weather"):
+        if column in df.columns:
+            df[column] = df[column].astype("category").cat.codes.astype(np.int32)
     return df
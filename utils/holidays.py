@@ -0,0 +1,156 @@
+import threading
+from typing import Optional, Tuple
+
+import numpy as np
+
+# Jours fériés civils du Maroc: (mois, jour) -> libellé
+FIXED_HOLIDAYS = {
+    (1, 1): "Nouvel An",
+    (1, 11): "Manifeste de l'Indépendance",
+    (1, 14): "Nouvel An amazigh",
+    (5, 1): "Fête du Travail",
+    (7, 30): "Fête du Trône",
+    (8, 14): "Allégeance Oued Eddahab",
+    (8, 20): "Révolution du Roi et du Peuple",
+    (8, 21): "Fête de la Jeunesse",
+    (11, 6): "Marche Verte",
+    (11, 18): "Fête de l'Indépendance",
+}
+# Année à partir de laquelle un jour férié fixe est chômé
+HOLIDAY_SINCE = {(1, 14): 2024}
+# Fêtes religieuses: (mois hégirien, jour) -> libellé
+ISLAMIC_HOLIDAYS = {
+    (1, 1): "1er Moharram",
+    (3, 12): "Aïd al-Mawlid",
+    (3, 13): "Aïd al-Mawlid",
+    (10, 1): "Aïd al-Fitr",
+    (10, 2): "Aïd al-Fitr",
+    (12, 10): "Aïd al-Adha",
+    (12, 11): "Aïd al-Adha",
+}
+RAMADAN_MONTH = 9
+# Vacances scolaires: fenêtres approximatives ((mois, jour) début, fin incluse); le
+# calendrier officiel varie de quelques jours d'une année à l'autre
+SCHOOL_BREAKS = [
+    ((1, 19), (1, 26)),   # mi-année
+    ((3, 16), (3, 23)),   # printemps
+    ((7, 1), (9, 7)),     # été
+    ((10, 27), (11, 3)),  # automne
+]
+
+HOLIDAY_COLS = ["Ferie", "Ramadan", "Vacances"]
+FERIE, RAMADAN, VACANCES = 1, 2, 4
+DEFAULT_YEARS = (2000, 2040)
+
+# Calendrier hégirien tabulaire: jour julien de l'époque moins celui du 1970-01-01
+_ISLAMIC_EPOCH_DAYS = 1948439.5 - 2440587.5
+
+_lock = threading.Lock()
+_table = {"origin": 0, "flags": np.empty(0, dtype=np.uint8), "counts": np.zeros((1, 3), dtype=np.int32)}
+
+
+def islamic_to_days(year, month, day) -> np.ndarray:
+    """Date hégirienne -> numéro de jour depuis 1970 (calendrier tabulaire, vectorisé).
+
+    Les dates officielles dépendent de l'observation du croissant: l'écart est d'un jour au plus.
+    """
+    year, month, day = (np.asarray(v, dtype=np.int64) for v in (year, month, day))
+    return (
+        day + np.ceil(29.5 * (month - 1)).astype(np.int64) + (year - 1) * 354
+        + (3 + 11 * year) // 30 + int(_ISLAMIC_EPOCH_DAYS) - 1
+    ).astype(np.int64)
+
+
+def _day_numbers(years: np.ndarray, month: int, day: int) -> np.ndarray:
+    return (
+        (years - 1970).astype("datetime64[Y]").astype("datetime64[M]") + (month - 1)
+    ).astype("datetime64[D]").astype(np.int64) + day - 1
+
+
+def _build_flags(first_day: int, last_day: int) -> np.ndarray:
+    """Drapeaux uint8 (FERIE | RAMADAN | VACANCES) pour chaque jour de [first_day, last_day]."""
+    flags = np.zeros(last_day - first_day + 1, dtype=np.uint8)
+
+    def mark(days: np.ndarray, bit: int) -> None:
+        days = days[(days >= first_day) & (days <= last_day)]
+        flags[days - first_day] |= bit
+
+    first_year = int(np.datetime64(first_day, "D").astype("datetime64[Y]").astype(int)) + 1970
+    last_year = int(np.datetime64(last_day, "D").astype("datetime64[Y]").astype(int)) + 1970
+    years = np.arange(first_year, last_year + 1)
+    for (month, day) in FIXED_HOLIDAYS:
+        mark(_day_numbers(years[years >= HOLIDAY_SINCE.get((month, day), 0)], month, day), FERIE)
+    for start, end in SCHOOL_BREAKS:
+        starts, ends = _day_numbers(years, *start), _day_numbers(years, *end)
+        mark(np.concatenate([np.arange(a, b + 1) for a, b in zip(starts, ends)]), VACANCES)
+
+    # Années hégiriennes couvrant la plage (une année hégirienne ~ 354 jours); une de plus au
+    # début: l'année commencée avant le 1er janvier (Ramadan, Aïd de début janvier)
+    hijri = np.arange((first_year - 622) * 33 // 32 - 1, (last_year - 622) * 33 // 32 + 3)
+    for (month, day) in ISLAMIC_HOLIDAYS:
+        mark(islamic_to_days(hijri, month, day), FERIE)
+    starts = islamic_to_days(hijri, RAMADAN_MONTH, 1)
+    ends = islamic_to_days(hijri, RAMADAN_MONTH + 1, 1)
+    mark(np.concatenate([np.arange(a, b) for a, b in zip(starts, ends)]), RAMADAN)
+    return flags
+
+
+def _table_covering(lo: int, hi: int) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Drapeaux par jour et leurs cumuls couvrant [lo, hi], construits une fois (DEFAULT_YEARS)
+    puis agrandis par années entières si une série ou un horizon en sort."""
+    with _lock:
+        origin, flags = _table["origin"], _table["flags"]
+        if len(flags) and origin <= lo and hi < origin + len(flags):
+            return flags, _table["counts"], origin
+        first = _day_numbers(np.array([DEFAULT_YEARS[0]]), 1, 1)[0]
+        last = _day_numbers(np.array([DEFAULT_YEARS[1] + 1]), 1, 1)[0] - 1
+        if len(flags):
+            first, last = min(first, origin), max(last, origin + len(flags) - 1)
+        first = min(first, _day_numbers(np.array([_year_of(lo)]), 1, 1)[0])
+        last = max(last, _day_numbers(np.array([_year_of(hi) + 1]), 1, 1)[0] - 1)
+        flags = _build_flags(int(first), int(last))
+        bits = np.array([FERIE, RAMADAN, VACANCES], dtype=np.uint8)
+        # counts[i] = nombre de jours de chaque type avant le jour origin + i
+        counts = np.zeros((len(flags) + 1, len(bits)), dtype=np.int32)
+        np.cumsum((flags[:, None] & bits) > 0, axis=0, out=counts[1:])
+        flags.flags.writeable = False
+        counts.flags.writeable = False
+        _table.update(origin=int(first), flags=flags, counts=counts)
+        return flags, counts, int(first)
+
+
+def _year_of(day: int) -> int:
+    return int(np.datetime64(int(day), "D").astype("datetime64[Y]").astype(int)) + 1970
+
+
+def holiday_flags(dates) -> np.ndarray:
+    """Drapeaux uint8 (FERIE | RAMADAN | VACANCES) des dates, lus dans la table précalculée."""
+    days = np.asarray(dates, dtype="datetime64[D]").astype(np.int64)
+    if days.size == 0:
+        return np.zeros(days.shape, dtype=np.uint8)
+    flags, _, origin = _table_covering(int(days.min()), int(days.max()))
+    return flags[days - origin]
+
+
+def holiday_features(dates, previous: Optional[np.ndarray] = None) -> np.ndarray:
+    """Part des jours fériés, de Ramadan et de vacances dans chaque période: (..., 3) float32.
+
+    La période de dates[..., i] couvre ]dates[..., i-1], dates[..., i]] (dernier axe = temps);
+    previous donne la date précédant dates[..., 0] (sinon même durée que la période suivante).
+    En journalier, c'est le drapeau du jour (0 ou 1); en hebdomadaire ou mensuel, la part de
+    jours concernés dans la semaine ou le mois.
+    """
+    days = np.asarray(dates, dtype="datetime64[D]").astype(np.int64)
+    if days.size == 0:
+        return np.zeros(days.shape + (len(HOLIDAY_COLS),), dtype=np.float32)
+    if previous is not None:
+        before = np.asarray(previous, dtype="datetime64[D]").astype(np.int64)[..., None]
+    elif days.shape[-1] > 1:
+        before = 2 * days[..., :1] - days[..., 1:2]
+    else:
+        before = days[..., :1] - 1
+    spans = np.maximum(np.diff(days, axis=-1, prepend=before), 1)
+    _, counts, origin = _table_covering(int((days - spans).min()), int(days.max()))
+    end = days - origin + 1
+    shares = (counts[end] - counts[end - spans]) / spans[..., None]
+    return shares.astype(np.float32)
@@ -0,0 +1,639 @@
+import bz2
+import codecs
+import csv
+import gzip
+import importlib.util
+import io
+import lzma
+import os
+import re
+import time
+import zipfile
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.dates import infer_date_format, parse_dates, parse_dates_cached
+from utils.schema import is_boolean, parse_booleans
+
+SNIFF_BYTES = 64 * 1024
+STREAM_CHUNK_ROWS = 200_000
+STREAM_SAMPLE_ROWS = 1000
+CANDIDATE_SEPARATORS = [';', ',', '\t', '|']
+EXCEL_EXTENSIONS = ['xlsx', 'xls']
+COMPRESSION_EXTENSIONS = ['gz', 'bz2', 'xz', 'zip', 'zst']
+
+# python-calamine (Rust) lit xlsx/xls bien plus vite qu'openpyxl/xlrd; optionnel (pandas >= 2.2)
+_CALAMINE_OK = (
+    importlib.util.find_spec("python_calamine") is not None
+    and tuple(int(p) for p in pd.__version__.split('.')[:2]) >= (2, 2)
+)
+_ZSTD_OK = importlib.util.find_spec("zstandard") is not None
+
+_NUMBER_DOT = re.compile(r'^[-+]?\d+\.\d+$')
+_NUMBER_COMMA = re.compile(r'^[-+]?\d+,\d+$')
+_NUMBER_ANY = re.compile(r'^[-+]?\d+([.,]\d+)?([eE][-+]?\d+)?$')
+
+CATEGORY_MAX_RATIO = 0.5
+# Gestionnaire d'erreurs de décodage: octets non UTF-8 lus en latin-1 au fil de la lecture
+LATIN1_FALLBACK = "ventespro_latin1"
+
+
+def _latin1_fallback(exc: UnicodeDecodeError):
+    return exc.object[exc.start:exc.end].decode('latin-1'), exc.end
+
+
+codecs.register_error(LATIN1_FALLBACK, _latin1_fallback)
+
+
+class IngestionError(ValueError):
+    """Fichier illisible, format non supporté ou contenu vide."""
+
+
+@dataclass
+class CsvDialect:
+    sep: str
+    encoding: str
+    decimal: str
+    header: Optional[int]
+    n_columns: int = 0
+
+
+def _decode_sample(raw: bytes):
+    """Décode l'échantillon et retourne (texte, encodage) ; latin-1 en dernier recours."""
+    if raw.startswith(b'\xef\xbb\xbf'):
+        return raw[3:].decode('utf-8', errors='ignore'), 'utf-8-sig'
+    try:
+        # Un caractère multi-octets peut être coupé en fin d'échantillon
+        return raw.decode('utf-8'), 'utf-8'
+    except UnicodeDecodeError as exc:
+        if exc.start >= len(raw) - 3:
+            return raw[:exc.start].decode('utf-8'), 'utf-8'
+    return raw.decode('latin-1'), 'latin-1'
+
+
+def _sample_rows(text: str, sep: str) -> List[List[str]]:
+    lines = text.splitlines()
+    if len(lines) > 1:
+        lines = lines[:-1]  # dernière ligne potentiellement tronquée
+    return [row for row in csv.reader(lines, delimiter=sep) if row]
+
+
+def sniff_csv_dialect(raw: bytes) -> CsvDialect:
+    """Détecte séparateur, encodage, marque décimale et en-tête sur les premiers Ko."""
+    text, encoding = _decode_sample(raw)
+
+    # Séparateur: nombre de colonnes le plus stable puis le plus élevé
+    best_sep, best_score, best_rows = CANDIDATE_SEPARATORS[0], (-1.0, 0), []
+    for sep in CANDIDATE_SEPARATORS:
+        rows = _sample_rows(text, sep)
+        if not rows:
+            continue
+        widths = [len(r) for r in rows]
+        mode = max(set(widths), key=widths.count)
+        if mode <= 1:
+            continue
+        score = (widths.count(mode) / len(widths), mode)
+        if score > best_score:
+            best_sep, best_score, best_rows = sep, score, rows
+
+    body = best_rows[1:] if len(best_rows) > 1 else best_rows
+    cells = [c.strip() for r in body for c in r]
+
+    decimal = '.'
+    if best_sep != ',':
+        n_comma = sum(1 for c in cells if _NUMBER_COMMA.match(c))
+        n_dot = sum(1 for c in cells if _NUMBER_DOT.match(c))
+        if n_comma > n_dot:
+            decimal = ','
+
+    # En-tête absent si la première ligne a les mêmes colonnes numériques que le corps
+    header: Optional[int] = 0
+    if len(best_rows) > 1:
+        width = len(best_rows[0])
+        first_num = {i for i, c in enumerate(best_rows[0]) if _NUMBER_ANY.match(c.strip())}
+        body_num = {
+            i for i in range(width)
+            if sum(1 for r in body if i < len(r) and _NUMBER_ANY.match(r[i].strip())) > len(body) / 2
+        }
+        if first_num and first_num == body_num:
+            header = None
+
+    return CsvDialect(
+        sep=best_sep, encoding=encoding, decimal=decimal, header=header, n_columns=int(best_score[1])
+    )
+
+
+def sniff_file(f) -> CsvDialect:
+    """Détecte le dialecte d'un fichier ouvert à partir de ses SNIFF_BYTES premiers octets."""
+    f.seek(0)
+    dialect = sniff_csv_dialect(f.read(SNIFF_BYTES))
+    f.seek(0)
+    return dialect
+
+
+def _is_utf8(f, block: int = 1 << 20) -> bool:
+    """True si tout le fichier est de l'UTF-8 valide (décodage C par blocs, bien moins
+    coûteux que l'analyse CSV)."""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    f.seek(0)
+    try:
+        while True:
+            data = f.read(block)
+            if not data:
+                decoder.decode(b'', final=True)
+                return True
+            decoder.decode(data)
+    except UnicodeDecodeError:
+        return False
+    finally:
+        f.seek(0)
+
+
+def _encoding_kwargs(f, dialect: CsvDialect, full: bool) -> dict:
+    """Encodage de lecture. Un échantillon UTF-8 n'exclut pas un octet latin-1 plus loin: le
+    fichier est vérifié avant une lecture complète, et seuls les fichiers mixtes (ou les
+    lectures partielles) passent par LATIN1_FALLBACK, décodé au fil de la lecture."""
+    if not dialect.encoding.startswith('utf-8') or (full and _is_utf8(f)):
+        return {"encoding": dialect.encoding}
+    return {"encoding": dialect.encoding, "encoding_errors": LATIN1_FALLBACK}
+
+
+def _csv_read_kwargs(dialect: CsvDialect) -> dict:
+    kwargs = dict(sep=dialect.sep, decimal=dialect.decimal, header=dialect.header, engine='c')
+    if dialect.header is None and dialect.n_columns:
+        kwargs["names"] = [f"Colonne_{i + 1}" for i in range(dialect.n_columns)]
+    return kwargs
+
+
+def read_csv_sniffed(f, dialect: Optional[CsvDialect] = None, **read_kwargs) -> pd.DataFrame:
+    """Lecture CSV en une seule passe (moteur C) après détection du dialecte."""
+    if dialect is None:
+        dialect = sniff_file(f)
+    kwargs = {**_csv_read_kwargs(dialect), **read_kwargs}
+    kwargs.update(_encoding_kwargs(f, dialect, full=kwargs.get("nrows") is None))
+    f.seek(0)
+    df = pd.read_csv(f, **kwargs)
+    if dialect.header is None and "names" not in kwargs:
+        df.columns = [f"Colonne_{i + 1}" for i in range(len(df.columns))]
+    return df
+
+
+def _combine_cube_parts(parts: List[pd.DataFrame], keys: List[str]) -> pd.DataFrame:
+    merged = pd.concat(parts, ignore_index=True)
+    return merged.groupby(keys, sort=False, dropna=False).agg(
+        sum=("sum", "sum"), count=("count", "sum"), min=("min", "min"), max=("max", "max")
+    ).reset_index()
+
+
+def aggregate_csv_chunks(
+    f,
+    date_col: str,
+    target_col: str,
+    group_cols: List[str],
+    chunksize: int = STREAM_CHUNK_ROWS,
+    dialect: Optional[CsvDialect] = None,
+) -> pd.DataFrame:
+    """Lit un CSV par blocs et l'agrège en cube quotidien × group_cols (somme/nb/min/max).
+
+    Seules les colonnes utiles sont lues; la mémoire reste bornée par la taille d'un bloc
+    plus celle du cube, quelle que soit la taille du fichier.
+    """
+    if dialect is None:
+        dialect = sniff_file(f)
+    date_format: Optional[str] = None
+    keys = [date_col] + [c for c in group_cols if c != date_col]
+    wanted = set(keys + [target_col])
+
+    parts: List[pd.DataFrame] = []
+    empty: Optional[pd.DataFrame] = None
+    pending_rows = 0
+    merged_rows = 0
+    f.seek(0)
+    encoding = _encoding_kwargs(f, dialect, full=True)
+    f.seek(0)
+    reader = pd.read_csv(
+        f,
+        usecols=lambda c: str(c).strip() in wanted,
+        chunksize=chunksize,
+        **encoding,
+        **_csv_read_kwargs(dialect),
+    )
+    for chunk in reader:
+        chunk.columns = [str(c).strip() for c in chunk.columns]
+        # Format déduit sur le premier bloc puis réutilisé: pas de dérive entre blocs
+        if date_format is None and not pd.api.types.is_numeric_dtype(chunk[date_col]):
+            date_format = infer_date_format(chunk[date_col])
+        chunk[date_col] = parse_dates(chunk[date_col], fmt=date_format).dt.normalize()
+        chunk[target_col] = pd.to_numeric(chunk[target_col], errors='coerce')
+        chunk = chunk.dropna(subset=[date_col, target_col])
+        part = chunk.groupby(keys, sort=False, dropna=False)[target_col].agg(
+            ['sum', 'count', 'min', 'max']
+        ).reset_index()
+        if len(part) == 0:
+            empty = empty if empty is not None else part  # types du bloc lu, si aucun ne reste
+            continue
+        parts.append(part)
+        pending_rows += len(part)
+        # Fusion périodique: les partiels restent de l'ordre d'un bloc + la taille du cube
+        if pending_rows > max(chunksize, merged_rows):
+            parts = [_combine_cube_parts(parts, keys)]
+            merged_rows = len(parts[0])
+            pending_rows = 0
+
+    if not parts:
+        # Aucune ligne valide: cube vide, mêmes colonnes et types que le cas courant
+        cube = empty if empty is not None else _empty_cube(keys)
+        return cube.rename(columns=_cube_columns(target_col))
+
+    cube = _combine_cube_parts(parts, keys).sort_values(keys, ignore_index=True)
+    return cube.rename(columns=_cube_columns(target_col))
+
+
+def _empty_cube(keys: List[str]) -> pd.DataFrame:
+    """Cube sans ligne quand le lecteur n'a rendu aucun bloc (en-tête seul)."""
+    columns = {keys[0]: pd.Series(dtype="datetime64[ns]")}
+    columns.update({name: pd.Series(dtype=str) for name in keys[1:]})
+    columns.update({stat: pd.Series(dtype=np.int64 if stat == "count" else np.float64)
+                    for stat in ("sum", "count", "min", "max")})
+    return pd.DataFrame(columns)
+
+
+def aggregate_daily(df: pd.DataFrame, date_col: str, target_col: str, group_cols: List[str]) -> pd.DataFrame:
+    """Même cube quotidien que aggregate_csv_chunks, pour un DataFrame déjà en mémoire."""
+    keys = [date_col] + [c for c in group_cols if c != date_col]
+    part = df[keys + [target_col]].copy()
+    part[date_col] = parse_dates(part[date_col]).dt.normalize()
+    part[target_col] = pd.to_numeric(part[target_col], errors='coerce')
+    part = part.dropna(subset=[date_col, target_col])
+    cube = part.groupby(keys, sort=True, dropna=False, observed=True)[target_col].agg(
+        ['sum', 'count', 'min', 'max']
+    ).reset_index()
+    return cube.rename(columns=_cube_columns(target_col))
+
+
+def _cube_columns(target_col: str) -> Dict[str, str]:
+    return {
+        "sum": target_col,
+        "count": f"{target_col} (nb)",
+        "min": f"{target_col} (min)",
+        "max": f"{target_col} (max)",
+    }
+
+
+def _as_boolean(col: pd.Series) -> Optional[pd.Series]:
+    """Yes/No, Oui/Non, True/False, 1/0 -> bool (ou 'boolean' nullable si valeurs manquantes)."""
+    if not is_boolean(col):
+        return None
+    mapped = parse_booleans(col)
+    if col.isna().any():
+        return mapped.astype("boolean")
+    return mapped.astype(bool)
+
+
+def _downcast_float(col: pd.Series) -> pd.Series:
+    """float64 -> float32 uniquement si l'aller-retour est exact."""
+    as32 = col.astype(np.float32)
+    exact = (as32.astype(np.float64) == col) | col.isna()
+    return as32 if bool(exact.all()) else col
+
+
+def compact_dtypes(
+    df: pd.DataFrame,
+    max_category_ratio: float = CATEGORY_MAX_RATIO,
+) -> Tuple[pd.DataFrame, Dict[str, int]]:
+    """Compacte les types: booléens Oui/Non, catégories à faible cardinalité, entiers/floats réduits.
+
+    Retourne le DataFrame compacté et un rapport {'avant', 'apres', 'economise'} en octets.
+    """
+    before = int(df.memory_usage(deep=True).sum())
+    out = {}
+    n = len(df)
+    for name in df.columns:
+        col = df[name]
+        if pd.api.types.is_bool_dtype(col) or isinstance(col.dtype, pd.CategoricalDtype):
+            out[name] = col
+        elif pd.api.types.is_integer_dtype(col):
+            out[name] = pd.to_numeric(col, downcast="integer") if col.dtype.kind in "iu" else col
+        elif pd.api.types.is_float_dtype(col):
+            out[name] = _downcast_float(col) if col.dtype == np.float64 else col
+        elif pd.api.types.is_object_dtype(col) or pd.api.types.is_string_dtype(col):
+            as_bool = _as_boolean(col)
+            if as_bool is not None:
+                out[name] = as_bool
+            elif n and col.nunique(dropna=True) <= max_category_ratio * n:
+                out[name] = col.astype("category")
+            else:
+                out[name] = col
+        else:
+            out[name] = col
+
+    compacted = pd.DataFrame(out, index=df.index)
+    compacted.attrs = dict(df.attrs)
+    after = int(compacted.memory_usage(deep=True).sum())
+    return compacted, {"avant": before, "apres": after, "economise": before - after}
+
+
+def index_by_date(df: pd.DataFrame, date_col: str, dataset_key=None) -> pd.DataFrame:
+    """Convertit la colonne date, retire les dates invalides, trie et l'utilise comme index."""
+    df = df.copy(deep=False)
+    if dataset_key is None:
+        df[date_col] = parse_dates(df[date_col])
+    else:
+        df[date_col] = parse_dates_cached(df[date_col], dataset_key)
+    df = df.dropna(subset=[date_col])
+    df = df.sort_values(by=date_col, kind="stable")
+    return df.set_index(date_col)
+
+
+def excel_engine(file_extension: str) -> Optional[str]:
+    """Moteur Excel le plus rapide disponible (None = choix par défaut de pandas)."""
+    if _CALAMINE_OK:
+        return "calamine"
+    return "openpyxl" if file_extension == "xlsx" else None
+
+
+def list_excel_sheets(file) -> List[str]:
+    """Noms des feuilles, sans lire les cellules."""
+    file_extension = file.name.split('.')[-1].lower() if hasattr(file, "name") else "xlsx"
+    file.seek(0)
+    with pd.ExcelFile(file, engine=excel_engine(file_extension)) as book:
+        sheets = [str(s) for s in book.sheet_names]
+    file.seek(0)
+    return sheets
+
+
+def read_excel_fast(
+    file,
+    sheet_name=0,
+    usecols: Optional[List[str]] = None,
+    nrows: Optional[int] = None,
+    file_extension: Optional[str] = None,
+) -> pd.DataFrame:
+    """Lecture Excel: moteur le plus rapide disponible, une seule feuille, colonnes utiles seulement."""
+    if file_extension is None:
+        file_extension = file.name.split('.')[-1].lower() if hasattr(file, "name") else "xlsx"
+    file.seek(0)
+    return pd.read_excel(
+        file,
+        sheet_name=sheet_name,
+        usecols=_projection(usecols),
+        nrows=nrows,
+        engine=excel_engine(file_extension),
+    )
+
+
+# ==================== REGISTRE DES LECTEURS ====================
+
+
+@dataclass
+class Reader:
+    name: str
+    extensions: Tuple[str, ...]
+    read: Callable[..., pd.DataFrame]
+    write: Optional[Callable[[pd.DataFrame, io.BytesIO], None]] = None  # pour le micro-benchmark
+
+
+@dataclass
+class IngestionStats:
+    reader: str
+    compression: Optional[str]
+    rows: int
+    columns: int
+    seconds: float
+    bytes_in: int
+    memory_bytes: int
+    extra: Dict[str, object] = field(default_factory=dict)
+
+
+READERS: Dict[str, Reader] = {}
+
+
+def register_reader(reader: Reader) -> Reader:
+    """Ajoute (ou remplace) un lecteur; l'extension la plus spécifique l'emporte à la résolution."""
+    READERS[reader.name] = reader
+    return reader
+
+
+def _projection(usecols: Optional[List[str]]):
+    if not usecols:
+        return None
+    wanted = {str(c).strip() for c in usecols}
+    return lambda c: str(c).strip() in wanted
+
+
+def _read_csv(f, usecols=None, dtypes=None, nrows=None, **_) -> pd.DataFrame:
+    return read_csv_sniffed(f, usecols=_projection(usecols), dtype=dtypes or None, nrows=nrows)
+
+
+def _read_tsv(f, usecols=None, dtypes=None, nrows=None, **_) -> pd.DataFrame:
+    dialect = sniff_file(f)
+    dialect.sep = '\t'
+    return read_csv_sniffed(f, dialect, usecols=_projection(usecols), dtype=dtypes or None, nrows=nrows)
+
+
+def _read_excel(f, usecols=None, nrows=None, sheet_name=None, extension="xlsx", **_) -> pd.DataFrame:
+    return read_excel_fast(f, 0 if sheet_name is None else sheet_name, usecols, nrows, extension)
+
+
+def _read_parquet(f, usecols=None, nrows=None, **_) -> pd.DataFrame:
+    f.seek(0)
+    if nrows is not None:
+        import pyarrow.parquet as pq
+
+        batch = next(pq.ParquetFile(f).iter_batches(batch_size=nrows, columns=usecols or None), None)
+        return batch.to_pandas() if batch is not None else pd.DataFrame()
+    return pd.read_parquet(f, columns=list(usecols) if usecols else None)
+
+
+def _read_json(f, usecols=None, dtypes=None, nrows=None, **_) -> pd.DataFrame:
+    f.seek(0)
+    head = f.read(SNIFF_BYTES).lstrip()
+    f.seek(0)
+    lines = head[:1] in (b'{', '{')  # JSON Lines: un objet par ligne; sinon tableau d'objets
+    df = pd.read_json(f, lines=lines, nrows=nrows if lines else None, dtype=dtypes or True)
+    if nrows is not None and not lines:
+        df = df.head(nrows)
+    if usecols:
+        df = df[[c for c in df.columns if str(c).strip() in {str(u).strip() for u in usecols}]]
+    return df
+
+
+register_reader(Reader(
+    "csv", ("csv", "txt"), _read_csv,
+    write=lambda df, buf: buf.write(df.to_csv(sep=';', index=False).encode("utf-8")),
+))
+register_reader(Reader(
+    "tsv", ("tsv", "tab"), _read_tsv,
+    write=lambda df, buf: buf.write(df.to_csv(sep='\t', index=False).encode("utf-8")),
+))
+register_reader(Reader("excel", tuple(EXCEL_EXTENSIONS), _read_excel, write=lambda df, buf: df.to_excel(buf, index=False)))
+register_reader(Reader("parquet", ("parquet", "pq"), _read_parquet, write=lambda df, buf: df.to_parquet(buf, index=False)))
+register_reader(Reader(
+    "json", ("json", "jsonl", "ndjson"), _read_json,
+    write=lambda df, buf: buf.write(df.to_json(orient="records", lines=True, date_format="iso").encode("utf-8")),
+))
+
+
+def resolve_reader(filename: str) -> Tuple[Reader, Optional[str], str]:
+    """(lecteur, compression, extension) d'après le nom: 'ventes.csv.gz' -> (csv, 'gz', 'csv').
+
+    Une extension inconnue retombe sur le lecteur CSV (détection du dialecte).
+    """
+    parts = os.path.basename(filename or "").lower().split('.')
+    compression = None
+    if len(parts) > 2 and parts[-1] in COMPRESSION_EXTENSIONS:
+        compression = parts.pop()
+    extension = parts[-1] if len(parts) > 1 else ""
+    for reader in READERS.values():
+        if extension in reader.extensions:
+            return reader, compression, extension
+    return READERS["csv"], compression, extension
+
+
+def _decompress(f, compression: Optional[str]):
+    """Flux décompressé et repositionnable (seek(0) relit depuis le début)."""
+    f.seek(0)
+    if compression is None:
+        return f
+    if compression == "gz":
+        return gzip.GzipFile(fileobj=f, mode="rb")
+    if compression == "bz2":
+        return bz2.BZ2File(f, mode="rb")
+    if compression == "xz":
+        return lzma.LZMAFile(f, mode="rb")
+    if compression == "zip":
+        archive = zipfile.ZipFile(f)
+        members = [m for m in archive.namelist() if not m.endswith('/')]
+        if len(members) != 1:
+            raise IngestionError("❌ L'archive zip doit contenir exactement un fichier.")
+        return archive.open(members[0])
+    if compression == "zst":
+        if not _ZSTD_OK:
+            raise IngestionError("❌ Lecture .zst impossible (zstandard requis). Installez: pip install zstandard")
+        import zstandard
+
+        # zstandard ne sait pas revenir en arrière: on décompresse en mémoire
+        return io.BytesIO(zstandard.ZstdDecompressor().stream_reader(f).read())
+    raise IngestionError(f"❌ Compression non supportée: .{compression}")
+
+
+@contextmanager
+def _open_source(source, name: Optional[str] = None) -> Iterator[Tuple[object, str]]:
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            yield f, name or os.fspath(source)
+    else:
+        yield source, name or getattr(source, "name", "")
+
+
+def _size_of(f) -> int:
+    try:
+        pos = f.tell()
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        f.seek(pos)
+        return size
+    except Exception:
+        return 0
+
+
+def ingest(
+    source,
+    name: Optional[str] = None,
+    usecols: Optional[List[str]] = None,
+    dtypes: Optional[Dict[str, str]] = None,
+    sheet_name=None,
+    nrows: Optional[int] = None,
+) -> Tuple[pd.DataFrame, IngestionStats]:
+    """Point d'entrée unique, sans Streamlit: chemin ou objet fichier -> (DataFrame, statistiques).
+
+    Lève IngestionError si le fichier est illisible ou ne contient pas au moins deux colonnes.
+    """
+    with _open_source(source, name) as (f, filename):
+        reader, compression, extension = resolve_reader(filename)
+        known = any(extension in r.extensions for r in READERS.values())
+        bytes_in = _size_of(f)
+        start = time.perf_counter()
+        try:
+            stream = _decompress(f, compression)
+            df = reader.read(
+                stream, usecols=usecols, dtypes=dtypes, nrows=nrows,
+                sheet_name=sheet_name, extension=extension,
+            )
+        except IngestionError:
+            raise
+        except ImportError as exc:
+            raise IngestionError(f"❌ Lecture {reader.name} impossible (dépendance manquante). Détail: {exc}") from exc
+        except Exception as exc:
+            if not known:
+                raise IngestionError(
+                    "❌ Format de fichier non supporté. Utilisez CSV, TSV, Excel, Parquet ou JSON "
+                    "(éventuellement compressés .gz / .bz2 / .xz / .zip / .zst)."
+                ) from exc
+            raise IngestionError(f"❌ Erreur lors du chargement du fichier: {exc}") from exc
+        finally:
+            f.seek(0)
+        elapsed = time.perf_counter() - start
+
+    if df is None or len(df.columns) <= 1:
+        raise IngestionError("❌ Impossible de lire le fichier ou fichier vide.")
+    df.columns = [str(c).strip() for c in df.columns]
+
+    stats = IngestionStats(
+        reader=reader.name,
+        compression=compression,
+        rows=len(df),
+        columns=len(df.columns),
+        seconds=round(elapsed, 4),
+        bytes_in=bytes_in,
+        memory_bytes=int(df.memory_usage(deep=True).sum()),
+    )
+    df.attrs["ingestion"] = asdict(stats)
+    return df, stats
+
+
+_BENCH_COMPRESSORS: Dict[str, Callable[[bytes], bytes]] = {
+    "gz": lambda b: gzip.compress(b, compresslevel=6),
+    "bz2": bz2.compress,
+    "xz": lzma.compress,
+}
+
+
+def benchmark_readers(
+    df: pd.DataFrame,
+    readers: Optional[List[str]] = None,
+    compressions: Tuple[Optional[str], ...] = (None, "gz"),
+    repeat: int = 3,
+) -> pd.DataFrame:
+    """Micro-benchmark: sérialise df dans chaque format enregistré puis chronomètre ingest().
+
+    Retourne un tableau (lecteur, compression, Mo, secondes, lignes/s), le plus rapide en tête.
+    """
+    rows = []
+    for reader in READERS.values():
+        if reader.write is None or (readers and reader.name not in readers):
+            continue
+        buf = io.BytesIO()
+        reader.write(df, buf)
+        payload = buf.getvalue()
+        for compression in compressions:
+            if compression is not None and reader.name not in ("csv", "tsv", "json"):
+                continue
+            data = _BENCH_COMPRESSORS[compression](payload) if compression else payload
+            filename = f"bench.{reader.extensions[0]}" + (f".{compression}" if compression else "")
+            best = float("inf")
+            for _ in range(repeat):
+                _, stats = ingest(io.BytesIO(data), name=filename)
+                best = min(best, stats.seconds)
+            rows.append({
+                "Lecteur": reader.name,
+                "Compression": compression or "-",
+                "Mo": round(len(data) / 1e6, 2),
+                "Secondes": round(best, 4),
+                "Lignes/s": int(len(df) / best) if best > 0 else 0,
+            })
+    return pd.DataFrame(rows).sort_values("Secondes", ignore_index=True)
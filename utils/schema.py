@@ -0,0 +1,141 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.dates import infer_date_format
+
+BOOLEAN_VALUES = {
+    "yes": True, "no": False,
+    "oui": True, "non": False,
+    "true": True, "false": False,
+}
+# Vocabulaire booléen complet (ingestion, ajout de delta, exogènes): mots et 1/0 relus en texte
+BOOLEAN_LITERALS = {**BOOLEAN_VALUES, "1": True, "0": False, "1.0": True, "0.0": False}
+DATE_HINTS = ("date", "jour", "day", "periode", "période", "time", "mois", "month")
+TARGET_HINTS = ("ventes", "vente", "sales", "quantite", "quantité", "qty", "volume", "revenue", "chiffre", "montant")
+CATEGORY_HINTS = ("produit", "product", "article", "sku", "categorie", "catégorie", "category", "famille")
+CATEGORY_MAX_UNIQUE = 1000
+
+
+@dataclass
+class ColumnSchema:
+    name: str
+    kind: str  # 'date' | 'numeric' | 'integer' | 'boolean' | 'categorical' | 'text'
+    n_unique: int
+    null_ratio: float
+
+
+@dataclass
+class DatasetSchema:
+    columns: List[ColumnSchema]
+    sample_rows: int
+    suggested_date: Optional[str] = None
+    suggested_target: Optional[str] = None
+    suggested_category: Optional[str] = None
+    by_name: Dict[str, ColumnSchema] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self):
+        self.by_name = {c.name: c for c in self.columns}
+
+    def names(self, *kinds: str) -> List[str]:
+        return [c.name for c in self.columns if not kinds or c.kind in kinds]
+
+    def read_dtypes(self, usecols: List[str]) -> Dict[str, str]:
+        """dtypes explicites pour la lecture complète (sûrs même si l'échantillon est partiel).
+
+        Seuls les textes répétitifs sont forcés ('category' accepte toute valeur). Les
+        colonnes numériques restent inférées par le lecteur: une valeur non numérique après
+        l'échantillon ('N/A', '1 234,5') ferait échouer un float64 forcé; voir numeric_columns.
+        """
+        return {
+            name: "category" for name in usecols
+            if name in self.by_name and self.by_name[name].kind == "categorical"
+        }
+
+    def numeric_columns(self, usecols: List[str]) -> List[str]:
+        """Colonnes numériques d'après l'échantillon, à convertir après lecture (coerce_numeric)."""
+        return [name for name in usecols if name in self.by_name and self.by_name[name].kind in ("numeric", "integer")]
+
+
+def coerce_numeric(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    """Convertit en nombres les colonnes lues en texte; les valeurs illisibles deviennent NaN."""
+    for name in columns:
+        if name in df.columns and not pd.api.types.is_numeric_dtype(df[name]):
+            df[name] = pd.to_numeric(df[name], errors="coerce")
+    return df
+
+
+def parse_booleans(values: pd.Series) -> pd.Series:
+    """Yes/No, Oui/Non, True/False, 1/0 -> True/False (NaN si non reconnu)."""
+    return values.astype(str).str.strip().str.lower().map(BOOLEAN_LITERALS)
+
+
+def is_boolean(values: pd.Series) -> bool:
+    """Au plus deux valeurs distinctes, toutes dans BOOLEAN_LITERALS (ou dtype bool)."""
+    if pd.api.types.is_bool_dtype(values):
+        return True
+    uniques = pd.Series(pd.unique(values.dropna()))
+    return 0 < len(uniques) <= 2 and bool(parse_booleans(uniques).notna().all())
+
+
+def boolean_codes(values: pd.Series) -> np.ndarray:
+    """1.0 / 0.0 (NaN sinon) en float32; une seule analyse par valeur distincte."""
+    if pd.api.types.is_bool_dtype(values) or pd.api.types.is_numeric_dtype(values):
+        return pd.to_numeric(values, errors="coerce").to_numpy(dtype=np.float32, na_value=np.nan)
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    lookup = parse_booleans(pd.Series(uniques)).to_numpy(dtype=np.float32, na_value=np.nan)
+    return np.where(codes >= 0, lookup[np.maximum(codes, 0)], np.nan).astype(np.float32)
+
+
+def _column_kind(name: str, col: pd.Series) -> str:
+    non_null = col.dropna()
+    if pd.api.types.is_datetime64_any_dtype(col):
+        return "date"
+    if pd.api.types.is_bool_dtype(col):
+        return "boolean"
+    if pd.api.types.is_numeric_dtype(col):
+        if any(h in name.lower() for h in DATE_HINTS) and len(non_null) and non_null.median() > 10000:
+            return "date"  # numéro de série Excel ou AAAAMMJJ
+        return "integer" if pd.api.types.is_integer_dtype(col) else "numeric"
+    if len(non_null) == 0:
+        return "text"
+    if is_boolean(non_null):
+        return "boolean"
+    if infer_date_format(non_null) is not None:
+        return "date"
+    n_unique = non_null.nunique()
+    if n_unique <= min(CATEGORY_MAX_UNIQUE, max(1, len(non_null) // 2)):
+        return "categorical"
+    return "text"
+
+
+def _pick(candidates: List[str], hints) -> Optional[str]:
+    for hint in hints:
+        for name in candidates:
+            if hint in name.lower():
+                return name
+    return candidates[0] if candidates else None
+
+
+def infer_schema(sample: pd.DataFrame) -> DatasetSchema:
+    """Types de colonnes et suggestions date / cible / catégorie à partir d'un échantillon."""
+    columns = [
+        ColumnSchema(
+            name=str(name),
+            kind=_column_kind(str(name), sample[name]),
+            n_unique=int(sample[name].nunique(dropna=True)),
+            null_ratio=float(sample[name].isna().mean()) if len(sample) else 0.0,
+        )
+        for name in sample.columns
+    ]
+    schema = DatasetSchema(columns=columns, sample_rows=len(sample))
+
+    schema.suggested_date = _pick(schema.names("date"), DATE_HINTS)
+    numeric = [c for c in schema.names("integer", "numeric") if c != schema.suggested_date]
+    schema.suggested_target = _pick(numeric, TARGET_HINTS)
+    categorical = [c.name for c in columns if c.kind == "categorical" and c.n_unique > 1]
+    if categorical:
+        schema.suggested_category = _pick(categorical, CATEGORY_HINTS)
+    return schema